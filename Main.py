@@ -1,18 +1,28 @@
-# Importa bibliotecas
+# Importa bibliotecas; o seaborn e o matplotlib só são importados no desenho da dispersão
+# (sales_charts.py) e o explorador do streamlit_extras só com o expander "Filtrar o Execel"
+# aberto, para não atrasar a primeira abertura da página (ver warmup.py)
+from functools import partial
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
 import altair as alt
 import streamlit as st
-from streamlit_extras.dataframe_explorer import dataframe_explorer
+from streamlit_extras.metric_cards import style_metric_cards
+from add_data import add_data
+from sales_dataset import get_dataset
+from sales_loader import DERIVED_COLUMNS
+from sales_charts import MAX_SCATTER_POINTS, downsample_points, frequency_scatter
+from figure_cache import get_figure_cache
+from profiling import finish_run, profiled_section, span, start_run
 
 # Configura a largura da página
 st.set_page_config(page_title="Home", page_icon="", layout="wide")
 
-# Carrega o arquivo Excel
-df = pd.read_excel("base_2.xlsx")
+# Tempo de cada etapa desta execução (painel com ?debug=1 na URL; ver profiling.py)
+perfil = start_run("Main")
+
+# Retrato compartilhado da base de vendas (carregado uma vez por processo a partir do cache colunar)
+with perfil.span("carregar_base") as etapa:
+    dataset = get_dataset("base_2.xlsx")
+    df = etapa.measure(dataset.df)
 
 st.markdown("""  <h3 style="color:#002b50;"> Dashboard Análise Sohipren </h3>    """, unsafe_allow_html=True)
 #Carregando CSS
@@ -21,11 +31,8 @@ with open("style.css") as f:
 
 st.sidebar.image("assets/sohi_logo.png")
 
-# Converte a coluna "EMISSÃO" para o formato yyyy/mm/dd, ignorando erros
-df["EMISSÃO"] = pd.to_datetime(df["EMISSÃO"], dayfirst=True, errors='coerce')
-
-# Converte a coluna "VALOR TOTAL" para numérico, substituindo valores inválidos por NaN
-df["VALOR TOTAL"] = pd.to_numeric(df["VALOR TOTAL"], errors="coerce")
+# A base já chega normalizada do cache ("EMISSÃO" em datetime, "VALOR TOTAL" numérico,
+# "CÓDIGO" calculado); o DataFrame é compartilhado entre sessões e não deve ser alterado no lugar
 
 # Verifica se há valores NaN na coluna "VALOR TOTAL" após a conversão
 if df["VALOR TOTAL"].isna().any():
@@ -37,65 +44,98 @@ with st.sidebar:
     start_date = st.date_input(label="Data de Início")
     end_date = st.date_input(label="Data de Fim")
 
-# Filtra o DataFrame com base no intervalo de datas (ignora valores NaT)
-df2 = df[(df["EMISSÃO"] >= pd.to_datetime(start_date)) & (df["EMISSÃO"] <= pd.to_datetime(end_date))]
+    # Opções de desempenho dos gráficos
+    with st.expander("Opções dos Gráficos"):
+        max_pontos = st.number_input("Máximo de pontos na dispersão", min_value=100, value=MAX_SCATTER_POINTS, step=500)
+        mostrar_contagem = st.checkbox("Mostrar contagem de pontos")
+        segundo_plano = st.checkbox(
+            "Desenhar a dispersão em segundo plano", value=True,
+            help="Mostra o restante da página enquanto o gráfico de Atributos por Frequência é desenhado"
+        )
+
+# Filtra o período por busca binária na base ordenada por emissão (ignora valores NaT)
+with perfil.span("filtro_periodo") as etapa:
+    df2 = etapa.measure(dataset.period(start_date, end_date))
+
+# As seções com widgets próprios são fragmentos: mudar um desses widgets reexecuta só a seção,
+# sem recalcular estatísticas e gráficos das demais. O período e as opções da barra lateral
+# reexecutam a página inteira. Os expanders acompanham o próprio estado (on_change="rerun"),
+# e o conteúdo só é calculado quando estão abertos. Cada seção mede as próprias etapas em um
+# perfil à parte (profiled_section), porque pode reexecutar, ou terminar, sem o restante da página.
+
+@st.fragment
+@profiled_section("Main/explorador")
+def secao_explorador(df2):
+    """Exibe o DataFrame filtrado, montando o explorador só com o expander aberto"""
+    with st.expander("Filtrar o Execel", key="expander_explorador", on_change="rerun") as expander:
+        if expander.open:
+            from streamlit_extras.dataframe_explorer import dataframe_explorer
+
+            with span("dataframe_explorer") as etapa:
+                filtered_df = dataframe_explorer(df2.drop(columns=DERIVED_COLUMNS), case=False)
+                st.dataframe(etapa.measure(filtered_df), use_container_width=True)
 
-# Exibe o DataFrame filtrado
-with st.expander("Filtrar o Execel"):
-    filtered_df = dataframe_explorer(df2, case=False)
-    st.dataframe(filtered_df, use_container_width=True)
+secao_explorador(df2)
 
 # Divide a página em duas colunas
 a1, a2 = st.columns(2)
 
+# O formulário de vendas não é um fragmento: um envio já reexecuta a página inteira, e depois
+# de gravar o lançamento add_data chama st.rerun() para que estatísticas e gráficos o incluam
 with a1:
     st.subheader("Inserindo Novos Dados", divider="rainbow")
-    from add_data import *
-    add_data()
+    with perfil.span("formulario_vendas"):
+        add_data(dataset)
 
 #metricas
 with a2:
     st.subheader("Estatísticas de Dados", divider="rainbow")
-    from streamlit_extras.metric_cards import style_metric_cards
+    # Estatísticas do período calculadas em uma passada e memorizadas por intervalo de datas
+    with perfil.span("kpis"):
+        kpis = dataset.kpis(start_date, end_date)
     col1,col2=st.columns(2)
-    col1.metric(label="Total de Itens", value=df2['DESCRIÇÃO MATERIAL'].count(), delta="Conjunto de Dados")
-    col2.metric(label="Soma do Preço dos Produtos (BRL)", value=f"{df2['VALOR TOTAL'].sum():,.0f}", delta=f"{df2['VALOR TOTAL'].median():,.0f}")
+    col1.metric(label="Total de Itens", value=kpis["itens"], delta="Conjunto de Dados")
+    col2.metric(label="Soma do Preço dos Produtos (BRL)", value=f"{kpis['soma']:,.0f}", delta=f"{kpis['mediana']:,.0f}")
 
     col11,col22,col33=st.columns(3)
-    col11.metric(label="Preço Máximo", value=f"{df2['VALOR TOTAL'].max():,.0f}", delta="Maior Preço")
-    col22.metric(label="Preço Mínimo", value=f"{df2['VALOR TOTAL'].min():,.0f}", delta="Menor Preço")
-    col33.metric(label="Faixa de Preço ou Intervalo de Preço", value=f"{df2['VALOR TOTAL'].max() - df2['VALOR TOTAL'].min():,.0f}", delta="Intervalo ")
+    col11.metric(label="Preço Máximo", value=f"{kpis['maximo']:,.0f}", delta="Maior Preço")
+    col22.metric(label="Preço Mínimo", value=f"{kpis['minimo']:,.0f}", delta="Menor Preço")
+    col33.metric(label="Faixa de Preço ou Intervalo de Preço", value=f"{kpis['faixa']:,.0f}", delta="Intervalo ")
     #style the metrics 
     style_metric_cards(background_color="#3c4d66",border_left_color="#e6200e",border_color="#0060a")
 
 
 b1, b2 = st.columns(2)
 
-# Renomear a coluna "CÓD.MAT." para "CÓDIGO"
-df2 = df2.rename(columns={"CÓD.MAT.": "CÓDIGO"})
+# A coluna "CÓDIGO" (código do material sem ".0", ou "Sem Código") é calculada na carga da base
 
-# Converter todos os valores na coluna "CÓDIGO" para strings, substituindo valores nulos por "Sem Código"
-df2["CÓDIGO"] = df2["CÓDIGO"].apply(lambda x: str(x).replace(".0", "") if pd.notnull(x) else "Sem Código")
-
-with b1:
+with b1, perfil.span("dispersao_valor_total") as etapa:
     st.subheader("DESCRIÇÃO MATERIAL & VALOR TOTAL", divider="rainbow")
-    source = df2
+    # Envia ao navegador apenas as colunas do gráfico, amostradas por material até o limite de pontos
+    source = downsample_points(df2[["DESCRIÇÃO MATERIAL", "VALOR TOTAL", "CÓDIGO"]], max_pontos)
+    if mostrar_contagem:
+        st.caption(f"Exibindo {len(source):,} de {len(df2):,} pontos")
     chart = alt.Chart(source).mark_circle().encode(
         x="DESCRIÇÃO MATERIAL",
         y="VALOR TOTAL",
-        color="CÓDIGO"  # Usando o novo nome da coluna
+        color="CÓDIGO"  # Coluna calculada na normalização da base
     ).interactive()
     st.altair_chart(chart, theme="streamlit", use_container_width=True)
+    etapa.measure(source, payload=chart)
+
+# Agregados mensais por material no período: os gráficos recebem uma linha por grupo, não por nota
+with perfil.span("agregados_mensais") as etapa:
+    mensal_material = etapa.measure(dataset.rollup("material", start_date, end_date))
 
-with b2:
+with b2, perfil.span("barras_mensais") as etapa:
     st.subheader("Descrição dos Produtos & Quantidade", divider="rainbow")
     
-    # Cria o DataFrame `source` com as colunas "QUANTIDADE" e "DESCRIÇÃO MATERIAL" de `df2`
-    # e substitui valores nulos em "DESCRIÇÃO MATERIAL" (caso existam)
+    # Cria o DataFrame `source` a partir dos agregados mensais por material;
+    # "Date" é o primeiro dia de cada mês e o Altair apenas soma os grupos já agregados
     energy_source = pd.DataFrame({
-       "DESCRIÇÃO MATERIAL": df2["DESCRIÇÃO MATERIAL"], 
-       "VALOR UNITÁRIO (R$)": df2["VALOR UNITÁRIO"], 
-       "Date":df2["EMISSÃO"]
+       "DESCRIÇÃO MATERIAL": mensal_material["DESCRIÇÃO MATERIAL"], 
+       "VALOR UNITÁRIO (R$)": mensal_material["VALOR UNITÁRIO"], 
+       "Date": mensal_material["MÊS"]
     })
 
     # Cria o gráfico de barras usando Altair
@@ -107,84 +147,83 @@ with b2:
 
     # Exibe o gráfico no Streamlit
     st.altair_chart(bar_chart, use_container_width=True)
+    etapa.measure(energy_source, payload=bar_chart)
 
-c1,c2=st.columns(2)
-# Ajustar o layout do Streamlit
-import matplotlib.pyplot as plt
-import seaborn as sns
-import streamlit as st
-
-# Ajustar o layout do Streamlit
-with c1:
+@profiled_section("Main/atributos")
+def secao_atributos(dataset, df2, start_date, end_date):
+    """Seleção das variáveis e dispersão dos 5 materiais mais frequentes ("Atributos por Frequência")"""
     # Subtítulo com separador em arco-íris
     st.subheader("Atributos por Frequência", divider="rainbow")
 
     # Seleção de variáveis qualitativas e quantitativas
-    feature_x = st.selectbox("Select X, qualitative data", df2.select_dtypes("object").columns)
+    feature_x = st.selectbox("Select X, qualitative data", df2.select_dtypes(exclude=["number", "datetime"]).columns.drop("CÓD.MAT."))
     feature_y = st.selectbox("Select Y, quantitative data", df2.select_dtypes("number").columns)
 
-    # Filtrar as 5 categorias mais frequentes em "DESCRIÇÃO MATERIAL"
-    top_5_materials = df2["DESCRIÇÃO MATERIAL"].value_counts().nlargest(5).index
-    df2_filtered = df2[df2["DESCRIÇÃO MATERIAL"].isin(top_5_materials)]
-
-    # Caso a variável selecionada para o eixo X seja "RAZÃO SOCIAL CLIENTE", aplicar uma filtragem adicional
-    if feature_x == "RAZÃO SOCIAL CLIENTE":
-        # Filtrar para os 10 clientes mais frequentes para reduzir o número de labels
-        top_10_clients = df2_filtered["RAZÃO SOCIAL CLIENTE"].value_counts().nlargest(10).index
-        df2_filtered = df2_filtered[df2_filtered["RAZÃO SOCIAL CLIENTE"].isin(top_10_clients)]
-
-    # Criação do gráfico com o DataFrame filtrado, ajustando o tamanho da figura
-    fig, ax = plt.subplots(figsize=(12, 8))  # Tamanho ajustado para o original (12, 8)
-
-    sns.scatterplot(
-        data=df2_filtered, 
-        x=feature_x, 
-        y=feature_y, 
-        hue="DESCRIÇÃO MATERIAL", 
-        ax=ax,
-        alpha=0.5,           # Aumenta a transparência para reduzir a sobreposição
-        s=80                 # Reduz o tamanho dos pontos para melhor visualização
-    )
-
-    # Ajuste das labels para reduzir sobreposição
-    if feature_x == "RAZÃO SOCIAL CLIENTE":
-        # Abrevia nomes longos e rotaciona as labels
-        ax.set_xticklabels([label.get_text()[:15] + '...' if len(label.get_text()) > 15 else label.get_text() 
-                            for label in ax.get_xticklabels()], rotation=45, ha='right', fontsize=9)
-    else:
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=30, ha='right', fontsize=9)
-
-    ax.set_yticklabels(ax.get_yticklabels(), fontsize=8)
-
-    # Títulos e legendas melhorados
-    ax.set_title("Visualização das 5 Principais Categorias de Material", fontsize=16)
-    ax.set_xlabel("Variável Qualitativa (X)", fontsize=14)
-    ax.set_ylabel("Variável Quantitativa (Y)", fontsize=14)
-
-    # Legenda fora do gráfico para uma visualização mais compacta
-    ax.legend(title="Descrição Material", bbox_to_anchor=(1.05, 1), loc='upper left')
+    # Filtrar as 5 categorias mais frequentes em "DESCRIÇÃO MATERIAL" pelo índice de frequência
+    # mensal (sem contar a base do período a cada rerun); caso a variável do eixo X seja
+    # "RAZÃO SOCIAL CLIENTE", mantém só os 10 clientes mais frequentes para reduzir o número de labels
+    with span("top5_materiais") as etapa:
+        df2_filtered = dataset.top_rows(
+            start_date, end_date, materials=5, clients=10 if feature_x == "RAZÃO SOCIAL CLIENTE" else None
+        )
 
-    # Adiciona linhas de grade para facilitar a comparação dos valores
-    ax.grid(True, linestyle='--', alpha=0.7)
+        # Remove as categorias sem linhas para que o seaborn não desenhe eixos e legendas vazios
+        df2_filtered = etapa.measure(df2_filtered.assign(**{
+            coluna: df2_filtered[coluna].cat.remove_unused_categories()
+            for coluna in df2_filtered.select_dtypes("category").columns
+        }))
+
+    # Criação do gráfico com o DataFrame filtrado; a imagem fica em cache por base, período
+    # e variáveis, então reruns causados por outros widgets não desenham a figura de novo.
+    # As figuras são desenhadas na thread do cache, uma de cada vez (o matplotlib não é
+    # seguro para desenhos simultâneos entre sessões)
+    with span("dispersao_seaborn") as etapa:
+        chave_dispersao = (dataset.version, start_date, end_date, feature_x, feature_y)
+        desenhar = partial(frequency_scatter, df2_filtered, feature_x, feature_y)
+        imagem = get_figure_cache().submit(chave_dispersao, desenhar).result()
+        st.image(imagem, width="stretch")
+        etapa.record(linhas=len(df2_filtered), bytes=len(imagem))
+
+# Em segundo plano, a seção roda em paralelo ao restante da página nas execuções completas,
+# e o restante da página aparece sem esperar o desenho da figura
+secao_atributos_paralela = st.fragment(secao_atributos, parallel=True, key="atributos_paralela")
+secao_atributos = st.fragment(secao_atributos, key="atributos")
+
+@st.fragment
+@profiled_section("Main/quantidade")
+def secao_quantidade(mensal_material):
+    """Barras da quantidade total por material, calculadas só com o expander aberto"""
+    st.subheader("DESCRIÇÃO MATERIAL & QUANTIDADE", divider="rainbow")
+    with st.expander("Exibir Descrição Material", key="expander_quantidade", on_change="rerun") as expander:
+        if not expander.open:
+            return
+        with span("barras_quantidade") as etapa:
+            # Soma a quantidade de cada material nos meses do período
+            # e substitui valores nulos em "DESCRIÇÃO MATERIAL" (caso existam)
+            quantidade_material = mensal_material.groupby("DESCRIÇÃO MATERIAL", observed=True, dropna=False, as_index=False)["QUANTIDADE"].sum()
+            source = pd.DataFrame({
+                "QUANTIDADE ($)": quantidade_material["QUANTIDADE"],
+                "DESCRIÇÃO MATERIAL ($)": quantidade_material["DESCRIÇÃO MATERIAL"].cat.add_categories("Sem descrição").fillna("Sem descrição")
+            })
+            # Cria o gráfico de barras
+            bar_chart = alt.Chart(source).mark_bar().encode(
+                x=alt.X("sum(QUANTIDADE ($)):Q", title="Quantidade Total ($)"),
+                y=alt.Y("DESCRIÇÃO MATERIAL ($):N", sort="-x", title="Descrição do Material")
+            )
+
+            # Exibe o gráfico no Streamlit
+            st.altair_chart(bar_chart, use_container_width=True)
+            etapa.measure(source, payload=bar_chart)
 
-    # Exibe o gráfico no Streamlit
-    st.pyplot(fig)
+c1,c2=st.columns(2)
 
-with c2:    
-    st.subheader("DESCRIÇÃO MATERIAL & QUANTIDADE", divider="rainbow")
+with c1:
+    if segundo_plano:
+        secao_atributos_paralela(dataset, df2, start_date, end_date)
+    else:
+        secao_atributos(dataset, df2, start_date, end_date)
 
-    # Cria o DataFrame `source` com as colunas "QUANTIDADE" e "DESCRIÇÃO MATERIAL" de `df2`
-    # e substitui valores nulos em "DESCRIÇÃO MATERIAL" (caso existam)
-    source = pd.DataFrame({
-        "QUANTIDADE ($)": df2["QUANTIDADE"],
-        "DESCRIÇÃO MATERIAL ($)": df2["DESCRIÇÃO MATERIAL"].fillna("Sem descrição")
-    })
-    with st.expander("Exibir Descrição Material"):
-    # Cria o gráfico de barras
-        bar_chart = alt.Chart(source).mark_bar().encode(
-            x=alt.X("sum(QUANTIDADE ($)):Q", title="Quantidade Total ($)"),
-            y=alt.Y("DESCRIÇÃO MATERIAL ($):N", sort="-x", title="Descrição do Material")
-        )
+with c2:
+    secao_quantidade(mensal_material)
 
-        # Exibe o gráfico no Streamlit
-        st.altair_chart(bar_chart, use_container_width=True)
+finish_run(perfil)
@@ -1,11 +1,25 @@
 import pandas as pd
 import streamlit as st
+from sales_dataset import get_dataset
+from sales_journal import SalesJournal
+from sales_import import DATE_FORMAT_HELP, import_sales_file
+from profiling import span
 
-def add_data():
+# Chave em st.session_state com o resultado do último lançamento ou importação, exibido depois
+# do st.rerun() que recarrega a página com os dados novos
+RESULT_KEY = "_resultado_lancamento"
+
+def add_data(dataset=None):
     try:
-        # Carrega o arquivo Excel da planilha de vendas
-        df = pd.read_excel("base_2.xlsx")  # Substitua pelo caminho correto do seu arquivo
-        
+        # Usa o retrato compartilhado da base de vendas em vez de reler a planilha
+        if dataset is None:
+            dataset = get_dataset("base_2.xlsx")  # Substitua pelo caminho correto do seu arquivo
+        choices = dataset.choices
+
+        # Resultado da gravação feita na execução anterior (origem, mensagem, linhas rejeitadas)
+        origem, mensagem, rejeitadas = st.session_state.pop(RESULT_KEY, (None, None, None))
+        if origem == "formulario":
+            st.success(mensagem)
 
         # Formulário para entrada de dados com Streamlit
         with st.form("form_sales", clear_on_submit=True):
@@ -13,19 +27,19 @@ def add_data():
             col1, col2, col3 = st.columns(3)
             nf = col1.number_input("NF", min_value=0)
             st_field = col2.text_input("ST")
-            cfop = col3.selectbox("CFOP", df["CFOP"].unique())
+            cfop = col3.selectbox("CFOP", choices["CFOP"])
             
             col4, col5 = st.columns(2)
             emissao = col4.date_input("Data de Emissão")
-            vendedor = col5.text_input("Vendedor")
+            vendedor = col5.number_input("Vendedor", min_value=0)
             
             col6, col7 = st.columns(2)
-            cliente = col6.selectbox("Razão Social Cliente", df["RAZÃO SOCIAL CLIENTE"].unique())
-            uf = col7.selectbox("UF", df["UF"].unique())
+            cliente = col6.selectbox("Razão Social Cliente", choices["RAZÃO SOCIAL CLIENTE"])
+            uf = col7.selectbox("UF", choices["UF"])
             
             col8, col9 = st.columns(2)
-            codigo_material = col8.selectbox("Código do Material", df["CÓD.MAT."].unique())
-            descricao_material = col9.selectbox("Descrição do Material", df["DESCRIÇÃO MATERIAL"].unique())
+            codigo_material = col8.selectbox("Código do Material", choices["CÓD.MAT."])
+            descricao_material = col9.selectbox("Descrição do Material", choices["DESCRIÇÃO MATERIAL"])
             
             col10, col11, col12 = st.columns(3)
             unidade_medida = col10.text_input("Unidade de Medida", value="UN")
@@ -36,7 +50,7 @@ def add_data():
             valor_total = quantidade * valor_unitario
             
             # Botão de envio
-            btn = st.form_submit_button("Salvar Dados no Excel", type="primary")
+            btn = st.form_submit_button("Salvar Dados", type="primary")
             
             # Validação e salvamento dos dados
             if btn:
@@ -62,17 +76,40 @@ def add_data():
                         'VALOR TOTAL': float(valor_total),
                     }])
                     
-                    # Concatena o novo registro ao DataFrame original
-                    df = pd.concat([df, new_data], ignore_index=True)
-                    
-                    # Salva o DataFrame atualizado em um novo arquivo Excel
+                    # Acrescenta o novo registro ao diário de vendas e recarrega a página, para que
+                    # estatísticas e gráficos já incluam o lançamento
                     try:
-                        df.to_excel("sales_updated.xlsx", index=False)
-                        st.success(f"O produto '{descricao_material}' foi adicionado com sucesso!")
-                        return True
-                    except:
-                        st.warning("Não foi possível salvar o arquivo. Por favor, feche o arquivo antes de tentar novamente.")
+                        with span("salvar_lancamento") as etapa:
+                            journal = SalesJournal()
+                            journal.append(etapa.measure(new_data))
+                            journal.maybe_compact()
+                    except (OSError, ValueError):
+                        st.warning("Não foi possível salvar o lançamento. Por favor, tente novamente.")
                         return False
+                    st.session_state[RESULT_KEY] = (
+                        "formulario", f"O produto '{descricao_material}' foi adicionado com sucesso!", None
+                    )
+                    st.rerun()
+
+        # Importação em lote de um arquivo com as mesmas colunas da planilha
+        with st.expander("Importar Lote de Notas (CSV/XLSX)"):
+            if origem == "importacao":
+                st.success(mensagem)
+                if len(rejeitadas):
+                    st.warning(f"{len(rejeitadas)} linhas rejeitadas:")
+                    st.dataframe(rejeitadas, width="stretch")
+            arquivo = st.file_uploader(f"Arquivo com as colunas da planilha de vendas ({DATE_FORMAT_HELP})", type=["csv", "xlsx"])
+            if arquivo is not None and st.button("Importar Lote", type="primary"):
+                try:
+                    with span("importar_lote") as etapa:
+                        importadas, rejeitadas = import_sales_file(arquivo, SalesJournal(), name=arquivo.name)
+                        etapa.record(linhas=importadas + len(rejeitadas), bytes=arquivo.size)
+                except ValueError as e:
+                    st.warning(str(e))
+                    return False
+                # Recarrega a página com as linhas importadas; o resultado é exibido na próxima execução
+                st.session_state[RESULT_KEY] = ("importacao", f"{importadas} linhas importadas com sucesso!", rejeitadas)
+                st.rerun()
     except Exception as e:
         st.error(f"Erro ao carregar os dados: {e}")
 
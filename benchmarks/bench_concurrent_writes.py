@@ -0,0 +1,107 @@
+"""Teste de carga com várias threads/processos gravando ao mesmo tempo no DataManager.
+
+Cada trabalhador registra manutenções, comparações e estados de peças; ao final o script
+confere que nenhuma gravação foi perdida e mostra a vazão de cada backend.
+
+Uso:
+    python benchmarks/bench_concurrent_writes.py [--backends json sqlite jsonl] [--workers 8] [--ops 50] [--processes]
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_manager import DataManager  # noqa: E402
+from storage import open_storage  # noqa: E402
+
+# Peças distintas atualizadas por cada trabalhador
+PECAS_POR_TRABALHADOR = 5
+
+
+def make_manager(backend, data_dir):
+    """Cria um DataManager gravando no diretório informado"""
+    manager = DataManager(storage=open_storage(backend, data_dir))
+    manager.maintenance_file = os.path.join(data_dir, "maintenance.json")
+    manager.comparison_file = os.path.join(data_dir, "comparison_history.csv")
+    manager.parts_status_file = os.path.join(data_dir, "parts_status.json")
+    if manager.storage is None:
+        manager._initialize_files()
+    return manager
+
+
+def worker(backend, data_dir, trabalhador, ops):
+    """Executa as gravações de um trabalhador e retorna quantas operações fez"""
+    manager = make_manager(backend, data_dir)
+    for i in range(ops):
+        manager.add_maintenance_record({
+            "peca": f"Peca {trabalhador}",
+            "tipo_manutencao": "Preventiva",
+            "descricao": f"operacao {i}",
+            "custo": float(i),
+        })
+        manager.add_comparison(f"T{trabalhador}", f"op{i}", float(i))
+        manager.update_part_status(f"P{trabalhador}-{i % PECAS_POR_TRABALHADOR}", f"Status {i}")
+    return 3 * ops
+
+
+def verify(backend, data_dir, workers, ops):
+    """Confere que todas as gravações estão no armazenamento e retorna a lista de falhas"""
+    manager = make_manager(backend, data_dir)
+    falhas = []
+    manutencoes = len(manager.get_maintenance_history())
+    if manutencoes != workers * ops:
+        falhas.append(f"manutenções: {manutencoes} de {workers * ops}")
+    comparacoes = len(manager.get_comparison_history())
+    if comparacoes != workers * ops:
+        falhas.append(f"comparações: {comparacoes} de {workers * ops}")
+    pecas = len(manager.get_part_status())
+    esperadas = workers * min(ops, PECAS_POR_TRABALHADOR)
+    if pecas != esperadas:
+        falhas.append(f"peças: {pecas} de {esperadas}")
+    return falhas
+
+
+def run(backends, workers, ops, processos):
+    """Executa a carga em cada backend e imprime vazão e verificação"""
+    modo = "processos" if processos else "threads"
+    print(f"{workers} {modo} x {ops} iterações (3 gravações cada)")
+    print(f"{'backend':>8} {'tempo (s)':>10} {'gravações/s':>12}  resultado")
+    for backend in backends:
+        data_dir = tempfile.mkdtemp(prefix=f"bench_{backend}_")
+        try:
+            make_manager(backend, data_dir)
+            if processos:
+                executor = multiprocessing.get_context("spawn").Pool(workers)
+                # Aguarda os processos subirem para não medir a importação dos módulos
+                executor.map(abs, range(workers))
+                args = [(backend, data_dir, t, ops) for t in range(workers)]
+                inicio = time.perf_counter()
+                total = sum(executor.starmap(worker, args))
+                executor.close()
+                executor.join()
+            else:
+                with ThreadPoolExecutor(workers) as executor:
+                    inicio = time.perf_counter()
+                    futuros = [executor.submit(worker, backend, data_dir, t, ops) for t in range(workers)]
+                    total = sum(f.result() for f in futuros)
+            duracao = time.perf_counter() - inicio
+            falhas = verify(backend, data_dir, workers, ops)
+            resultado = "ok" if not falhas else "PERDA: " + "; ".join(falhas)
+            print(f"{backend:>8} {duracao:>10.2f} {total / duracao:>12.0f}  {resultado}")
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite", "jsonl"])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=50)
+    parser.add_argument("--processes", action="store_true", help="usa processos em vez de threads")
+    args = parser.parse_args()
+    run(args.backends, args.workers, args.ops, args.processes)
@@ -0,0 +1,212 @@
+"""Tempo de cada etapa do caminho de dados do dashboard e das operações do DataManager.
+
+Gera bases sintéticas com as distribuições de Base_fiap.csv (ver sales_generator.py) e mede,
+para cada tamanho, as etapas do Main.py (leitura do CSV/XLSX, normalização dos tipos, filtro de
+período, estatísticas dos cards, preparo dos gráficos e filtro dos 5 materiais mais frequentes,
+pelo índice de frequência e pela contagem de toda a base do período)
+e as operações do DataManager em cada backend. Os resultados podem ser gravados em JSON e
+comparados com uma execução anterior para acompanhar regressões.
+
+Uso:
+    python benchmarks/bench_data_path.py [--sizes 1000 100000 1000000] [--groups painel manutencao]
+        [--backends json sqlite jsonl] [--output resultados.json] [--compare anterior.json]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_manager import DataManager  # noqa: E402
+from sales_charts import MAX_SCATTER_POINTS, downsample_points  # noqa: E402
+from sales_dataset import SalesSnapshot  # noqa: E402
+from sales_generator import SalesModel, write_sales  # noqa: E402
+from sales_loader import normalize_sales, read_source  # noqa: E402
+from sales_metrics import KpiEngine  # noqa: E402
+from sales_rollups import SalesRollups  # noqa: E402
+from sales_topk import MATERIAL_COLUMN, TopKIndex  # noqa: E402
+from storage import open_storage  # noqa: E402
+from synthetic import make_maintenance  # noqa: E402
+
+# Período consultado nas etapas do painel (dentro dos anos gerados por SalesModel.chunks)
+PERIODO = (pd.Timestamp("2020-01-01"), pd.Timestamp("2020-12-31"))
+
+# Acima deste número de linhas o XLSX não é gerado (a escrita e a leitura com openpyxl levariam minutos)
+XLSX_MAX = 100_000
+
+
+def elapsed(funcao, repeticoes):
+    """Retorna o menor tempo, em milissegundos, entre as execuções"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos) * 1000
+
+
+def scan_top_materials(df2):
+    """Filtro anterior do bloco "Atributos por Frequência": contagem de toda a base do período a cada rerun"""
+    top_5_materials = df2["DESCRIÇÃO MATERIAL"].value_counts().nlargest(5).index
+    df2_filtered = df2[df2["DESCRIÇÃO MATERIAL"].isin(top_5_materials)]
+    top_10_clients = df2_filtered["RAZÃO SOCIAL CLIENTE"].value_counts().nlargest(10).index
+    return df2_filtered[df2_filtered["RAZÃO SOCIAL CLIENTE"].isin(top_10_clients)]
+
+
+def chart_data(snapshot, rollups, df2):
+    """Preparo dos gráficos do Main.py: dispersão amostrada e agregados mensais por material"""
+    downsample_points(df2[["DESCRIÇÃO MATERIAL", "VALOR TOTAL", "CÓDIGO"]], MAX_SCATTER_POINTS)
+    mensal = rollups.query("material", *PERIODO, snapshot.period)
+    mensal.groupby("DESCRIÇÃO MATERIAL", observed=True, dropna=False, as_index=False)["QUANTIDADE"].sum()
+
+
+def bench_dashboard(model, linhas, diretorio, repeticoes, xlsx_max=XLSX_MAX):
+    """Mede as etapas do caminho de dados do Main.py e retorna [(etapa, ms)]"""
+    csv_file = os.path.join(diretorio, "vendas.csv")
+    write_sales(csv_file, linhas, model)
+    etapas = [("leitura_csv", elapsed(lambda: read_source(csv_file), repeticoes))]
+    if linhas <= xlsx_max:
+        xlsx_file = os.path.join(diretorio, "vendas.xlsx")
+        write_sales(xlsx_file, linhas, model)
+        etapas.append(("leitura_xlsx", elapsed(lambda: read_source(xlsx_file), 1)))
+
+    bruto = read_source(csv_file)
+    etapas.append(("normalizacao", elapsed(lambda: normalize_sales(bruto), repeticoes)))
+    df = normalize_sales(bruto)
+    etapas.append(("retrato", elapsed(lambda: SalesSnapshot(df, "bench"), repeticoes)))
+    snapshot = SalesSnapshot(df, "bench")
+    etapas.append(("filtro_periodo", elapsed(lambda: snapshot.period(*PERIODO), repeticoes)))
+    df2 = snapshot.period(*PERIODO)
+    etapas.append(("kpis", elapsed(lambda: KpiEngine(snapshot).period(*PERIODO), repeticoes)))
+    etapas.append(("agregados_mensais", elapsed(lambda: SalesRollups(df), repeticoes)))
+    rollups = SalesRollups(df)
+    etapas.append(("graficos", elapsed(lambda: chart_data(snapshot, rollups, df2), repeticoes)))
+    etapas.append(("indice_frequencia", elapsed(
+        lambda: TopKIndex.from_column(df[MATERIAL_COLUMN], snapshot.date_index), repeticoes
+    )))
+    snapshot.material_index
+    etapas.append(("top5_materiais", elapsed(lambda: snapshot.top_rows(*PERIODO, 5, 10), repeticoes)))
+    etapas.append(("top5_varredura", elapsed(lambda: scan_top_materials(df2), repeticoes)))
+    return etapas
+
+
+def make_manager(backend, diretorio):
+    """Cria um DataManager novo (com cache vazio) sobre os dados do diretório"""
+    manager = DataManager(storage=open_storage(backend, diretorio))
+    manager.maintenance_file = os.path.join(diretorio, "maintenance.json")
+    manager.comparison_file = os.path.join(diretorio, "comparison_history.csv")
+    manager.parts_status_file = os.path.join(diretorio, "parts_status.json")
+    return manager
+
+
+def preload(backend, diretorio, registros):
+    """Grava os registros de uma só vez, sem passar por add_maintenance_record"""
+    manager = make_manager(backend, diretorio)
+    if manager.storage is None:
+        manager._initialize_files()
+        with open(manager.maintenance_file, "w", encoding="utf-8") as f:
+            json.dump(registros, f, ensure_ascii=False)
+        return
+    manager.storage.add_maintenance_records(registros)
+    if hasattr(manager.storage, "compact"):
+        manager.storage.compact()
+
+
+def bench_maintenance(backend, linhas, diretorio, repeticoes):
+    """Mede as operações do DataManager com `linhas` registros e retorna [(etapa, ms)]"""
+    preload(backend, diretorio, make_maintenance(linhas))
+    peca = "Peça 7"
+    consulta = dict(peca=peca, start=datetime(2023, 6, 1), end=datetime(2023, 12, 31), limit=50)
+
+    # "_fria": primeira chamada em um DataManager novo; as demais aproveitam o cache de leitura
+    etapas = [
+        ("historico_fria", elapsed(lambda: make_manager(backend, diretorio).get_maintenance_history(), repeticoes)),
+        ("consulta_fria", elapsed(lambda: make_manager(backend, diretorio).query_maintenance(**consulta), repeticoes)),
+        ("analise_fria", elapsed(lambda: make_manager(backend, diretorio).get_maintenance_analytics(), repeticoes)),
+    ]
+    manager = make_manager(backend, diretorio)
+    manager.get_maintenance_history()
+    manager.query_maintenance(**consulta)
+    etapas += [
+        ("historico", elapsed(manager.get_maintenance_history, repeticoes)),
+        ("consulta", elapsed(lambda: manager.query_maintenance(**consulta), repeticoes)),
+        ("analise", elapsed(manager.get_maintenance_analytics, repeticoes)),
+        ("colunas", elapsed(manager.get_maintenance_columns, repeticoes)),
+        ("gravacao", elapsed(lambda: manager.add_maintenance_record({
+            "peca": peca, "tipo_manutencao": "Corretiva", "descricao": "bench", "custo": 10.0
+        }), repeticoes)),
+    ]
+    if hasattr(manager.storage, "close"):
+        manager.storage.close()
+    return etapas
+
+
+def compare(resultados, anterior_file):
+    """Imprime a razão entre os tempos atuais e os de uma execução anterior"""
+    with open(anterior_file, "r", encoding="utf-8") as f:
+        anteriores = {
+            (r["grupo"], r["backend"], r["etapa"], r["linhas"]): r["ms"] for r in json.load(f)["resultados"]
+        }
+    print(f"\nComparação com {anterior_file} (atual / anterior):")
+    for r in resultados:
+        anterior = anteriores.get((r["grupo"], r["backend"], r["etapa"], r["linhas"]))
+        if anterior:
+            print(f"{r['grupo']:>11} {r['backend'] or '-':>7} {r['etapa']:>18} {r['linhas']:>9} {r['ms'] / anterior:>8.2f}x")
+
+
+def run(sizes, groups, backends, repeticoes=3):
+    """Executa o benchmark e retorna a lista de resultados (grupo, backend, etapa, linhas, ms)"""
+    print(f"{'grupo':>11} {'backend':>7} {'etapa':>18} {'linhas':>9} {'ms':>12}")
+    resultados = []
+    model = SalesModel.from_file() if "painel" in groups else None
+
+    def registrar(grupo, backend, linhas, etapas):
+        for etapa, ms in etapas:
+            resultados.append({"grupo": grupo, "backend": backend, "etapa": etapa, "linhas": linhas, "ms": ms})
+            print(f"{grupo:>11} {backend or '-':>7} {etapa:>18} {linhas:>9} {ms:>12.2f}")
+
+    for linhas in sizes:
+        if "painel" in groups:
+            diretorio = tempfile.mkdtemp(prefix="bench_painel_")
+            try:
+                registrar("painel", None, linhas, bench_dashboard(model, linhas, diretorio, repeticoes))
+            finally:
+                shutil.rmtree(diretorio, ignore_errors=True)
+        if "manutencao" in groups:
+            for backend in backends:
+                diretorio = tempfile.mkdtemp(prefix=f"bench_{backend}_")
+                try:
+                    registrar("manutencao", backend, linhas, bench_maintenance(backend, linhas, diretorio, repeticoes))
+                finally:
+                    shutil.rmtree(diretorio, ignore_errors=True)
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--groups", nargs="+", choices=["painel", "manutencao"], default=["painel", "manutencao"])
+    parser.add_argument("--backends", nargs="+", choices=["json", "sqlite", "jsonl"], default=["json", "sqlite", "jsonl"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    resultados = run(args.sizes, args.groups, args.backends, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "gerado_em": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "plataforma": platform.platform(),
+                "resultados": resultados,
+            }, f, ensure_ascii=False, indent=4)
+    if args.compare:
+        compare(resultados, args.compare)
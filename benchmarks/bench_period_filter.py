@@ -0,0 +1,61 @@
+"""Compara o filtro de período por máscara booleana com a busca binária no índice de datas.
+
+Uso:
+    python benchmarks/bench_period_filter.py [--sizes 27505 270000 2700000 5000000]
+"""
+import argparse
+import os
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sales_dataset import build_date_index, period_bounds  # noqa: E402
+
+
+def make_history(linhas, seed=42):
+    """Gera um histórico de notas ordenado por emissão com o número de linhas pedido"""
+    rng = np.random.default_rng(seed)
+    inicio = np.datetime64("2019-01-01")
+    dias = np.sort(rng.integers(0, 365 * 6, size=linhas))
+    return pd.DataFrame({
+        "EMISSÃO": inicio + dias.astype("timedelta64[D]"),
+        "VALOR TOTAL": rng.gamma(2.0, 1500.0, size=linhas),
+    })
+
+
+def filter_mask(df, start, end):
+    """Filtro original do Main.py: máscara booleana sobre a base inteira"""
+    return df[(df["EMISSÃO"] >= start) & (df["EMISSÃO"] <= end)]
+
+
+def filter_sorted(df, date_index, start, end):
+    """Filtro por busca binária: fatia contígua da base ordenada"""
+    inicio, fim = period_bounds(date_index, start, end)
+    return df.iloc[inicio:fim]
+
+
+def run(sizes, repeticoes=20):
+    """Executa o benchmark para cada tamanho e imprime a latência média em milissegundos"""
+    start, end = pd.Timestamp("2020-03-01"), pd.Timestamp("2020-06-30")
+    print(f"{'linhas':>10} {'máscara (ms)':>14} {'busca binária (ms)':>20}")
+    resultados = []
+    for linhas in sizes:
+        df = make_history(linhas)
+        date_index = build_date_index(df)
+        assert len(filter_mask(df, start, end)) == len(filter_sorted(df, date_index, start, end))
+
+        mascara = timeit.timeit(lambda: filter_mask(df, start, end), number=repeticoes) / repeticoes
+        binaria = timeit.timeit(lambda: filter_sorted(df, date_index, start, end), number=repeticoes) / repeticoes
+        resultados.append((linhas, mascara * 1000, binaria * 1000))
+        print(f"{linhas:>10} {mascara * 1000:>14.3f} {binaria * 1000:>20.3f}")
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[27_505, 270_000, 2_700_000, 5_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
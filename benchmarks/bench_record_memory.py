@@ -0,0 +1,68 @@
+"""Memória ocupada pelo histórico de manutenção em dicionários, registros tipados e colunas.
+
+Gera registros sintéticos e mede, com tracemalloc, o tamanho de cada representação a cada
+100 mil registros, além do tempo para montar o DataFrame de exibição a partir de cada uma.
+
+Uso:
+    python benchmarks/bench_record_memory.py [--sizes 100000 1000000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from records import MaintenanceRecord, RecordColumns  # noqa: E402
+from synthetic import make_maintenance  # noqa: E402
+
+
+def measure(construir):
+    """Retorna (valor, bytes alocados) ao construir uma representação"""
+    gc.collect()
+    tracemalloc.start()
+    valor = construir()
+    tamanho, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return valor, tamanho
+
+
+def elapsed(funcao, repeticoes=3):
+    """Retorna o menor tempo, em milissegundos, entre algumas execuções"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos) * 1000
+
+
+def run(sizes):
+    """Executa o benchmark para cada tamanho e imprime MB por 100 mil registros e o tempo do DataFrame"""
+    print(f"{'registros':>10} {'representação':>16} {'MB/100k':>10} {'DataFrame (ms)':>16}")
+    resultados = []
+    for quantidade in sizes:
+        # Os dicionários são medidos com os textos, como chegam do JSON; registros e colunas
+        # reaproveitam esses textos, então o valor medido é só o que cada um acrescenta
+        dicts, memoria_dicts = measure(lambda: make_maintenance(quantidade))
+        registros, memoria_registros = measure(lambda: [MaintenanceRecord(**r) for r in dicts])
+        colunas, memoria_colunas = measure(lambda: RecordColumns.from_dicts(MaintenanceRecord, dicts))
+        linhas = [
+            ("dicionários", memoria_dicts, elapsed(lambda: pd.DataFrame(dicts))),
+            ("slots", memoria_registros, elapsed(lambda: pd.DataFrame(registros))),
+            ("colunas", memoria_colunas, elapsed(colunas.to_frame)),
+        ]
+        for nome, memoria, tempo in linhas:
+            por_100k = memoria / 2**20 * 100_000 / quantidade
+            resultados.append((quantidade, nome, por_100k, tempo))
+            print(f"{quantidade:>10} {nome:>16} {por_100k:>10.1f} {tempo:>16.2f}")
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+    run(args.sizes)
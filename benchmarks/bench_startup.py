@@ -0,0 +1,117 @@
+"""Tempo de importação e da primeira execução do Main.py, com e sem o aquecimento do servidor.
+
+Cada medida roda em um processo novo (imports e caches vazios, como logo após um deploy):
+os imports do topo do Main.py antes e depois de adiar as bibliotecas de gráficos, a primeira
+execução da página (AppTest) sem aquecimento, o aquecimento de warmup.py e a primeira
+execução depois dele, no mesmo processo. A base é a planilha do projeto (cache Parquet em
+data/cache, construído antes das medidas).
+
+Uso:
+    python benchmarks/bench_startup.py [--repeat 3]
+"""
+import argparse
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# Imports do topo do Main.py antes de adiar as bibliotecas de gráficos (o sales_charts
+# importava o seaborn e o figure_cache, o backend do matplotlib)
+IMPORTS_ANTERIORES = [
+    "pandas", "numpy", "matplotlib.pyplot", "seaborn", "plotly.express", "altair", "streamlit",
+    "streamlit_extras.dataframe_explorer", "streamlit_extras.metric_cards", "add_data",
+    "sales_dataset", "sales_loader", "sales_charts", "figure_cache", "profiling",
+    "matplotlib.backends.backend_agg",
+]
+
+# Imports do topo do Main.py atual
+IMPORTS_ATUAIS = [
+    "pandas", "altair", "streamlit", "streamlit_extras.metric_cards", "add_data",
+    "sales_dataset", "sales_loader", "sales_charts", "figure_cache", "profiling",
+]
+
+
+def import_modules(modulos):
+    """Importa os módulos instalados da lista (o plotly saiu das dependências)"""
+    for modulo in modulos:
+        if importlib.util.find_spec(modulo.split(".")[0]) is not None:
+            importlib.import_module(modulo)
+
+
+def first_run():
+    """Primeira execução do Main.py em uma sessão de teste, com o tempo total"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(RAIZ, "Main.py"), default_timeout=300)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+
+def _measure(etapa, fila):
+    """Executa a etapa em um processo novo e envia {etapa: ms}"""
+    os.chdir(RAIZ)
+    tempos = {}
+    inicio = time.perf_counter()
+    if etapa == "importacoes_anteriores":
+        import_modules(IMPORTS_ANTERIORES)
+    elif etapa == "importacoes_atuais":
+        import_modules(IMPORTS_ATUAIS)
+    elif etapa == "primeira_execucao":
+        first_run()
+    else:
+        from warmup import warm_up
+
+        warm_up()
+        tempos["aquecimento"] = (time.perf_counter() - inicio) * 1000
+        inicio = time.perf_counter()
+        first_run()
+    tempos[etapa] = (time.perf_counter() - inicio) * 1000
+    fila.put(tempos)
+
+
+def measure(etapa):
+    """Retorna os tempos (ms) da etapa, medida em um processo separado"""
+    contexto = multiprocessing.get_context("spawn")
+    fila = contexto.Queue()
+    processo = contexto.Process(target=_measure, args=(etapa, fila))
+    processo.start()
+    resultado = fila.get()
+    processo.join()
+    return resultado
+
+
+ETAPAS = ["importacoes_anteriores", "importacoes_atuais", "primeira_execucao", "primeira_execucao_aquecida"]
+
+
+def run(repeat=3):
+    """Executa cada etapa `repeat` vezes e retorna {etapa: mediana em ms}"""
+    from sales_dataset import get_dataset
+
+    os.chdir(RAIZ)
+    get_dataset("base_2.xlsx")  # Constrói o cache Parquet, se necessário, fora das medidas
+
+    medidas = {}
+    for etapa in ETAPAS:
+        for _ in range(repeat):
+            for nome, ms in measure(etapa).items():
+                medidas.setdefault(nome, []).append(ms)
+
+    print(f"{'etapa':>28} {'ms (mediana)':>13}")
+    resultados = {nome: statistics.median(tempos) for nome, tempos in medidas.items()}
+    for nome, ms in resultados.items():
+        print(f"{nome:>28} {ms:>13.0f}")
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.repeat)
@@ -0,0 +1,101 @@
+"""Pico de memória e tempo da carga da base de vendas inteira e em lotes.
+
+Gera um CSV sintético com as distribuições de Base_fiap.csv (ver sales_generator.py) e mede
+a leitura inteira (read_source + normalize_sales, como antes), a construção do cache Parquet
+em lotes (build_cache) e os agregados mensais montados da base inteira e lote a lote. Cada
+medida roda em um processo novo, e o pico de memória é o maior RSS do processo descontado o
+RSS depois dos imports (as strings do pandas ficam fora do alcance do tracemalloc).
+
+Uso:
+    python benchmarks/bench_streaming_load.py [--sizes 100000 1000000] [--chunk-size 100000]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sales_generator import write_sales  # noqa: E402
+from sales_loader import CHUNK_SIZE, build_cache, iter_sales, normalize_sales, read_source  # noqa: E402
+from sales_rollups import SalesRollups  # noqa: E402
+
+
+def load_whole(csv_file, diretorio, chunk_size):
+    """Carga anterior: lê a planilha inteira e normaliza de uma vez"""
+    return normalize_sales(read_source(csv_file))
+
+
+def load_chunks(csv_file, diretorio, chunk_size):
+    """Constrói o cache Parquet lote a lote e lê o resultado"""
+    return build_cache(csv_file, os.path.join(diretorio, "cache"), chunk_size)
+
+
+def rollups_whole(csv_file, diretorio, chunk_size):
+    """Agregados mensais a partir da base inteira"""
+    return SalesRollups(normalize_sales(read_source(csv_file)))
+
+
+def rollups_chunks(csv_file, diretorio, chunk_size):
+    """Agregados mensais alimentados lote a lote, sem montar a base"""
+    return SalesRollups.from_chunks(iter_sales(csv_file, chunk_size))
+
+
+ETAPAS = [
+    ("carga_inteira", load_whole),
+    ("carga_lotes", load_chunks),
+    ("agregados_inteira", rollups_whole),
+    ("agregados_lotes", rollups_chunks),
+]
+
+
+def _measure(funcao, csv_file, diretorio, chunk_size, fila):
+    """Executa a etapa em um processo novo e envia (ms, MB acima do RSS inicial)"""
+    inicial = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    inicio = time.perf_counter()
+    funcao(csv_file, diretorio, chunk_size)
+    ms = (time.perf_counter() - inicio) * 1000
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    fila.put((ms, (pico - inicial) / 1024))
+
+
+def measure(funcao, csv_file, diretorio, chunk_size):
+    """Retorna (ms, MB de pico) da etapa, medida em um processo separado"""
+    contexto = multiprocessing.get_context("spawn")
+    fila = contexto.Queue()
+    processo = contexto.Process(target=_measure, args=(funcao, csv_file, diretorio, chunk_size, fila))
+    processo.start()
+    resultado = fila.get()
+    processo.join()
+    return resultado
+
+
+def run(sizes, chunk_size=CHUNK_SIZE):
+    """Executa o benchmark para cada tamanho e retorna [(linhas, etapa, ms, MB de pico)]"""
+    print(f"{'linhas':>9} {'CSV (MB)':>9} {'etapa':>18} {'ms':>10} {'pico (MB)':>10}")
+    resultados = []
+    for linhas in sizes:
+        diretorio = tempfile.mkdtemp(prefix="bench_stream_")
+        try:
+            csv_file = os.path.join(diretorio, "vendas.csv")
+            write_sales(csv_file, linhas)
+            tamanho = os.path.getsize(csv_file) / 2**20
+            for etapa, funcao in ETAPAS:
+                shutil.rmtree(os.path.join(diretorio, "cache"), ignore_errors=True)
+                ms, pico = measure(funcao, csv_file, diretorio, chunk_size)
+                resultados.append((linhas, etapa, ms, pico))
+                print(f"{linhas:>9} {tamanho:>9.1f} {etapa:>18} {ms:>10.0f} {pico:>10.1f}")
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+    run(args.sizes, args.chunk_size)
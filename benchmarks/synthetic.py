@@ -0,0 +1,25 @@
+"""Registros de manutenção sintéticos para os benchmarks (as vendas vêm de sales_generator.py)."""
+from datetime import datetime, timedelta
+import numpy as np
+
+TIPOS = ["Preventiva", "Corretiva", "Preditiva"]
+
+
+def make_maintenance(quantidade, seed=42):
+    """Gera registros de manutenção em dicionário, como os gravados pelo DataManager"""
+    rng = np.random.default_rng(seed)
+    inicio = datetime(2023, 1, 1)
+    pecas = rng.integers(0, 200, size=quantidade)
+    tipos = rng.integers(0, len(TIPOS), size=quantidade)
+    custos = rng.gamma(2.0, 250.0, size=quantidade).round(2)
+    minutos = np.sort(rng.integers(0, 60 * 24 * 365 * 2, size=quantidade))
+    return [
+        {
+            "peca": f"Peça {pecas[i]}",
+            "tipo_manutencao": TIPOS[tipos[i]],
+            "descricao": f"Ordem de serviço {i}",
+            "custo": float(custos[i]),
+            "timestamp": (inicio + timedelta(minutes=int(minutos[i]))).isoformat(),
+        }
+        for i in range(quantidade)
+    ]
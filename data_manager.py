@@ -2,18 +2,31 @@ import json
 import pandas as pd
 from datetime import datetime
 import os
+from file_lock import file_lock
+from maintenance_analytics import MaintenanceAnalytics
+from maintenance_query import PAGE_SIZE, SORT_COLUMNS, MaintenanceIndex
+from part_status_log import PartStatusLog, build_timeline, status_durations
+from read_cache import ReadCache, file_signature
+from jsonl import append_jsonl, read_jsonl
 
 class DataManager:
-    def __init__(self):
+    def __init__(self, storage=None):
         self.maintenance_file = 'data/maintenance.json'
         self.comparison_file = 'data/comparison_history.csv'
         self.parts_status_file = 'data/parts_status.json'
         
+        # Backend de armazenamento opcional (ver storage.py); None usa os arquivos JSON/CSV acima
+        self.storage = storage
+        
+        # Cache dos arquivos já lidos, invalidado quando o mtime/tamanho do arquivo muda
+        self.cache = ReadCache()
+        
         # Criar diretório de dados se não existir
         os.makedirs('data', exist_ok=True)
         
         # Inicializar arquivos se não existirem
-        self._initialize_files()
+        if self.storage is None:
+            self._initialize_files()
     
     def _initialize_files(self):
         """Inicializa os arquivos de dados se não existirem"""
@@ -37,12 +50,42 @@ class DataManager:
         """Salva dados em formato JSON"""
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=4)
+        # Escrita direta no cache: a próxima leitura não precisa reinterpretar o arquivo
+        self.cache.put(file_path, [file_path], data)
     
-    def _load_json(self, file_path):
-        """Carrega dados do arquivo JSON"""
+    def _read_json(self, file_path):
+        """Lê e interpreta o arquivo JSON"""
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     
+    def _load_json(self, file_path):
+        """Carrega dados do arquivo JSON (do cache, se o arquivo não mudou)"""
+        return self.cache.get(file_path, [file_path], lambda: self._read_json(file_path))
+    
+    def _read_comparisons(self):
+        """Lê o histórico de comparações do arquivo CSV"""
+        try:
+            return pd.read_csv(self.comparison_file, parse_dates=['data'])
+        except pd.errors.EmptyDataError:
+            # Se o arquivo estiver vazio, cria um DataFrame novo com os tipos corretos
+            return pd.DataFrame({
+                'data': pd.Series(dtype='datetime64[ns]'),
+                'item1': pd.Series(dtype='str'),
+                'item2': pd.Series(dtype='str'),
+                'diferenca': pd.Series(dtype='float64')
+            })
+    
+    def _load_comparisons(self):
+        """Carrega o histórico de comparações (do cache, se o arquivo não mudou)"""
+        return self.cache.get(self.comparison_file, [self.comparison_file], self._read_comparisons)
+    
+    def cache_stats(self):
+        """Retorna os acertos e faltas do cache de leitura do armazenamento em uso"""
+        cache = self.cache if self.storage is None else getattr(self.storage, 'cache', None)
+        if cache is None:
+            return {'hits': 0, 'misses': 0, 'entradas': 0}
+        return cache.stats()
+    
     # Métodos para Manutenção
     def add_maintenance_record(self, record):
         """Adiciona um novo registro de manutenção"""
@@ -56,14 +99,82 @@ class DataManager:
         if not isinstance(record["custo"], (int, float)):
             raise ValueError("O campo 'custo' deve ser um número")
             
-        data = self._load_json(self.maintenance_file)
         record['timestamp'] = datetime.now().isoformat()
-        data.append(record)
-        self._save_json(self.maintenance_file, data)
+        if self.storage is not None:
+            self.storage.add_maintenance_record(record)
+            return
+        
+        # Leitura e gravação sob a mesma trava, para não perder registros de outras sessões
+        with file_lock(self.maintenance_file):
+            antes = file_signature(self.maintenance_file)
+            data = list(self._load_json(self.maintenance_file))
+            data.append(record)
+            self._save_json(self.maintenance_file, data)
+            
+            # Atualiza os agregados de custo em O(1) se eles estavam em dia antes da gravação
+            chave = ('analise', self.maintenance_file)
+            analise = self.cache.lookup(chave, antes)
+            if analise is not None:
+                analise.add(record)
+                self.cache.put(chave, [self.maintenance_file], analise)
     
     def get_maintenance_history(self):
         """Retorna todo o histórico de manutenção"""
-        return self._load_json(self.maintenance_file)
+        if self.storage is not None:
+            return self.storage.get_maintenance_history()
+        with file_lock(self.maintenance_file):
+            return list(self._load_json(self.maintenance_file))
+    
+    def _maintenance_index(self):
+        """Retorna o índice de consulta do histórico, reconstruído só quando o histórico muda"""
+        if self.storage is not None:
+            return self.storage.maintenance_index()
+        with file_lock(self.maintenance_file):
+            return self.cache.get(
+                ('indice', self.maintenance_file), [self.maintenance_file],
+                lambda: MaintenanceIndex(self._load_json(self.maintenance_file))
+            )
+    
+    def query_maintenance(self, peca=None, tipo_manutencao=None, start=None, end=None,
+                          order_by='timestamp', descending=False, limit=PAGE_SIZE, offset=0):
+        """Consulta o histórico de manutenção com filtros, ordenação e paginação
+        
+        Retorna (registros da página, total de registros que atendem aos filtros).
+        """
+        if order_by not in SORT_COLUMNS:
+            raise ValueError(f"Não é possível ordenar por '{order_by}'; use um de: {', '.join(SORT_COLUMNS)}")
+        if (limit is not None and limit < 0) or offset < 0:
+            raise ValueError("Os campos 'limit' e 'offset' não podem ser negativos")
+        
+        argumentos = dict(peca=peca, tipo_manutencao=tipo_manutencao, start=start, end=end,
+                          order_by=order_by, descending=descending, limit=limit, offset=offset)
+        if hasattr(self.storage, 'query_maintenance'):
+            return self.storage.query_maintenance(**argumentos)
+        return self._maintenance_index().query(**argumentos)
+    
+    def get_maintenance_analytics(self):
+        """Retorna os agregados de custo por peça, tipo de manutenção e mês (ver maintenance_analytics.py)"""
+        if self.storage is not None:
+            return self.storage.maintenance_analytics()
+        with file_lock(self.maintenance_file):
+            return self.cache.get(
+                ('analise', self.maintenance_file), [self.maintenance_file],
+                lambda: MaintenanceAnalytics.from_records(self._load_json(self.maintenance_file))
+            ).copy()
+    
+    def get_maintenance_values(self, coluna):
+        """Retorna os valores distintos de 'peca' ou 'tipo_manutencao' no histórico (para os filtros)"""
+        if coluna not in ('peca', 'tipo_manutencao'):
+            raise ValueError("Coluna deve ser 'peca' ou 'tipo_manutencao'")
+        if hasattr(self.storage, 'maintenance_values'):
+            return self.storage.maintenance_values(coluna)
+        return self._maintenance_index().values(coluna)
+    
+    def get_maintenance_columns(self):
+        """Retorna o histórico de manutenção em colunas (ver records.py), em ordem de timestamp"""
+        if hasattr(self.storage, 'maintenance_columns'):
+            return self.storage.maintenance_columns()
+        return self._maintenance_index().colunas
     
     # Métodos para Histórico de Comparações
     def add_comparison(self, item1, item2, diferenca):
@@ -72,65 +183,160 @@ class DataManager:
         if not isinstance(diferenca, (int, float)):
             raise ValueError("O campo 'diferenca' deve ser um número")
         
-        try:
-            df = pd.read_csv(self.comparison_file, parse_dates=['data'])
-        except pd.errors.EmptyDataError:
-            # Se o arquivo estiver vazio, cria um DataFrame novo com os tipos corretos
-            df = pd.DataFrame({
-                'data': pd.Series(dtype='datetime64[ns]'),
-                'item1': pd.Series(dtype='str'),
-                'item2': pd.Series(dtype='str'),
-                'diferenca': pd.Series(dtype='float64')
+        if self.storage is not None:
+            self.storage.add_comparison(pd.Timestamp.now(), str(item1), str(item2), float(diferenca))
+            return
+        
+        with file_lock(self.comparison_file):
+            df = self._load_comparisons()
+        
+            # Cria o novo registro com tipos explícitos e valores não-nulos
+            nova_comparacao = pd.DataFrame({
+                'data': [pd.Timestamp.now()],
+                'item1': [str(item1)],
+                'item2': [str(item2)],
+                'diferenca': [float(diferenca)]
             })
         
-        # Cria o novo registro com tipos explícitos e valores não-nulos
-        nova_comparacao = pd.DataFrame({
-            'data': [pd.Timestamp.now()],
-            'item1': [str(item1)],
-            'item2': [str(item2)],
-            'diferenca': [float(diferenca)]
-        })
-        
-        # Garante os tipos corretos
-        nova_comparacao['data'] = nova_comparacao['data'].astype('datetime64[ns]')
-        nova_comparacao['item1'] = nova_comparacao['item1'].astype('str')
-        nova_comparacao['item2'] = nova_comparacao['item2'].astype('str')
-        nova_comparacao['diferenca'] = nova_comparacao['diferenca'].astype('float64')
-        
-        # Concatena garantindo que os tipos de dados sejam preservados
-        if len(df) == 0:
-            df = nova_comparacao
-        else:
-            df = pd.concat([df, nova_comparacao], ignore_index=True)
-        
-        # Salva o DataFrame atualizado
-        df.to_csv(self.comparison_file, index=False)
+            # Garante os tipos corretos
+            nova_comparacao['data'] = nova_comparacao['data'].astype('datetime64[ns]')
+            nova_comparacao['item1'] = nova_comparacao['item1'].astype('str')
+            nova_comparacao['item2'] = nova_comparacao['item2'].astype('str')
+            nova_comparacao['diferenca'] = nova_comparacao['diferenca'].astype('float64')
+        
+            # Concatena garantindo que os tipos de dados sejam preservados
+            if len(df) == 0:
+                df = nova_comparacao
+            else:
+                df = pd.concat([df, nova_comparacao], ignore_index=True)
+        
+            # Salva o DataFrame atualizado; a próxima leitura relê o arquivo gravado
+            df.to_csv(self.comparison_file, index=False)
+            self.cache.invalidate(self.comparison_file)
     
     def get_comparison_history(self):
         """Retorna todo o histórico de comparações"""
-        try:
-            return pd.read_csv(self.comparison_file, parse_dates=['data'])
-        except pd.errors.EmptyDataError:
-            return pd.DataFrame({
-                'data': pd.Series(dtype='datetime64[ns]'),
-                'item1': pd.Series(dtype='str'),
-                'item2': pd.Series(dtype='str'),
-                'diferenca': pd.Series(dtype='float64')
-            })
+        if self.storage is not None:
+            return self.storage.get_comparison_history()
+        with file_lock(self.comparison_file):
+            return self._load_comparisons().copy()
     
     # Métodos para Estado das Peças
+    @property
+    def parts_history_file(self):
+        """Arquivo JSON Lines com todas as mudanças de status, ao lado de parts_status_file"""
+        return os.path.splitext(self.parts_status_file)[0] + '_history.jsonl'
+    
     def update_part_status(self, part_id, status):
         """Atualiza o status de uma peça"""
-        data = self._load_json(self.parts_status_file)
-        data[part_id] = {
-            'status': status,
-            'ultima_atualizacao': datetime.now().isoformat()
-        }
-        self._save_json(self.parts_status_file, data)
+        ultima_atualizacao = datetime.now().isoformat()
+        if self.storage is not None:
+            self.storage.update_part_status(part_id, status, ultima_atualizacao)
+            return
+        
+        with file_lock(self.parts_status_file):
+            arquivos = [self.parts_history_file, self.parts_status_file]
+            antes = file_signature(*arquivos)
+            
+            data = dict(self._load_json(self.parts_status_file))
+            eventos = []
+            if not os.path.exists(self.parts_history_file):
+                # Primeira gravação do histórico: preserva o status atual das peças já existentes
+                eventos = [
+                    {'part_id': peca, 'status': estado['status'], 'ultima_atualizacao': estado['ultima_atualizacao']}
+                    for peca, estado in data.items()
+                ]
+            # A mudança entra no histórico; parts_status.json guarda só o status atual
+            eventos.append({'part_id': part_id, 'status': status, 'ultima_atualizacao': ultima_atualizacao})
+            append_jsonl(self.parts_history_file, eventos)
+            data[part_id] = {
+                'status': status,
+                'ultima_atualizacao': ultima_atualizacao
+            }
+            self._save_json(self.parts_status_file, data)
+            
+            chave = ('historico', self.parts_status_file)
+            log = self.cache.lookup(chave, antes)
+            if log is not None:
+                log.add(part_id, status, ultima_atualizacao)
+                self.cache.put(chave, arquivos, log)
     
     def get_part_status(self, part_id=None):
         """Retorna o status de uma peça específica ou de todas as peças"""
-        data = self._load_json(self.parts_status_file)
+        if self.storage is not None:
+            return self.storage.get_part_status(part_id)
+        with file_lock(self.parts_status_file):
+            data = self._load_json(self.parts_status_file)
         if part_id:
-            return data.get(part_id)
-        return data 
\ No newline at end of file
+            estado = data.get(part_id)
+            return dict(estado) if estado is not None else None
+        return dict(data)
+    
+    def _read_part_status_log(self):
+        """Monta o índice do histórico de status a partir dos arquivos"""
+        log = PartStatusLog.from_events(
+            (e['part_id'], e['status'], e['ultima_atualizacao']) for e in read_jsonl(self.parts_history_file)
+        )
+        # Peças com status anterior ao histórico entram com o status atual como primeiro evento
+        for part_id, estado in self._load_json(self.parts_status_file).items():
+            if part_id not in log:
+                log.add(part_id, estado['status'], estado['ultima_atualizacao'])
+        return log
+    
+    def _part_status_log(self):
+        """Retorna o índice do histórico de status, relido só quando os arquivos mudam"""
+        return self.cache.get(
+            ('historico', self.parts_status_file), [self.parts_history_file, self.parts_status_file],
+            self._read_part_status_log
+        )
+    
+    def _part_events(self, part_id):
+        """Retorna as mudanças de status da peça como (status, ultima_atualizacao), em ordem"""
+        if self.storage is not None:
+            return self.storage.part_events(part_id)
+        with file_lock(self.parts_status_file):
+            return self._part_status_log().events(part_id)
+    
+    def get_part_history(self, part_id, until=None):
+        """Retorna a linha do tempo de status da peça (status, início, fim e duração de cada período)"""
+        return build_timeline(self._part_events(part_id), until)
+    
+    def get_part_status_at(self, part_id, when):
+        """Retorna o status que a peça tinha na data informada (None se ainda não tinha status)"""
+        if self.storage is not None:
+            return self.storage.part_status_at(part_id, when)
+        with file_lock(self.parts_status_file):
+            return self._part_status_log().status_at(part_id, when)
+    
+    def get_status_durations(self, part_id, until=None):
+        """Retorna o tempo total que a peça passou em cada status"""
+        return status_durations(self.get_part_history(part_id, until))
+    
+    # Migração dos arquivos para outro backend
+    def migrate_to(self, storage):
+        """Copia os registros dos arquivos JSON/CSV para o backend, se ele ainda estiver vazio"""
+        # A trava evita que duas sessões abertas ao mesmo tempo migrem os dados em dobro
+        with file_lock(self.maintenance_file):
+            if not storage.is_empty():
+                return False
+            self._copy_files_to(storage)
+        return True
+    
+    def _copy_files_to(self, storage):
+        """Copia os registros dos arquivos JSON/CSV para o backend informado"""
+        manutencoes = self._load_json(self.maintenance_file) if os.path.exists(self.maintenance_file) else []
+        if manutencoes:
+            storage.add_maintenance_records(manutencoes)
+        
+        if os.path.exists(self.comparison_file):
+            try:
+                comparacoes = pd.read_csv(self.comparison_file, parse_dates=['data'])
+            except pd.errors.EmptyDataError:
+                comparacoes = pd.DataFrame(columns=['data', 'item1', 'item2', 'diferenca'])
+            storage.add_comparisons(comparacoes[['data', 'item1', 'item2', 'diferenca']].itertuples(index=False))
+        
+        if os.path.exists(self.parts_status_file):
+            log = self._read_part_status_log()
+            storage.update_part_statuses(
+                (part_id, status, ts) for part_id in log.por_peca for status, ts in log.events(part_id)
+            ) 
\ No newline at end of file
@@ -0,0 +1,123 @@
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from PIL import Image
+import streamlit as st
+
+# Número padrão de imagens guardadas no cache
+MAX_FIGURES = 32
+
+# Opções do savefig usadas pelo st.pyplot, para que a imagem em cache saia igual à do Streamlit
+SAVEFIG_OPTIONS = {"bbox_inches": "tight", "dpi": 200}
+
+# Largura máxima das imagens no Streamlit: imagens mais largas são reduzidas a cada exibição
+MAX_IMAGE_WIDTH = 2 * 730
+
+
+def fit_width(png, largura=MAX_IMAGE_WIDTH):
+    """Reduz a imagem PNG à largura máxima do Streamlit, com o mesmo filtro que ele usaria"""
+    imagem = Image.open(io.BytesIO(png))
+    if imagem.width <= largura:
+        return png
+    reduzida = imagem.resize((largura, int(imagem.height * largura / imagem.width)), resample=Image.BILINEAR)
+    buffer = io.BytesIO()
+    reduzida.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def render_figure(fig, formato="png"):
+    """Desenha a figura com o backend Agg (sem janela) e retorna os bytes da imagem PNG ou SVG
+
+    O PNG já sai na largura exibida pelo Streamlit, para que a imagem em cache seja
+    enviada ao navegador sem ser redimensionada de novo a cada rerun.
+    """
+    # Importado no primeiro desenho, junto com a figura (ver sales_charts.frequency_scatter)
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    FigureCanvasAgg(fig)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=formato, **SAVEFIG_OPTIONS)
+    if formato == "png":
+        return fit_width(buffer.getvalue())
+    return buffer.getvalue()
+
+
+class FigureCache:
+    """Imagens de gráficos já desenhadas, por chave, com descarte LRU
+
+    As imagens podem ser desenhadas na hora (`render`) ou em uma thread de fundo (`submit`),
+    para que o restante da página apareça antes do gráfico. Uma única thread desenha todas
+    as figuras, porque o matplotlib não é seguro para desenhos simultâneos; pedidos
+    repetidos de uma chave que ainda está sendo desenhada reaproveitam o mesmo desenho.
+    """
+
+    def __init__(self, max_entries=MAX_FIGURES):
+        self.max_entries = max_entries
+        self._imagens = OrderedDict()
+        self._pendentes = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="figuras")
+
+    def __len__(self):
+        return len(self._imagens)
+
+    def get(self, key):
+        """Retorna a imagem guardada para key (marcando-a como recente), ou None"""
+        with self._lock:
+            imagem = self._imagens.get(key)
+            if imagem is not None:
+                self._imagens.move_to_end(key)
+            return imagem
+
+    def put(self, key, imagem):
+        """Guarda a imagem, descartando as menos usadas recentemente além do limite"""
+        with self._lock:
+            self._imagens[key] = imagem
+            self._imagens.move_to_end(key)
+            while len(self._imagens) > self.max_entries:
+                self._imagens.popitem(last=False)
+
+    def render(self, key, desenhar, formato="png"):
+        """Retorna a imagem de key, desenhando-a agora com desenhar() -> Figure se não estiver em cache"""
+        imagem = self.get(key)
+        if imagem is None:
+            imagem = render_figure(desenhar(), formato)
+            self.put(key, imagem)
+        return imagem
+
+    def submit(self, key, desenhar, formato="png"):
+        """Retorna um Future com a imagem de key, desenhando-a na thread de fundo se necessário"""
+        with self._lock:
+            imagem = self._imagens.get(key)
+            if imagem is not None:
+                self._imagens.move_to_end(key)
+                pronto = Future()
+                pronto.set_result(imagem)
+                return pronto
+            pendente = self._pendentes.get(key)
+            if pendente is None:
+                pendente = self._executor.submit(self._render_pending, key, desenhar, formato)
+                self._pendentes[key] = pendente
+            return pendente
+
+    def _render_pending(self, key, desenhar, formato):
+        """Desenha a imagem na thread de fundo e a guarda no cache"""
+        try:
+            imagem = render_figure(desenhar(), formato)
+            self.put(key, imagem)
+            return imagem
+        finally:
+            with self._lock:
+                self._pendentes.pop(key, None)
+
+    def clear(self):
+        """Descarta todas as imagens guardadas"""
+        with self._lock:
+            self._imagens.clear()
+
+
+@st.cache_resource
+def get_figure_cache(max_entries=MAX_FIGURES):
+    """Retorna o cache de imagens único no processo, compartilhado entre sessões"""
+    return FigureCache(max_entries)
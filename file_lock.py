@@ -0,0 +1,87 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Uma trava por arquivo no processo, compartilhada por todas as instâncias que o usam
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _lock_fd(fd):
+    """Bloqueia até obter a trava exclusiva do arquivo aberto"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            # LK_LOCK desiste após ~10 segundos; continua tentando
+            continue
+
+
+def _unlock_fd(fd):
+    """Libera a trava do arquivo aberto"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """Trava exclusiva e reentrante entre threads e entre processos, baseada em um arquivo .lock
+
+    As threads do processo se revezam em uma RLock; só a primeira aquisição de cada thread
+    trava o arquivo (fcntl no Linux/Mac, msvcrt no Windows), liberado ao sair da última.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    _lock_fd(fd)
+                except BaseException:
+                    os.close(fd)
+                    raise
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            try:
+                _unlock_fd(fd)
+            finally:
+                os.close(fd)
+        self._thread_lock.release()
+        return False
+
+
+def file_lock(path):
+    """Retorna a trava associada a um arquivo de dados (grava em '<arquivo>.lock')"""
+    chave = os.path.abspath(path) + '.lock'
+    with _registry_lock:
+        trava = _locks.get(chave)
+        if trava is None:
+            trava = _locks[chave] = FileLock(chave)
+    return trava
@@ -0,0 +1,28 @@
+import json
+import os
+
+
+def append_jsonl(path, registros):
+    """Acrescenta registros ao fim de um arquivo JSON Lines com uma única escrita seguida de fsync"""
+    dados = ''.join(json.dumps(registro, ensure_ascii=False) + '\n' for registro in registros).encode('utf-8')
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        while dados:
+            dados = dados[os.write(fd, dados):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def read_jsonl(path):
+    """Lê um arquivo JSON Lines, ignorando uma última linha incompleta (queda durante a escrita)"""
+    if not os.path.exists(path):
+        return []
+    registros = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for linha in f:
+            try:
+                registros.append(json.loads(linha))
+            except json.JSONDecodeError:
+                continue
+    return registros
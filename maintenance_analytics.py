@@ -0,0 +1,97 @@
+import pandas as pd
+
+# Colunas dos agregados retornados por MaintenanceAnalytics
+AGGREGATE_COLUMNS = ["custo", "registros", "custo_medio"]
+
+
+def month_of(timestamp):
+    """Retorna o mês ('AAAA-MM') de um timestamp ISO do registro de manutenção"""
+    return str(timestamp)[:7]
+
+
+class MaintenanceAnalytics:
+    """Agregados de custo do histórico de manutenção, mantidos de forma incremental
+
+    Guarda somas e contagens por peça, por tipo de manutenção e por mês. Cada novo registro
+    atualiza os agregados em O(1) e as consultas custam O(número de grupos), sem reprocessar
+    o histórico.
+    """
+
+    def __init__(self):
+        self.por_peca = {}
+        self.por_tipo = {}
+        self.por_mes = {}
+
+    @classmethod
+    def from_records(cls, registros):
+        """Calcula os agregados a partir de uma lista de registros de manutenção"""
+        analise = cls()
+        for registro in registros:
+            analise.add(registro)
+        return analise
+
+    @classmethod
+    def from_aggregates(cls, por_peca, por_tipo, por_mes):
+        """Monta os agregados a partir de linhas (chave, custo, registros) já somadas"""
+        analise = cls()
+        for grupos, linhas in ((analise.por_peca, por_peca), (analise.por_tipo, por_tipo), (analise.por_mes, por_mes)):
+            for chave, custo, registros in linhas:
+                analise._accumulate(grupos, chave, float(custo), int(registros))
+        return analise
+
+    @staticmethod
+    def _accumulate(grupos, chave, custo, registros=1):
+        """Soma custo e contagem no grupo informado"""
+        soma = grupos.get(chave)
+        if soma is None:
+            grupos[chave] = [custo, registros]
+        else:
+            soma[0] += custo
+            soma[1] += registros
+
+    def add(self, registro):
+        """Inclui um novo registro nos agregados"""
+        custo = float(registro["custo"])
+        self._accumulate(self.por_peca, registro["peca"], custo)
+        self._accumulate(self.por_tipo, registro["tipo_manutencao"], custo)
+        self._accumulate(self.por_mes, month_of(registro.get("timestamp")), custo)
+
+    def copy(self):
+        """Retorna uma cópia independente dos agregados (O(número de grupos))"""
+        analise = MaintenanceAnalytics()
+        for nome in ("por_peca", "por_tipo", "por_mes"):
+            setattr(analise, nome, {chave: list(soma) for chave, soma in getattr(self, nome).items()})
+        return analise
+
+    @staticmethod
+    def _frame(grupos, indice):
+        """Monta o DataFrame de custo, registros e custo médio de um agrupamento"""
+        df = pd.DataFrame(
+            [(chave, soma, registros) for chave, (soma, registros) in grupos.items()],
+            columns=[indice, "custo", "registros"]
+        ).set_index(indice).sort_index()
+        df["registros"] = df["registros"].astype("int64")
+        df["custo_medio"] = df["custo"] / df["registros"]
+        return df[AGGREGATE_COLUMNS]
+
+    def by_part(self):
+        """Custo total, número de manutenções e custo médio por peça"""
+        return self._frame(self.por_peca, "peca")
+
+    def by_type(self):
+        """Custo total, frequência e custo médio por tipo de manutenção"""
+        return self._frame(self.por_tipo, "tipo_manutencao")
+
+    def by_month(self):
+        """Custo total, número de manutenções e custo médio por mês, em ordem cronológica"""
+        return self._frame(self.por_mes, "mes")
+
+    def summary(self):
+        """Totais do histórico: registros, custo total e custo médio"""
+        custo = sum(soma for soma, _ in self.por_tipo.values())
+        registros = sum(n for _, n in self.por_tipo.values())
+        return {
+            "registros": registros,
+            "custo": custo,
+            "custo_medio": custo / registros if registros else float("nan")
+        }
@@ -0,0 +1,88 @@
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+from records import MaintenanceRecord, RecordColumns
+
+# Colunas aceitas para ordenar a consulta do histórico de manutenção
+SORT_COLUMNS = ["timestamp", "custo", "peca", "tipo_manutencao"]
+
+# Tamanho padrão da página de resultados
+PAGE_SIZE = 50
+
+
+def time_bounds(start=None, end=None):
+    """Normaliza o intervalo de datas da consulta em (início, fim, fim_inclusivo)
+
+    Quando o fim é uma data (sem hora), o dia inteiro é incluído.
+    """
+    inicio = pd.Timestamp(start) if start is not None else None
+    if end is None:
+        return inicio, None, True
+    if isinstance(end, date) and not isinstance(end, datetime):
+        return inicio, pd.Timestamp(end) + pd.Timedelta(days=1), False
+    return inicio, pd.Timestamp(end), True
+
+
+class MaintenanceIndex:
+    """Índice em memória do histórico de manutenção para consultas filtradas e paginadas
+
+    Guarda as colunas dos registros (ver records.py) na ordem por timestamp e, para cada peça
+    e tipo de manutenção, as posições dos seus registros nessa ordem. Um filtro vira uma busca
+    binária no intervalo de datas mais a interseção das listas de posições, sem montar um
+    DataFrame do histórico.
+    """
+
+    def __init__(self, registros):
+        self.registros = registros
+        colunas = RecordColumns.from_dicts(MaintenanceRecord, registros)
+        # Posição de cada registro na ordem por timestamp (estável para empates)
+        self.ordem = np.argsort(colunas["timestamp"], kind="stable")
+        self.colunas = colunas.take(self.ordem)
+        self.timestamps = self.colunas["timestamp"]
+        self.por_chave = {coluna: self._group(self.colunas[coluna]) for coluna in ("peca", "tipo_manutencao")}
+
+    @staticmethod
+    def _group(categorias):
+        """Retorna, para cada valor da coluna categórica, as posições (já ordenadas) onde ele aparece"""
+        if len(categorias) == 0:
+            return {}
+        codigos = categorias.codes
+        ordem = np.argsort(codigos, kind="stable")
+        cortes = np.flatnonzero(np.diff(codigos[ordem])) + 1
+        presentes = codigos[ordem[np.concatenate(([0], cortes))]]
+        return dict(zip(categorias.categories[presentes], np.split(ordem, cortes)))
+
+    def __len__(self):
+        return len(self.registros)
+
+    def values(self, coluna):
+        """Retorna os valores distintos de uma coluna indexada ('peca' ou 'tipo_manutencao')"""
+        return sorted(self.por_chave[coluna])
+
+    def query(self, peca=None, tipo_manutencao=None, start=None, end=None,
+              order_by="timestamp", descending=False, limit=PAGE_SIZE, offset=0):
+        """Retorna (registros da página, total de registros que atendem aos filtros)"""
+        inicio, fim, fim_inclusivo = time_bounds(start, end)
+        lo = 0 if inicio is None else np.searchsorted(self.timestamps, inicio.to_datetime64(), side="left")
+        if fim is None:
+            # Registros sem timestamp válido (NaT) ficam no fim da ordem e só saem sem filtro de data
+            hi = len(self.timestamps) if inicio is None else np.searchsorted(self.timestamps, np.datetime64("NaT"))
+        else:
+            hi = np.searchsorted(self.timestamps, fim.to_datetime64(), side="right" if fim_inclusivo else "left")
+
+        posicoes = None
+        for coluna, valor in (("peca", peca), ("tipo_manutencao", tipo_manutencao)):
+            if valor is None:
+                continue
+            chave = self.por_chave[coluna].get(valor, np.empty(0, dtype=np.intp))
+            chave = chave[np.searchsorted(chave, lo):np.searchsorted(chave, hi)]
+            posicoes = chave if posicoes is None else np.intersect1d(posicoes, chave, assume_unique=True)
+        if posicoes is None:
+            posicoes = np.arange(lo, hi)
+
+        if order_by != "timestamp":
+            posicoes = posicoes[np.argsort(self.colunas.sort_key(order_by)[posicoes], kind="stable")]
+        if descending:
+            posicoes = posicoes[::-1]
+        pagina = posicoes[offset:offset + limit] if limit is not None else posicoes[offset:]
+        return [dict(self.registros[i]) for i in self.ordem[pagina]], len(posicoes)
@@ -1,17 +1,37 @@
+import os
 import streamlit as st
-import pandas as pd
 from data_manager import DataManager
+from maintenance_query import SORT_COLUMNS
+from profiling import finish_run, start_run
+from records import MaintenanceRecord, PartStatus, RecordColumns
+from storage import open_storage
+
+@st.cache_resource(show_spinner=False)
+def get_data_manager(kind):
+    """Retorna o gerenciador de dados compartilhado por todas as sessões do processo"""
+    storage = open_storage(kind)
+    data_manager = DataManager(storage=storage)
+    
+    # Na primeira execução com o banco, traz os registros dos arquivos JSON/CSV existentes
+    if storage is not None:
+        data_manager.migrate_to(storage)
+    return data_manager
 
 def main():
     st.title("Gestão de Manutenção e Peças")
     
-    # Inicializa o gerenciador de dados
-    data_manager = DataManager()
+    # Tempo de cada etapa desta execução (painel com ?debug=1 na URL; ver profiling.py)
+    perfil = start_run("Manutenção")
+    
+    # Gerenciador de dados único no processo, para que o cache de leitura valha entre reruns e sessões;
+    # o backend vem de MANUTENCAO_STORAGE ("sqlite", "json" ou "jsonl")
+    with perfil.span("gerenciador_dados"):
+        data_manager = get_data_manager(os.environ.get("MANUTENCAO_STORAGE", "sqlite"))
     
     # Sidebar para navegação
     pagina = st.sidebar.radio(
         "Selecione a Página",
-        ["Manutenção", "Comparações", "Estado das Peças"]
+        ["Manutenção", "Análise de Custos", "Comparações", "Estado das Peças"]
     )
     
     if pagina == "Manutenção":
@@ -36,15 +56,91 @@ def main():
                     "descricao": descricao,
                     "custo": custo
                 }
-                data_manager.add_maintenance_record(registro)
+                with perfil.span("gravar_registro"):
+                    data_manager.add_maintenance_record(registro)
                 st.success("Registro adicionado com sucesso!")
         
-        # Exibe histórico
-        historico = data_manager.get_maintenance_history()
-        if historico:
+        # Exibe histórico, uma página por vez
+        with perfil.span("valores_filtro") as etapa:
+            pecas = etapa.measure(data_manager.get_maintenance_values("peca"))
+        if pecas:
             st.subheader("Histórico de Manutenção")
-            df = pd.DataFrame(historico)
-            st.dataframe(df)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                filtro_peca = st.selectbox("Filtrar por Peça", ["Todas"] + pecas)
+            with col2:
+                filtro_tipo = st.selectbox("Filtrar por Tipo", ["Todos"] + data_manager.get_maintenance_values("tipo_manutencao"))
+            with col3:
+                periodo = st.date_input("Período", value=[])
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                ordenar_por = st.selectbox(
+                    "Ordenar por", SORT_COLUMNS,
+                    format_func=lambda c: {"timestamp": "Data", "custo": "Custo", "peca": "Peça", "tipo_manutencao": "Tipo"}[c]
+                )
+            with col2:
+                por_pagina = st.selectbox("Registros por Página", [25, 50, 100], index=1)
+            with col3:
+                decrescente = st.checkbox("Mais recentes/maiores primeiro", value=True)
+            
+            filtros = dict(
+                peca=None if filtro_peca == "Todas" else filtro_peca,
+                tipo_manutencao=None if filtro_tipo == "Todos" else filtro_tipo,
+                start=periodo[0] if len(periodo) > 0 else None,
+                end=periodo[1] if len(periodo) > 1 else None,
+                order_by=ordenar_por,
+                descending=decrescente
+            )
+            with perfil.span("consulta_total"):
+                _, total = data_manager.query_maintenance(limit=0, **filtros)
+            paginas = max(1, -(-total // por_pagina))
+            pagina_atual = st.number_input(f"Página (de {paginas})", min_value=1, max_value=paginas, value=1)
+            
+            with perfil.span("consulta_pagina") as etapa:
+                registros, total = data_manager.query_maintenance(
+                    limit=por_pagina, offset=(pagina_atual - 1) * por_pagina, **filtros
+                )
+                etapa.record(linhas=len(registros))
+            if registros:
+                with perfil.span("tabela_historico") as etapa:
+                    st.dataframe(etapa.measure(RecordColumns.from_dicts(MaintenanceRecord, registros).to_frame()))
+                inicio = (pagina_atual - 1) * por_pagina
+                st.caption(f"Exibindo {inicio + 1}–{inicio + len(registros)} de {total} registros")
+            else:
+                st.info("Nenhum registro atende aos filtros selecionados.")
+        else:
+            st.info("Nenhum registro de manutenção encontrado.")
+            
+    elif pagina == "Análise de Custos":
+        st.header("Análise de Custos de Manutenção")
+        
+        # Agregados mantidos a cada novo registro; não reprocessa o histórico
+        with perfil.span("agregados_custo"):
+            analise = data_manager.get_maintenance_analytics()
+            resumo = analise.summary()
+        if resumo["registros"]:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Manutenções", f"{resumo['registros']:,}")
+            col2.metric("Custo Total", f"R$ {resumo['custo']:,.2f}")
+            col3.metric("Custo Médio", f"R$ {resumo['custo_medio']:,.2f}")
+            
+            st.subheader("Custo por Mês")
+            st.line_chart(analise.by_month()["custo"])
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("Custo por Peça")
+                st.bar_chart(analise.by_part()["custo"])
+            with col2:
+                st.subheader("Frequência por Tipo")
+                st.bar_chart(analise.by_type()["registros"])
+            
+            st.subheader("Resumo por Tipo de Manutenção")
+            st.dataframe(analise.by_type().rename(columns={
+                "custo": "Custo Total", "registros": "Manutenções", "custo_medio": "Custo Médio"
+            }))
         else:
             st.info("Nenhum registro de manutenção encontrado.")
             
@@ -60,11 +156,13 @@ def main():
             diferenca = st.number_input("Diferença", format="%.2f")
             
             if st.form_submit_button("Registrar Comparação"):
-                data_manager.add_comparison(item1, item2, diferenca)
+                with perfil.span("gravar_comparacao"):
+                    data_manager.add_comparison(item1, item2, diferenca)
                 st.success("Comparação registrada com sucesso!")
         
         # Exibe histórico de comparações
-        historico = data_manager.get_comparison_history()
+        with perfil.span("historico_comparacoes") as etapa:
+            historico = etapa.measure(data_manager.get_comparison_history())
         if not historico.empty:
             st.subheader("Histórico de Comparações")
             st.dataframe(historico)
@@ -85,17 +183,34 @@ def main():
             )
             
             if st.form_submit_button("Atualizar"):
-                data_manager.update_part_status(part_id, status)
+                with perfil.span("atualizar_estado"):
+                    data_manager.update_part_status(part_id, status)
                 st.success("Status atualizado com sucesso!")
         
         # Exibe estado atual das peças
-        estados = data_manager.get_part_status()
+        with perfil.span("estado_pecas") as etapa:
+            estados = etapa.measure(data_manager.get_part_status())
         if estados:
             st.subheader("Estado Atual das Peças")
-            df = pd.DataFrame.from_dict(estados, orient='index')
-            st.dataframe(df)
+            df = RecordColumns.from_rows(
+                PartStatus, ((part_id, e['status'], e['ultima_atualizacao']) for part_id, e in estados.items())
+            ).to_frame()
+            st.dataframe(df.set_index('part_id'))
+            
+            # Histórico de status de uma peça e tempo em cada status
+            st.subheader("Histórico da Peça")
+            peca_historico = st.selectbox("Peça", sorted(estados))
+            with perfil.span("historico_peca") as etapa:
+                linha_do_tempo = etapa.measure(data_manager.get_part_history(peca_historico))
+            st.dataframe(linha_do_tempo.assign(duracao=linha_do_tempo["duracao"].astype(str)))
+            
+            horas = data_manager.get_status_durations(peca_historico).dt.total_seconds() / 3600
+            st.caption("Tempo em cada status (horas)")
+            st.bar_chart(horas.rename("horas"))
         else:
             st.info("Nenhuma peça cadastrada.")
+    
+    finish_run(perfil)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,80 @@
+import bisect
+import pandas as pd
+
+# Colunas da linha do tempo de status de uma peça
+TIMELINE_COLUMNS = ["status", "inicio", "fim", "duracao"]
+
+
+def iso_timestamp(when):
+    """Converte uma data/hora para o texto ISO usado nos registros de status"""
+    return pd.Timestamp(when).isoformat()
+
+
+class PartStatusLog:
+    """Registro de todas as mudanças de status das peças, indexado por peça e data
+
+    Para cada peça guarda as datas (ordenadas) e os status correspondentes, de modo que o
+    status vigente em qualquer data sai por busca binária em O(log n) e a linha do tempo de
+    uma peça não exige percorrer as demais.
+    """
+
+    def __init__(self):
+        self.por_peca = {}
+
+    @classmethod
+    def from_events(cls, eventos):
+        """Monta o índice a partir de eventos (part_id, status, ultima_atualizacao)"""
+        log = cls()
+        for part_id, status, timestamp in eventos:
+            log.add(part_id, status, timestamp)
+        return log
+
+    def add(self, part_id, status, timestamp):
+        """Inclui uma mudança de status (em O(1) quando chega em ordem cronológica)"""
+        tempos, estados = self.por_peca.setdefault(part_id, ([], []))
+        if not tempos or timestamp >= tempos[-1]:
+            tempos.append(timestamp)
+            estados.append(status)
+        else:
+            posicao = bisect.bisect_right(tempos, timestamp)
+            tempos.insert(posicao, timestamp)
+            estados.insert(posicao, status)
+
+    def __contains__(self, part_id):
+        return part_id in self.por_peca
+
+    def events(self, part_id):
+        """Retorna as mudanças de status da peça como (status, ultima_atualizacao), em ordem"""
+        tempos, estados = self.por_peca.get(part_id, ([], []))
+        return list(zip(estados, tempos))
+
+    def status_at(self, part_id, when):
+        """Retorna o status da peça na data informada (None se ainda não tinha status)"""
+        tempos, estados = self.por_peca.get(part_id, ([], []))
+        posicao = bisect.bisect_right(tempos, iso_timestamp(when))
+        return estados[posicao - 1] if posicao else None
+
+
+def build_timeline(eventos, until=None):
+    """Monta a linha do tempo (status, início, fim, duração) a partir das mudanças de status
+
+    O último status fica em aberto até `until` (por padrão, agora).
+    """
+    if not eventos:
+        return pd.DataFrame({
+            "status": pd.Series(dtype="str"),
+            "inicio": pd.Series(dtype="datetime64[ns]"),
+            "fim": pd.Series(dtype="datetime64[ns]"),
+            "duracao": pd.Series(dtype="timedelta64[ns]")
+        })
+    status, tempos = zip(*eventos)
+    inicio = pd.to_datetime(list(tempos), format="ISO8601")
+    fim = inicio[1:].append(pd.DatetimeIndex([pd.Timestamp(until) if until is not None else pd.Timestamp.now()]))
+    df = pd.DataFrame({"status": list(status), "inicio": inicio, "fim": fim})
+    df["duracao"] = df["fim"] - df["inicio"]
+    return df[TIMELINE_COLUMNS]
+
+
+def status_durations(timeline):
+    """Soma o tempo total em cada status a partir da linha do tempo"""
+    return timeline.groupby("status", sort=False)["duracao"].sum()
@@ -0,0 +1,245 @@
+import contextvars
+import functools
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+import streamlit as st
+from jsonl import append_jsonl
+
+# Variáveis de ambiente: DASHBOARD_DEBUG=1 mostra o painel de depuração em todas as sessões;
+# DASHBOARD_PROFILE_LOG=<arquivo> grava as etapas de todas as execuções em JSON Lines
+DEBUG_ENV = "DASHBOARD_DEBUG"
+LOG_ENV = "DASHBOARD_PROFILE_LOG"
+
+# Arquivo usado quando a gravação é ligada pelo painel de depuração
+DEFAULT_LOG_FILE = os.path.join("data", "profile.jsonl")
+
+# Chaves em st.session_state do perfil da execução atual e da opção de gravação do painel
+PROFILE_KEY = "_perfil_execucao"
+LOG_KEY = "perfil_gravar"
+
+# Colunas da tabela de etapas do painel
+SPAN_COLUMNS = ["etapa", "ms", "linhas", "bytes"]
+
+# Perfil da seção (fragmento) em execução neste contexto; tem prioridade sobre o perfil da página
+_secao = contextvars.ContextVar("perfil_secao", default=None)
+
+
+def payload_size(obj):
+    """Tamanho aproximado, em bytes, dos dados de um DataFrame, texto ou especificação de gráfico"""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(pd.Series(obj.memory_usage(index=True)).sum())
+    if isinstance(obj, (bytes, str)):
+        return len(obj)
+    if hasattr(obj, "to_json"):
+        # Gráficos do Altair: a especificação JSON (com os dados) é o que vai para o navegador;
+        # acima do limite de linhas do Altair, conta só os dados do gráfico
+        from altair import MaxRowsError
+
+        try:
+            return len(obj.to_json())
+        except MaxRowsError:
+            return payload_size(getattr(obj, "data", None))
+    return None
+
+
+class Span:
+    """Uma etapa medida: nome, nível de aninhamento, início, duração e volume de dados"""
+    __slots__ = ("etapa", "nivel", "inicio", "ms", "linhas", "bytes")
+
+    def __init__(self, etapa, nivel, inicio):
+        self.etapa = etapa
+        self.nivel = nivel
+        self.inicio = inicio
+        self.ms = None
+        self.linhas = None
+        self.bytes = None
+
+    def record(self, linhas=None, bytes=None):
+        """Anota diretamente as linhas processadas e o tamanho dos dados"""
+        self.linhas = linhas
+        self.bytes = bytes
+
+    def measure(self, dados, payload=None):
+        """Anota as linhas de `dados` e o tamanho de `payload` (por padrão, os próprios dados)"""
+        if hasattr(dados, "__len__"):
+            self.linhas = len(dados)
+        self.bytes = payload_size(dados if payload is None else payload)
+        return dados
+
+
+class _NullSpan:
+    """Etapa de um perfil desligado: não mede nada"""
+
+    def record(self, linhas=None, bytes=None):
+        pass
+
+    def measure(self, dados, payload=None):
+        return dados
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class RunProfile:
+    """Etapas medidas em uma execução (rerun) de uma página
+
+    Desligado, `span` só executa o bloco; ligado, guarda o tempo de cada etapa em ordem de
+    início, com o nível de aninhamento, as linhas processadas e o tamanho dos dados enviados.
+    O nível é contado por thread, porque fragmentos paralelos medem etapas ao mesmo tempo
+    que o script principal.
+    """
+
+    def __init__(self, pagina, enabled=False, log_file=None):
+        self.pagina = pagina
+        self.enabled = enabled
+        self.log_file = log_file
+        self.execucao = uuid.uuid4().hex
+        self.timestamp = datetime.now().isoformat()
+        self.spans = []
+        self._local = threading.local()
+        self._inicio = time.perf_counter()
+
+    @contextmanager
+    def span(self, etapa):
+        """Mede o bloco como uma etapa; o objeto retornado anota linhas e tamanho dos dados"""
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+        nivel = getattr(self._local, "nivel", 0)
+        medida = Span(etapa, nivel, (time.perf_counter() - self._inicio) * 1000)
+        self.spans.append(medida)
+        self._local.nivel = nivel + 1
+        try:
+            yield medida
+        finally:
+            self._local.nivel = nivel
+            medida.ms = (time.perf_counter() - self._inicio) * 1000 - medida.inicio
+
+    def total_ms(self):
+        """Tempo desde o início da execução, em milissegundos"""
+        return (time.perf_counter() - self._inicio) * 1000
+
+    def frame(self, spans=None):
+        """Retorna as etapas (por padrão, todas as já iniciadas; indentadas pelo nível) com tempo, linhas e bytes"""
+        spans = list(self.spans) if spans is None else spans
+        return pd.DataFrame(
+            [("  " * s.nivel + s.etapa, s.ms, s.linhas, s.bytes) for s in spans],
+            columns=SPAN_COLUMNS
+        )
+
+    def write_log(self):
+        """Acrescenta as etapas da execução ao arquivo de log (uma linha JSON por etapa)"""
+        diretorio = os.path.dirname(self.log_file)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        append_jsonl(self.log_file, [
+            {
+                "execucao": self.execucao, "timestamp": self.timestamp, "pagina": self.pagina,
+                "etapa": s.etapa, "nivel": s.nivel, "inicio_ms": round(s.inicio, 3),
+                "ms": None if s.ms is None else round(s.ms, 3), "linhas": s.linhas, "bytes": s.bytes,
+            }
+            for s in self.spans
+        ])
+
+
+def debug_enabled():
+    """Indica se o painel de depuração está ligado (DASHBOARD_DEBUG=1 ou ?debug=1 na URL)"""
+    if os.environ.get(DEBUG_ENV, "").lower() in ("1", "true", "sim"):
+        return True
+    return st.query_params.get("debug") == "1"
+
+
+def log_file():
+    """Retorna o arquivo de log das etapas, se a gravação estiver ligada"""
+    if os.environ.get(LOG_ENV):
+        return os.environ[LOG_ENV]
+    return DEFAULT_LOG_FILE if st.session_state.get(LOG_KEY) else None
+
+
+def start_run(pagina):
+    """Inicia o perfil da execução atual da página (chamar no topo do script)"""
+    arquivo = log_file()
+    profile = RunProfile(pagina, enabled=debug_enabled() or arquivo is not None, log_file=arquivo)
+    st.session_state[PROFILE_KEY] = profile
+    return profile
+
+
+def current():
+    """Retorna o perfil da seção ou da execução atual (desligado fora de uma página com start_run)"""
+    return _secao.get() or st.session_state.get(PROFILE_KEY) or RunProfile(None)
+
+
+@contextmanager
+def span(etapa):
+    """Mede um bloco como etapa da execução atual"""
+    with current().span(etapa) as medida:
+        yield medida
+
+
+@contextmanager
+def section_run(pagina):
+    """Perfil próprio de uma seção (fragmento), iniciado e encerrado dentro do corpo do fragmento
+
+    Um fragmento reexecuta sem o restante do script, e um fragmento paralelo termina depois
+    dele, então as etapas da seção não podem ir para o perfil da página, já encerrado. Ao
+    sair, as etapas vão para o log e, com o painel ligado, para um resumo na própria seção
+    (fragmentos não podem escrever na barra lateral).
+    """
+    arquivo = log_file()
+    profile = RunProfile(pagina, enabled=debug_enabled() or arquivo is not None, log_file=arquivo)
+    token = _secao.set(profile)
+    try:
+        yield profile
+    finally:
+        _secao.reset(token)
+        _save_log(profile, st.warning)
+    if profile.enabled and debug_enabled():
+        etapas = ", ".join(f"{s.etapa} {s.ms:,.0f} ms" for s in profile.spans if s.nivel == 0)
+        st.caption(f"Depuração, {profile.pagina}: {profile.total_ms():,.0f} ms ({etapas})")
+
+
+def profiled_section(pagina):
+    """Decorador que executa a função (o corpo de um fragmento) sob section_run(pagina)"""
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def executar(*args, **kwargs):
+            with section_run(pagina):
+                return funcao(*args, **kwargs)
+        return executar
+    return decorador
+
+
+def _save_log(profile, aviso):
+    """Acrescenta as etapas ao log, se a gravação estiver ligada, avisando com aviso() em caso de erro"""
+    if profile.log_file and profile.spans:
+        try:
+            profile.write_log()
+        except OSError as e:
+            aviso(f"Não foi possível gravar as etapas em {profile.log_file}: {e}")
+
+
+def finish_run(profile):
+    """Grava as etapas no log e mostra o painel de depuração na barra lateral, se ligados"""
+    _save_log(profile, st.sidebar.warning)
+    if not debug_enabled():
+        return
+
+    with st.sidebar.expander("Depuração: tempo por etapa", expanded=True):
+        # Cópia das etapas: fragmentos paralelos ainda podem acrescentar etapas ao perfil
+        spans = list(profile.spans)
+        df = profile.frame(spans)
+        st.caption(f"{profile.pagina}: {profile.total_ms():,.0f} ms nesta execução, {len(df)} etapas")
+        st.dataframe(df, hide_index=True, column_config={
+            "ms": st.column_config.NumberColumn("ms", format="%.1f"),
+            "linhas": st.column_config.NumberColumn("linhas", format="%d"),
+            "bytes": st.column_config.NumberColumn("bytes", format="%d"),
+        })
+        raizes = df[[s.nivel == 0 for s in spans]]
+        if len(raizes):
+            st.bar_chart(raizes.set_index("etapa")["ms"])
+        st.checkbox("Gravar etapas em arquivo", key=LOG_KEY, help=f"Acrescenta as etapas de cada execução a {DEFAULT_LOG_FILE}")
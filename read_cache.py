@@ -0,0 +1,70 @@
+import os
+import threading
+
+
+def file_signature(*paths):
+    """Retorna a assinatura barata (mtime, tamanho, inode) dos arquivos; None para os ausentes"""
+    assinatura = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            assinatura.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        except FileNotFoundError:
+            assinatura.append(None)
+    return tuple(assinatura)
+
+
+class ReadCache:
+    """Cache em memória do conteúdo já interpretado de arquivos de dados
+
+    Cada entrada guarda a assinatura dos arquivos de origem no momento da leitura e só é
+    reaproveitada enquanto ela não muda; assim apenas os arquivos alterados são relidos.
+    Os valores guardados são compartilhados e não devem ser alterados por quem os recebe.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, paths, loader):
+        """Retorna o valor em cache se os arquivos não mudaram; senão chama loader() e guarda"""
+        assinatura = file_signature(*paths)
+        with self._lock:
+            entrada = self._entries.get(key)
+            if entrada is not None and entrada[0] == assinatura:
+                self.hits += 1
+                return entrada[1]
+            self.misses += 1
+        valor = loader()
+        with self._lock:
+            self._entries[key] = (assinatura, valor)
+        return valor
+
+    def lookup(self, key, assinatura):
+        """Retorna o valor guardado se ele corresponde à assinatura informada (ou None)"""
+        with self._lock:
+            entrada = self._entries.get(key)
+        if entrada is not None and entrada[0] == assinatura:
+            return entrada[1]
+        return None
+
+    def put(self, key, paths, valor):
+        """Grava um valor no cache com a assinatura atual dos arquivos (escrita direta)"""
+        assinatura = file_signature(*paths)
+        with self._lock:
+            self._entries[key] = (assinatura, valor)
+
+    def invalidate(self, key=None):
+        """Descarta uma entrada (ou todas)"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """Retorna os contadores de acertos e faltas do cache"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entradas': len(self._entries)}
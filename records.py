@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True, slots=True)
+class MaintenanceRecord:
+    """Registro de manutenção com campos fixos (sem o dicionário de atributos de cada instância)"""
+    peca: str
+    tipo_manutencao: str
+    descricao: str
+    custo: float
+    timestamp: str = None
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    """Comparação entre dois itens do histórico de comparações (data em ISO)"""
+    data: str
+    item1: str
+    item2: str
+    diferenca: float
+
+
+@dataclass(frozen=True, slots=True)
+class PartStatus:
+    """Status atual de uma peça"""
+    part_id: str
+    status: str
+    ultima_atualizacao: str
+
+
+# Tipo de coluna de cada campo: 'category' (códigos + valores distintos), 'text', 'float' ou 'datetime'
+COLUMN_TYPES = {
+    MaintenanceRecord: {
+        "peca": "category", "tipo_manutencao": "category", "descricao": "text",
+        "custo": "float", "timestamp": "datetime"
+    },
+    Comparison: {"data": "datetime", "item1": "category", "item2": "category", "diferenca": "float"},
+    PartStatus: {"part_id": "text", "status": "category", "ultima_atualizacao": "datetime"},
+}
+
+
+def _column(valores, tipo):
+    """Converte os valores de um campo no array da coluna"""
+    if tipo == "category":
+        return pd.Categorical([str(v) for v in valores])
+    if tipo == "float":
+        return np.array(valores, dtype="float64")
+    if tipo == "datetime":
+        return pd.to_datetime(list(valores), format="ISO8601", errors="coerce").values
+    return np.array(valores, dtype=object)
+
+
+def _value(valor, tipo):
+    """Converte um valor da coluna de volta para o valor Python do registro"""
+    if tipo == "float":
+        return float(valor)
+    if tipo == "datetime":
+        return None if np.isnat(valor) else pd.Timestamp(valor).isoformat()
+    return valor
+
+
+class RecordColumns:
+    """Registros de um mesmo tipo guardados por coluna
+
+    Cada campo vira um único array (float64, datetime64, categórico ou object) em vez de um
+    dicionário por registro. A conversão para DataFrame reaproveita os arrays sem copiá-los e
+    as linhas só viram objetos do tipo do registro quando lidas uma a uma.
+    """
+
+    def __init__(self, record_type, colunas):
+        self.record_type = record_type
+        self.colunas = colunas
+        # As colunas são compartilhadas (cache, DataFrames de exibição) e por isso somente leitura
+        for coluna in colunas.values():
+            if isinstance(coluna, np.ndarray):
+                coluna.flags.writeable = False
+
+    @classmethod
+    def from_dicts(cls, record_type, registros):
+        """Monta as colunas a partir de registros em dicionário (campos ausentes viram None)"""
+        return cls.from_rows(record_type, ([r.get(nome) for nome in COLUMN_TYPES[record_type]] for r in registros))
+
+    @classmethod
+    def from_records(cls, record_type, registros):
+        """Monta as colunas a partir de instâncias do tipo do registro"""
+        return cls.from_rows(record_type, ([getattr(r, nome) for nome in COLUMN_TYPES[record_type]] for r in registros))
+
+    @classmethod
+    def from_rows(cls, record_type, linhas):
+        """Monta as colunas a partir de linhas com os campos na ordem de COLUMN_TYPES"""
+        tipos = COLUMN_TYPES[record_type]
+        valores = list(zip(*linhas)) or [()] * len(tipos)
+        return cls(record_type, {
+            nome: _column(coluna, tipo) for (nome, tipo), coluna in zip(tipos.items(), valores)
+        })
+
+    def __len__(self):
+        return len(next(iter(self.colunas.values())))
+
+    def __getitem__(self, nome):
+        return self.colunas[nome]
+
+    def sort_key(self, nome):
+        """Retorna o array usado para ordenar pela coluna (os códigos, no caso das categóricas)"""
+        coluna = self.colunas[nome]
+        return coluna.codes if isinstance(coluna, pd.Categorical) else coluna
+
+    def take(self, posicoes):
+        """Retorna as linhas nas posições informadas (uma fatia devolve vistas, sem cópia)"""
+        return RecordColumns(self.record_type, {nome: coluna[posicoes] for nome, coluna in self.colunas.items()})
+
+    def row(self, i):
+        """Retorna a linha i como instância do tipo do registro"""
+        tipos = COLUMN_TYPES[self.record_type]
+        return self.record_type(*(_value(self.colunas[nome][i], tipo) for nome, tipo in tipos.items()))
+
+    def __iter__(self):
+        return (self.row(i) for i in range(len(self)))
+
+    def to_frame(self):
+        """Retorna um DataFrame que usa os próprios arrays das colunas, sem copiá-los
+
+        As colunas numéricas e de data são somente leitura; use .copy() para alterar o DataFrame.
+        """
+        return pd.DataFrame(self.colunas, copy=False)
+
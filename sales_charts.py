@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+# Limite padrão de pontos enviados ao navegador no gráfico de dispersão
+MAX_SCATTER_POINTS = 5000
+
+
+def downsample_points(df, max_points=MAX_SCATTER_POINTS, group_column="DESCRIÇÃO MATERIAL",
+                      value_column="VALOR TOTAL", seed=0):
+    """Reduz df a cerca de max_points linhas, amostrando cada grupo proporcionalmente ao seu tamanho
+
+    Cada grupo mantém pelo menos um ponto, sempre o de maior valor, para que nenhum
+    material suma da legenda e os valores extremos continuem visíveis. Se houver mais
+    grupos que max_points, o resultado terá um ponto por grupo.
+    """
+    total = len(df)
+    if total <= max_points:
+        return df
+
+    codigos = pd.Series(pd.factorize(df[group_column], use_na_sentinel=False)[0], index=df.index)
+    contagem = codigos.value_counts()
+    tamanhos = codigos.map(contagem).to_numpy()
+
+    # Um ponto garantido por grupo; o restante do orçamento é dividido pelo tamanho do grupo
+    restante = max(0, max_points - len(contagem))
+    cotas = 1 + tamanhos * restante // total
+
+    # Ordena cada grupo colocando o maior valor primeiro e o restante em ordem aleatória
+    aleatorio = np.random.default_rng(seed).random(total)
+    maior_valor = df[value_column].eq(df.groupby(codigos)[value_column].transform("max")).to_numpy()
+    ordem = np.lexsort((aleatorio, ~maior_valor, codigos.to_numpy()))
+    posicao = pd.Series(codigos.to_numpy()[ordem]).groupby(codigos.to_numpy()[ordem]).cumcount().to_numpy()
+
+    manter = np.zeros(total, dtype=bool)
+    manter[ordem] = posicao < cotas[ordem]
+    return df[manter]
+
+
+def frequency_scatter(df, feature_x, feature_y):
+    """Desenha a dispersão do bloco "Atributos por Frequência" em uma figura nova, sem o pyplot
+
+    A figura não fica registrada no pyplot, então pode ser desenhada fora da thread do
+    script e é liberada quando não há mais referências a ela. O seaborn e o matplotlib são
+    importados só aqui (cerca de 0,8 s), para não atrasar a primeira abertura da página.
+    """
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 8))  # Tamanho ajustado para o original (12, 8)
+    ax = fig.subplots()
+
+    sns.scatterplot(
+        data=df,
+        x=feature_x,
+        y=feature_y,
+        hue="DESCRIÇÃO MATERIAL",
+        ax=ax,
+        alpha=0.5,           # Aumenta a transparência para reduzir a sobreposição
+        s=80                 # Reduz o tamanho dos pontos para melhor visualização
+    )
+
+    # Ajuste das labels para reduzir sobreposição
+    if feature_x == "RAZÃO SOCIAL CLIENTE":
+        # Abrevia nomes longos e rotaciona as labels
+        ax.set_xticklabels([label.get_text()[:15] + '...' if len(label.get_text()) > 15 else label.get_text()
+                            for label in ax.get_xticklabels()], rotation=45, ha='right', fontsize=9)
+    else:
+        ax.set_xticklabels(ax.get_xticklabels(), rotation=30, ha='right', fontsize=9)
+
+    ax.set_yticklabels(ax.get_yticklabels(), fontsize=8)
+
+    # Títulos e legendas melhorados
+    ax.set_title("Visualização das 5 Principais Categorias de Material", fontsize=16)
+    ax.set_xlabel("Variável Qualitativa (X)", fontsize=14)
+    ax.set_ylabel("Variável Quantitativa (Y)", fontsize=14)
+
+    # Legenda fora do gráfico para uma visualização mais compacta
+    ax.legend(title="Descrição Material", bbox_to_anchor=(1.05, 1), loc='upper left')
+
+    # Adiciona linhas de grade para facilitar a comparação dos valores
+    ax.grid(True, linestyle='--', alpha=0.7)
+    return fig
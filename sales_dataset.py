@@ -0,0 +1,108 @@
+from functools import cached_property
+import pandas as pd
+import streamlit as st
+from sales_loader import CACHE_DIR, DATE_COLUMN, SALES_XLSX, load_sales, source_version
+from sales_journal import SalesJournal, merge_sales
+from sales_metrics import KpiEngine
+from sales_rollups import SalesRollups
+from sales_topk import MATERIAL_COLUMN, TopKIndex, top_rows
+
+# Colunas usadas nas listas de seleção do formulário de vendas
+CHOICE_COLUMNS = ["CFOP", "RAZÃO SOCIAL CLIENTE", "UF", "CÓD.MAT.", "DESCRIÇÃO MATERIAL"]
+
+
+def build_choices(df, columns=CHOICE_COLUMNS):
+    """Pré-calcula as listas ordenadas de valores únicos para os selectboxes"""
+    return {coluna: sorted(df[coluna].dropna().unique().tolist()) for coluna in columns}
+
+
+def build_date_index(df):
+    """Cria o índice de datas sobre a base ordenada, ignorando as emissões inválidas (no fim)"""
+    validas = int(df[DATE_COLUMN].notna().sum())
+    return pd.DatetimeIndex(df[DATE_COLUMN].iloc[:validas])
+
+
+def period_bounds(date_index, start, end):
+    """Retorna as posições [início, fim) do período por busca binária no índice de datas"""
+    inicio = date_index.searchsorted(pd.Timestamp(start), side="left")
+    fim = date_index.searchsorted(pd.Timestamp(end), side="right")
+    return inicio, max(inicio, fim)
+
+
+class SalesSnapshot:
+    """Retrato imutável da base de vendas compartilhado por todas as sessões"""
+
+    def __init__(self, df, version, rollups=None):
+        self.df = df
+        self.version = version
+        self.choices = build_choices(df)
+        self.date_index = build_date_index(df)
+        if rollups is not None:
+            # Cubos já atualizados com os lançamentos (ver _load_snapshot); substitui a cached_property
+            self.rollups = rollups
+
+    def bounds(self, start, end):
+        """Retorna as posições [início, fim) do período na base ordenada"""
+        return period_bounds(self.date_index, start, end)
+
+    def period(self, start, end):
+        """Retorna a fatia da base emitida entre start e end (inclusive), sem copiar os dados"""
+        inicio, fim = self.bounds(start, end)
+        return self.df.iloc[inicio:fim]
+
+    @cached_property
+    def rollups(self):
+        """Cubos de agregados mensais, calculados na primeira consulta (se não vierem prontos)"""
+        return SalesRollups(self.df)
+
+    @cached_property
+    def metrics(self):
+        """Motor das estatísticas dos cards, criado na primeira consulta"""
+        return KpiEngine(self)
+
+    @cached_property
+    def material_index(self):
+        """Índice de frequência mensal dos materiais, criado na primeira consulta"""
+        return TopKIndex.from_column(self.df[MATERIAL_COLUMN], self.date_index)
+
+    def top_rows(self, start, end, materials=5, clients=None):
+        """Retorna as linhas do período com os materiais mais frequentes (e os clientes mais frequentes entre elas)"""
+        inicio, fim = self.bounds(start, end)
+        return top_rows(self.df, self.material_index, inicio, fim, materials, clients)
+
+    def kpis(self, start, end):
+        """Retorna as estatísticas dos cards para o período (memorizadas)"""
+        return self.metrics.period(start, end)
+
+    def rollup(self, name, start, end):
+        """Retorna os agregados mensais do cubo `name` no período, com uma linha por grupo"""
+        return self.rollups.query(name, start, end, self.period)
+
+    def __repr__(self):
+        return f"SalesSnapshot(version={self.version!r}, linhas={len(self.df)})"
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _base_rollups(path, fonte, cache_dir, _base):
+    """Cubos mensais da planilha, calculados uma única vez por versão da planilha
+
+    Os lançamentos do diário não entram aqui: cada novo retrato parte de uma cópia destes
+    cubos e soma só as linhas lançadas.
+    """
+    return SalesRollups(_base)
+
+
+@st.cache_resource(max_entries=2, show_spinner="Carregando base de vendas...")
+def _load_snapshot(path, fonte, diario, cache_dir=CACHE_DIR, data_dir="data"):
+    """Carrega uma versão da base de vendas (planilha + lançamentos) uma única vez por processo"""
+    base = load_sales(path, cache_dir=cache_dir)
+    lancamentos = SalesJournal(data_dir).read()
+    rollups = _base_rollups(path, fonte, cache_dir, base).copy()
+    if lancamentos is not None and len(lancamentos):
+        rollups.update(lancamentos)
+    return SalesSnapshot(merge_sales(base, lancamentos), f"{fonte}|{diario}", rollups=rollups)
+
+
+def get_dataset(path=SALES_XLSX, cache_dir=CACHE_DIR, data_dir="data"):
+    """Retorna o retrato atual da base de vendas, recarregando-o se a planilha ou o diário mudaram"""
+    return _load_snapshot(path, source_version(path), SalesJournal(data_dir).version(), cache_dir, data_dir)
@@ -0,0 +1,267 @@
+"""Gera bases de vendas sintéticas, de qualquer tamanho, com as distribuições de Base_fiap.csv.
+
+Uso:
+    python sales_generator.py saida.parquet --linhas 5000000 [--inicio 2019-01-01] [--fim 2024-12-31]
+        [--chunk 100000] [--fonte Base_fiap.csv] [--seed 42]
+"""
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sales_loader import CSV_DATE_FORMAT, DATE_COLUMN, SALES_COLUMNS, SALES_CSV, normalize_sales, read_source
+
+# Número de linhas geradas e gravadas de cada vez
+CHUNK_SIZE = 100_000
+
+# Limite de linhas de uma planilha do Excel (sem contar o cabeçalho)
+XLSX_MAX_ROWS = 1_048_575
+
+# Colunas de texto geradas como categorias (com a lista de valores da base de origem)
+TEXT_COLUMNS = ["ST", "RAZÃO SOCIAL CLIENTE", "UF", "CÓD.MAT.", "DESCRIÇÃO MATERIAL", "UNID. MEDIDA"]
+
+
+def _frequencies(serie):
+    """Retorna (valores, probabilidades) dos valores não nulos da série"""
+    contagem = serie.dropna().value_counts()
+    return contagem.index.to_numpy(), (contagem / contagem.sum()).to_numpy()
+
+
+class SalesModel:
+    """Distribuições da base de vendas usadas para gerar linhas de nota sintéticas
+
+    Guarda a frequência de clientes e materiais, o UF, vendedor e CFOPs de cada cliente, a
+    descrição, unidade, quantidades vendidas e a distribuição (log-normal) do preço unitário
+    de cada material, o número de linhas por nota e a sazonalidade das emissões por mês do
+    ano e dia da semana.
+    """
+
+    def __init__(self, clientes, materiais, linhas_por_nota, sazonalidade, status):
+        self.clientes = clientes
+        self.materiais = materiais
+        self.linhas_por_nota = linhas_por_nota
+        self.sazonalidade = sazonalidade
+        self.status = status
+
+    @classmethod
+    def fit(cls, df):
+        """Aprende as distribuições a partir da base normalizada (ver normalize_sales)"""
+        validas = df[DATE_COLUMN].notna() & df["CFOP"].notna() & df["QUANTIDADE"].gt(0)
+        df = df[validas & df["RAZÃO SOCIAL CLIENTE"].notna() & df["CÓD.MAT."].notna()]
+        notas = df.drop_duplicates("NF")
+
+        # Clientes: frequência por nota; UF e vendedor mais comuns; CFOPs observados nas suas notas
+        por_cliente = notas.groupby("RAZÃO SOCIAL CLIENTE", observed=True)
+        nomes, probabilidades = _frequencies(notas["RAZÃO SOCIAL CLIENTE"].astype(str))
+        codigo_cliente = pd.Categorical(notas["RAZÃO SOCIAL CLIENTE"].astype(str), categories=nomes).codes
+        # CFOPs de todos os clientes em um único array, agrupados por cliente, com o início e a quantidade de cada um
+        total_cfop = np.bincount(codigo_cliente, minlength=len(nomes))
+        clientes = {
+            "nome": nomes,
+            "p": probabilidades,
+            "uf": por_cliente["UF"].agg(lambda s: s.mode().iloc[0]).astype(str).reindex(nomes).to_numpy(),
+            "vendedor": por_cliente["VEND."].agg(lambda s: s.mode().iloc[0]).reindex(nomes).to_numpy(dtype="float64"),
+            "cfop": notas["CFOP"].to_numpy(dtype="float64")[np.argsort(codigo_cliente, kind="stable")],
+            "cfop_inicio": np.cumsum(total_cfop) - total_cfop,
+            "cfop_total": total_cfop,
+        }
+
+        # Materiais: frequência por linha, descrição, unidade, quantidades vendidas e preço unitário
+        # (log-normal, limitado à faixa observada do material)
+        codigo_material = df["CÓD.MAT."].astype(str)
+        codigos, probabilidades = _frequencies(codigo_material)
+        por_material = df.groupby(codigo_material, observed=True)
+        precos = df["VALOR UNITÁRIO"].where(df["VALOR UNITÁRIO"] > 0)
+        log_preco = np.log(precos).groupby(codigo_material)
+        media_geral, desvio_geral = np.log(precos).agg(["mean", "std"])
+        codigo_linha = pd.Categorical(codigo_material, categories=codigos).codes
+        total_quantidades = np.bincount(codigo_linha, minlength=len(codigos))
+        materiais = {
+            "codigo": codigos,
+            "p": probabilidades,
+            "descricao": por_material["DESCRIÇÃO MATERIAL"].first().astype(str).reindex(codigos).to_numpy(),
+            "unidade": por_material["UNID. MEDIDA"].first().astype(str).reindex(codigos).to_numpy(),
+            "log_preco": log_preco.mean().reindex(codigos).fillna(media_geral).to_numpy(),
+            "desvio": log_preco.std().reindex(codigos).fillna(desvio_geral / 4).to_numpy(),
+            "preco_min": precos.groupby(codigo_material).min().reindex(codigos).fillna(precos.min()).to_numpy(),
+            "preco_max": precos.groupby(codigo_material).max().reindex(codigos).fillna(precos.max()).to_numpy(),
+            # Quantidades de todos os materiais em um único array, como os CFOPs dos clientes
+            "quantidade": df["QUANTIDADE"].to_numpy(dtype="float64")[np.argsort(codigo_linha, kind="stable")],
+            "quantidade_inicio": np.cumsum(total_quantidades) - total_quantidades,
+            "quantidade_total": total_quantidades,
+        }
+
+        # Sazonalidade: média de linhas por mês do ano e participação de cada dia da semana
+        datas = df[DATE_COLUMN]
+        mensal = datas.groupby([datas.dt.year, datas.dt.month]).size()
+        por_mes = mensal.groupby(level=1).mean().reindex(range(1, 13), fill_value=0).to_numpy(dtype="float64")
+        por_dia_semana = datas.dt.dayofweek.value_counts().reindex(range(7), fill_value=0).to_numpy(dtype="float64")
+        sazonalidade = {"mes": por_mes / por_mes.sum(), "dia_semana": por_dia_semana / por_dia_semana.sum()}
+
+        return cls(
+            clientes=clientes,
+            materiais=materiais,
+            linhas_por_nota=df.groupby("NF").size().to_numpy(),
+            sazonalidade=sazonalidade,
+            status=_frequencies(df["ST"].astype(str)),
+        )
+
+    @classmethod
+    def from_file(cls, path=SALES_CSV):
+        """Aprende as distribuições de uma planilha de vendas (CSV ou XLSX)"""
+        return cls.fit(normalize_sales(read_source(path)))
+
+    def daily_counts(self, linhas, inicio, fim, rng):
+        """Distribui as linhas pelos dias de [inicio, fim] conforme a sazonalidade"""
+        dias = pd.date_range(inicio, fim, freq="D")
+        if len(dias) == 0:
+            raise ValueError("O período de emissão não contém nenhum dia")
+        pesos = self.sazonalidade["mes"][dias.month - 1] * self.sazonalidade["dia_semana"][dias.dayofweek]
+        if pesos.sum() == 0:
+            pesos = np.ones(len(dias))
+        return dias.to_numpy(), rng.multinomial(linhas, pesos / pesos.sum())
+
+    def chunks(self, linhas, inicio="2019-01-01", fim="2024-12-31", chunk_size=CHUNK_SIZE, seed=42, primeira_nf=1):
+        """Gera as linhas de nota em DataFrames de até chunk_size linhas, em ordem de emissão
+
+        Só o lote corrente fica em memória; o total de linhas pode ser qualquer um.
+        """
+        rng = np.random.default_rng(seed)
+        dias, por_dia = self.daily_counts(linhas, inicio, fim, rng)
+        fim_do_dia = np.cumsum(por_dia)
+        proxima_nf = primeira_nf
+        for a in range(0, linhas, chunk_size):
+            b = min(a + chunk_size, linhas)
+            lote, proxima_nf = self._chunk(rng, a, b, dias, fim_do_dia, proxima_nf)
+            yield lote
+
+    def _chunk(self, rng, a, b, dias, fim_do_dia, primeira_nf):
+        """Gera as linhas [a, b) da base; retorna (DataFrame, próxima NF)"""
+        n = b - a
+        posicao_dia = np.searchsorted(fim_do_dia, np.arange(a, b), side="right")
+
+        # Uma nota nova no início do lote, a cada mudança de dia e conforme o número de linhas por nota
+        nova_nota = np.zeros(n, dtype=bool)
+        nova_nota[0] = True
+        nova_nota[1:] |= np.diff(posicao_dia) != 0
+        inicios = np.cumsum(rng.choice(self.linhas_por_nota, size=n))
+        nova_nota[inicios[inicios < n]] = True
+        nota = np.cumsum(nova_nota) - 1
+        notas = nota[-1] + 1
+
+        clientes, materiais = self.clientes, self.materiais
+        cliente = rng.choice(len(clientes["nome"]), size=notas, p=clientes["p"])
+        cfop = clientes["cfop"][clientes["cfop_inicio"][cliente] + rng.integers(0, clientes["cfop_total"][cliente])]
+        material = rng.choice(len(materiais["codigo"]), size=n, p=materiais["p"])
+        quantidade = materiais["quantidade"][
+            materiais["quantidade_inicio"][material] + rng.integers(0, materiais["quantidade_total"][material])
+        ]
+        preco = np.exp(rng.normal(materiais["log_preco"][material], materiais["desvio"][material]))
+        preco = np.clip(preco, materiais["preco_min"][material], materiais["preco_max"][material]).round(2)
+        status, p_status = self.status
+
+        cliente = cliente[nota]
+        lote = pd.DataFrame({
+            "NF": primeira_nf + nota,
+            "ST": pd.Categorical(rng.choice(status, size=n, p=p_status), categories=status),
+            "CFOP": cfop[nota],
+            DATE_COLUMN: dias[posicao_dia],
+            "VEND.": clientes["vendedor"][cliente],
+            "RAZÃO SOCIAL CLIENTE": pd.Categorical.from_codes(cliente, clientes["nome"]),
+            "UF": pd.Categorical(clientes["uf"][cliente]),
+            "CÓD.MAT.": pd.Categorical.from_codes(material, materiais["codigo"]),
+            "DESCRIÇÃO MATERIAL": pd.Categorical(materiais["descricao"][material]),
+            "UNID. MEDIDA": pd.Categorical(materiais["unidade"][material]),
+            "QUANTIDADE": quantidade,
+            "VALOR UNITÁRIO": preco,
+            "VALOR TOTAL": (quantidade * preco).round(2),
+        })
+        return lote[SALES_COLUMNS], primeira_nf + notas
+
+
+def _write_csv(path, chunks):
+    """Grava os lotes em CSV, com as datas no formato do CSV de origem"""
+    linhas = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for i, lote in enumerate(chunks):
+            lote.to_csv(f, header=i == 0, index=False, date_format=CSV_DATE_FORMAT)
+            linhas += len(lote)
+    return linhas
+
+
+def _write_parquet(path, chunks):
+    """Grava os lotes em um único arquivo Parquet, um grupo de linhas por lote"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    linhas, writer = 0, None
+    try:
+        for lote in chunks:
+            # Texto simples em vez de categorias: cada lote tem seus próprios valores distintos
+            tabela = pa.Table.from_pandas(lote.astype({c: str for c in TEXT_COLUMNS}), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, tabela.schema)
+            writer.write_table(tabela)
+            linhas += len(lote)
+    finally:
+        if writer is not None:
+            writer.close()
+    return linhas
+
+
+def _write_xlsx(path, chunks):
+    """Grava os lotes em uma planilha do Excel no modo de escrita contínua do openpyxl"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    planilha = workbook.create_sheet()
+    planilha.append(SALES_COLUMNS)
+    linhas = 0
+    for lote in chunks:
+        for linha in lote.itertuples(index=False, name=None):
+            planilha.append([None if pd.isna(v) else v for v in linha])
+        linhas += len(lote)
+    workbook.save(path)
+    return linhas
+
+
+WRITERS = {".csv": _write_csv, ".parquet": _write_parquet, ".xlsx": _write_xlsx}
+
+
+def write_sales(path, linhas, model=None, **opcoes):
+    """Gera `linhas` linhas de nota e grava em CSV, XLSX ou Parquet (pela extensão), lote a lote"""
+    extensao = os.path.splitext(path)[1].lower()
+    if extensao not in WRITERS:
+        raise ValueError(f"Formato não suportado: '{extensao}'; use um de: {', '.join(WRITERS)}")
+    if extensao == ".xlsx" and linhas > XLSX_MAX_ROWS:
+        raise ValueError(f"Uma planilha do Excel comporta no máximo {XLSX_MAX_ROWS:,} linhas")
+    model = model or SalesModel.from_file()
+    return WRITERS[extensao](path, model.chunks(linhas, **opcoes))
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("saida", help="arquivo de saída (.csv, .xlsx ou .parquet)")
+    parser.add_argument("--linhas", type=int, required=True, help="número de linhas de nota")
+    parser.add_argument("--inicio", default="2019-01-01", help="primeira data de emissão")
+    parser.add_argument("--fim", default="2024-12-31", help="última data de emissão")
+    parser.add_argument("--chunk", type=int, default=CHUNK_SIZE, help="linhas geradas e gravadas de cada vez")
+    parser.add_argument("--fonte", default=SALES_CSV, help="base real usada para aprender as distribuições")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    try:
+        model = SalesModel.from_file(args.fonte)
+        linhas = write_sales(args.saida, args.linhas, model, inicio=args.inicio, fim=args.fim,
+                             chunk_size=args.chunk, seed=args.seed)
+    except (OSError, ValueError) as e:
+        print(f"Erro ao gerar a base: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{linhas} linhas gravadas em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
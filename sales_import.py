@@ -0,0 +1,112 @@
+"""Importação em lote de linhas de nota fiscal (CSV ou XLSX) para o diário de vendas.
+
+No CSV, as datas de emissão seguem o formato mês/dia/ano da planilha exportada
+("1/8/2019" = 8 de janeiro); datas no formato dia/mês/ano seriam lidas trocadas.
+
+Uso:
+    python sales_import.py arquivo.csv [--rejeitos rejeitos.csv] [--data-dir data]
+"""
+import argparse
+import sys
+import pandas as pd
+from sales_journal import SalesJournal
+from sales_loader import DATE_COLUMN, SALES_COLUMNS, invalid_numbers, normalize_sales, read_source
+
+# Coluna com o número da linha no arquivo importado (a linha 1 é o cabeçalho)
+LINE_COLUMN = "LINHA"
+
+# Coluna com os motivos de rejeição de cada linha
+REASON_COLUMN = "MOTIVO"
+
+# Campos obrigatórios, os mesmos exigidos pelo formulário de vendas
+REQUIRED_COLUMNS = ["NF", "ST", "CFOP", "EMISSÃO", "RAZÃO SOCIAL CLIENTE", "UF", "CÓD.MAT.", "DESCRIÇÃO MATERIAL"]
+
+# Colunas numéricas cujo texto não numérico rejeita a linha (em vez de virar nulo na normalização)
+CHECKED_NUMBER_COLUMNS = ["NF", "CFOP", "VEND."]
+
+# Formato das datas de emissão esperado no CSV, para as mensagens de ajuda
+DATE_FORMAT_HELP = "datas de emissão em mês/dia/ano, como 1/8/2019 para 8 de janeiro"
+
+
+def validate_sales_batch(df):
+    """Valida um lote de linhas de venda de uma vez, retornando (válidas, rejeitadas)
+
+    As linhas válidas saem normalizadas; as rejeitadas trazem a linha do arquivo e os motivos.
+    """
+    faltantes = [coluna for coluna in SALES_COLUMNS if coluna not in df.columns and coluna != "VALOR TOTAL"]
+    if faltantes:
+        raise ValueError(f"Colunas obrigatórias não encontradas no arquivo: {', '.join(faltantes)}")
+
+    df = df.reindex(columns=SALES_COLUMNS).copy()
+    df.insert(0, LINE_COLUMN, range(2, len(df) + 2))
+    original = df.copy()
+    df = normalize_sales(df)
+    original = original.set_index(LINE_COLUMN).loc[df[LINE_COLUMN]].reset_index()
+
+    # O valor total é calculado como no formulário quando não vem preenchido
+    calculado = df["QUANTIDADE"] * df["VALOR UNITÁRIO"]
+    df["VALOR TOTAL"] = df["VALOR TOTAL"].fillna(calculado)
+
+    regras = {}
+    for coluna in REQUIRED_COLUMNS:
+        vazio = original[coluna].isna() | original[coluna].astype(str).str.strip().eq("")
+        regras[f"'{coluna}' vazio"] = vazio.to_numpy()
+    regras["data de emissão inválida"] = (df[DATE_COLUMN].isna() & ~regras[f"'{DATE_COLUMN}' vazio"]).to_numpy()
+    for coluna in CHECKED_NUMBER_COLUMNS:
+        regras[f"'{coluna}' inválido"] = invalid_numbers(original[coluna]).to_numpy()
+    regras["'NF' deve ser maior que zero"] = (df["NF"] <= 0).to_numpy()
+    regras["'QUANTIDADE' deve ser maior que zero"] = ~(df["QUANTIDADE"] > 0).to_numpy()
+    regras["'VALOR UNITÁRIO' deve ser maior que zero"] = ~(df["VALOR UNITÁRIO"] > 0).to_numpy()
+
+    motivos = pd.Series("", index=df.index)
+    for rotulo, mascara in regras.items():
+        motivos = motivos.where(~mascara, motivos + rotulo + "; ")
+    rejeitar = motivos.ne("")
+
+    validas = df[~rejeitar].drop(columns=LINE_COLUMN)
+    rejeitadas = original[rejeitar.to_numpy()].assign(**{REASON_COLUMN: motivos[rejeitar].str.rstrip("; ").to_numpy()})
+    return validas, rejeitadas.sort_values(LINE_COLUMN, ignore_index=True)
+
+
+def import_sales(df, journal=None):
+    """Valida o lote e grava as linhas válidas no diário de vendas com uma única escrita"""
+    journal = journal or SalesJournal()
+    validas, rejeitadas = validate_sales_batch(df)
+    if len(validas):
+        journal.append(validas[SALES_COLUMNS])
+        journal.maybe_compact()
+    return len(validas), rejeitadas
+
+
+def import_sales_file(path, journal=None, name=None):
+    """Importa um arquivo CSV/XLSX de linhas de nota para o diário de vendas"""
+    return import_sales(read_source(path, name=name), journal)
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("arquivo", help=f"arquivo CSV ou XLSX com as colunas da base de vendas ({DATE_FORMAT_HELP})")
+    parser.add_argument("--rejeitos", help="grava as linhas rejeitadas neste arquivo CSV")
+    parser.add_argument("--data-dir", default="data", help="diretório de dados do dashboard")
+    args = parser.parse_args(argv)
+
+    try:
+        importadas, rejeitadas = import_sales_file(args.arquivo, SalesJournal(args.data_dir))
+    except (OSError, ValueError) as e:
+        print(f"Erro ao importar o arquivo: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{importadas} linhas importadas, {len(rejeitadas)} rejeitadas")
+    if len(rejeitadas):
+        if args.rejeitos:
+            rejeitadas.to_csv(args.rejeitos, index=False)
+            print(f"Linhas rejeitadas gravadas em {args.rejeitos}")
+        else:
+            for linha, motivo in zip(rejeitadas[LINE_COLUMN], rejeitadas[REASON_COLUMN]):
+                print(f"linha {linha}: {motivo}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
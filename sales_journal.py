@@ -0,0 +1,121 @@
+import os
+import threading
+import uuid
+import pandas as pd
+from sales_loader import (
+    CATEGORY_COLUMNS, DATE_COLUMN, DERIVED_COLUMNS, NUMERIC_COLUMNS, SALES_COLUMNS, invalid_numbers, normalize_sales
+)
+
+# Coluna com o identificador único de cada linha lançada pelo formulário
+ID_COLUMN = "ID"
+
+# Número de linhas no diário a partir do qual ele é compactado no arquivo Parquet
+COMPACT_THRESHOLD = 500
+
+# Serializa gravações e compactações entre as sessões do mesmo processo
+_lock = threading.Lock()
+
+
+class SalesJournal:
+    """Diário de vendas somente de acréscimo, mesclado à base de vendas na leitura
+
+    Cada lançamento é acrescentado ao fim de data/sales_journal.csv em O(1). De tempos
+    em tempos o diário é compactado em data/sales_ingested.parquet. Cada linha carrega
+    um ID único, o que torna a compactação idempotente mesmo se for interrompida.
+    """
+
+    def __init__(self, data_dir="data"):
+        self.data_dir = data_dir
+        self.journal_file = os.path.join(data_dir, "sales_journal.csv")
+        self.compacting_file = os.path.join(data_dir, "sales_journal.compacting.csv")
+        self.ingested_file = os.path.join(data_dir, "sales_ingested.parquet")
+
+        # Criar diretório de dados se não existir
+        os.makedirs(data_dir, exist_ok=True)
+
+    def version(self):
+        """Retorna uma versão barata (mtime/tamanho) dos arquivos do diário"""
+        partes = []
+        for arquivo in (self.journal_file, self.compacting_file, self.ingested_file):
+            try:
+                stat = os.stat(arquivo)
+                partes.append(f"{stat.st_mtime_ns}-{stat.st_size}")
+            except FileNotFoundError:
+                partes.append("0")
+        return "/".join(partes)
+
+    def append(self, rows):
+        """Acrescenta linhas de venda (DataFrame ou lista de dicts) ao fim do diário
+
+        Levanta ValueError se uma coluna numérica tiver texto: a leitura o transformaria em
+        nulo e a compactação apagaria o valor digitado.
+        """
+        novas = pd.DataFrame(rows).reindex(columns=SALES_COLUMNS)
+        invalidas = [coluna for coluna in NUMERIC_COLUMNS if invalid_numbers(novas[coluna]).any()]
+        if invalidas:
+            raise ValueError(f"Valores não numéricos em: {', '.join(invalidas)}")
+        novas.insert(0, ID_COLUMN, [uuid.uuid4().hex for _ in range(len(novas))])
+        with _lock:
+            cabecalho = not os.path.exists(self.journal_file) or os.path.getsize(self.journal_file) == 0
+            novas.to_csv(self.journal_file, mode="a", header=cabecalho, index=False, date_format="%Y-%m-%d")
+        return len(novas)
+
+    def _read_csv(self, arquivo):
+        """Lê e normaliza um arquivo do diário"""
+        if not os.path.exists(arquivo) or os.path.getsize(arquivo) == 0:
+            return None
+        return normalize_sales(pd.read_csv(arquivo, dtype=str))
+
+    def read(self):
+        """Retorna todas as linhas lançadas (compactadas e pendentes), normalizadas e sem duplicatas"""
+        partes = []
+        if os.path.exists(self.ingested_file):
+            partes.append(pd.read_parquet(self.ingested_file))
+        for arquivo in (self.compacting_file, self.journal_file):
+            parte = self._read_csv(arquivo)
+            if parte is not None:
+                partes.append(parte)
+        if not partes:
+            return None
+        df = pd.concat(partes, ignore_index=True)
+        return df.drop_duplicates(ID_COLUMN, keep="last", ignore_index=True)
+
+    def pending_rows(self):
+        """Retorna o número aproximado de linhas ainda não compactadas"""
+        if not os.path.exists(self.journal_file):
+            return 0
+        with open(self.journal_file, "rb") as f:
+            return max(0, sum(1 for _ in f) - 1)
+
+    def compact(self):
+        """Compacta o diário no arquivo Parquet e esvazia o diário"""
+        with _lock:
+            if os.path.exists(self.journal_file) and not os.path.exists(self.compacting_file):
+                # Novos lançamentos passam a ir para um diário novo
+                os.replace(self.journal_file, self.compacting_file)
+            df = self.read()
+            if df is not None:
+                for coluna in CATEGORY_COLUMNS + DERIVED_COLUMNS:
+                    df[coluna] = df[coluna].astype("string")
+                tmp_file = self.ingested_file + ".tmp"
+                df.to_parquet(tmp_file, index=False)
+                os.replace(tmp_file, self.ingested_file)
+            if os.path.exists(self.compacting_file):
+                os.remove(self.compacting_file)
+
+    def maybe_compact(self, threshold=COMPACT_THRESHOLD):
+        """Compacta o diário quando ele passa do limite de linhas pendentes"""
+        if self.pending_rows() >= threshold:
+            self.compact()
+            return True
+        return False
+
+
+def merge_sales(base, lancamentos):
+    """Mescla as linhas lançadas à base de vendas, mantendo categorias e a ordem por emissão"""
+    if lancamentos is None or lancamentos.empty:
+        return base
+    df = pd.concat([base, lancamentos.drop(columns=ID_COLUMN)], ignore_index=True)
+    for coluna in CATEGORY_COLUMNS + DERIVED_COLUMNS:
+        df[coluna] = df[coluna].astype("category")
+    return df.sort_values(DATE_COLUMN, kind="stable", na_position="last", ignore_index=True)
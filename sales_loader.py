@@ -0,0 +1,327 @@
+import hashlib
+import json
+import os
+import uuid
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Arquivos de origem da base de vendas
+SALES_XLSX = "base_2.xlsx"
+SALES_CSV = "Base_fiap.csv"
+
+# Diretório do cache colunar (Parquet) gerado a partir das planilhas
+CACHE_DIR = os.path.join("data", "cache")
+
+# Incrementar sempre que o formato do cache mudar, para forçar a reconstrução
+CACHE_VERSION = 5
+
+# Linhas de nota lidas e normalizadas por vez na construção do cache
+CHUNK_SIZE = 100_000
+
+# Colunas da base de vendas, na ordem da planilha
+SALES_COLUMNS = [
+    "NF", "ST", "CFOP", "EMISSÃO", "VEND.", "RAZÃO SOCIAL CLIENTE", "UF", "CÓD.MAT.",
+    "DESCRIÇÃO MATERIAL", "UNID. MEDIDA", "QUANTIDADE", "VALOR UNITÁRIO", "VALOR TOTAL",
+]
+
+# Colunas numéricas e de data da base de vendas
+NUMERIC_COLUMNS = ["NF", "CFOP", "VEND.", "QUANTIDADE", "VALOR UNITÁRIO", "VALOR TOTAL"]
+DATE_COLUMN = "EMISSÃO"
+
+# O CSV exportado traz as datas no formato mês/dia/ano ("1/8/2019" = 8 de janeiro)
+CSV_DATE_FORMAT = "%m/%d/%Y"
+
+# Colunas de texto com poucos valores distintos, armazenadas como categorias
+CATEGORY_COLUMNS = ["ST", "RAZÃO SOCIAL CLIENTE", "UF", "CÓD.MAT.", "DESCRIÇÃO MATERIAL", "UNID. MEDIDA"]
+
+# Colunas calculadas na normalização, que não existem na planilha de origem
+DERIVED_COLUMNS = ["CÓDIGO"]
+
+
+def _file_hash(path):
+    """Calcula o hash SHA-256 do arquivo de origem"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+def _cache_paths(path, cache_dir):
+    """Retorna os caminhos do arquivo Parquet e dos metadados do cache"""
+    nome = os.path.splitext(os.path.basename(path))[0]
+    return (
+        os.path.join(cache_dir, f"{nome}.parquet"),
+        os.path.join(cache_dir, f"{nome}.meta.json"),
+    )
+
+
+def _load_meta(meta_file):
+    """Carrega os metadados do cache, se existirem"""
+    try:
+        with open(meta_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _temp_path(path):
+    """Nome temporário único ao lado de path, para que sessões simultâneas não gravem no mesmo arquivo"""
+    return f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+
+
+def _save_meta(meta_file, meta):
+    """Salva os metadados do cache de forma atômica"""
+    tmp_file = _temp_path(meta_file)
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=4)
+        os.replace(tmp_file, meta_file)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def read_source(path, name=None):
+    """Lê a planilha de vendas original (XLSX ou CSV); path pode ser um arquivo aberto com o nome em name"""
+    if (name or path).lower().endswith(".csv"):
+        # Lê tudo como texto; a conversão fica a cargo de normalize_sales
+        df = pd.read_csv(path, dtype=str)
+    else:
+        df = pd.read_excel(path)
+
+    return _strip_columns(df)
+
+
+def _strip_columns(df):
+    """Remove os espaços dos nomes das colunas ("NF ", " VALOR TOTAL ")"""
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def _excel_value(valor):
+    """Converte as células como o read_excel: erros ("#DIV/0!") viram nulos e floats inteiros viram int"""
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    if isinstance(valor, str) and valor.startswith("#"):
+        # Os códigos de erro do Excel começam com "#"; o openpyxl só é importado ao ler a planilha
+        from openpyxl.cell.cell import ERROR_CODES
+
+        if valor in ERROR_CODES:
+            return None
+    return valor
+
+
+def _read_xlsx_chunks(path, chunk_size):
+    """Lê a primeira aba da planilha em modo somente leitura, chunk_size linhas por vez (ao menos um lote)"""
+    # Importado só aqui: com o cache Parquet em dia a planilha nem é aberta
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        linhas = workbook.worksheets[0].iter_rows(values_only=True)
+        cabecalho = [str(nome) for nome in next(linhas, ())]
+        lote = []
+        vazia = True
+        for linha in linhas:
+            if all(valor is None for valor in linha):
+                continue
+            lote.append([_excel_value(valor) for valor in linha])
+            if len(lote) == chunk_size:
+                yield pd.DataFrame(lote, columns=cabecalho)
+                lote = []
+                vazia = False
+        if lote or vazia:
+            yield pd.DataFrame(lote, columns=cabecalho)
+    finally:
+        workbook.close()
+
+
+def read_source_chunks(path, chunk_size=CHUNK_SIZE, name=None):
+    """Lê a planilha de vendas original (XLSX ou CSV) em lotes de até chunk_size linhas
+
+    Só um lote fica em memória por vez; uma planilha sem linhas gera um único lote vazio.
+    """
+    if (name or path).lower().endswith(".csv"):
+        lotes = pd.read_csv(path, dtype=str, chunksize=chunk_size)
+    else:
+        lotes = _read_xlsx_chunks(path, chunk_size)
+    for lote in lotes:
+        yield _strip_columns(lote)
+
+
+def iter_sales(path, chunk_size=CHUNK_SIZE, name=None):
+    """Lê a planilha de vendas em lotes já normalizados (cada lote ordenado por emissão)"""
+    for lote in read_source_chunks(path, chunk_size, name):
+        yield normalize_sales(lote)
+
+
+def _parse_number(serie):
+    """Converte números em texto no formato "1,800.00" / "5,101" para float"""
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype("float64")
+    texto = serie.astype(str).str.strip().str.replace(",", "", regex=False)
+    # Sempre float64: um lote só com números inteiros não pode fixar int64 no esquema do cache
+    return pd.to_numeric(texto, errors="coerce").astype("float64")
+
+
+def invalid_numbers(serie):
+    """Máscara dos valores preenchidos que não são números (viram nulos em _parse_number)"""
+    preenchidos = serie.notna() & serie.astype(str).str.strip().ne("")
+    return preenchidos & _parse_number(serie).isna()
+
+
+def _parse_date(serie):
+    """Converte a coluna de emissão para datetime com formato explícito"""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    texto = serie.astype(str).str.strip()
+    datas = pd.to_datetime(texto, format=CSV_DATE_FORMAT, errors="coerce")
+    # Valores já convertidos pelo Excel (datetime) chegam como texto ISO
+    faltantes = datas.isna() & serie.notna()
+    if faltantes.any():
+        datas[faltantes] = pd.to_datetime(texto[faltantes], format="ISO8601", errors="coerce")
+    return datas
+
+
+def normalize_sales(df):
+    """Limpa e tipa a base de vendas uma única vez, no momento da carga"""
+    df = df.copy()
+    df[DATE_COLUMN] = _parse_date(df[DATE_COLUMN])
+    for coluna in NUMERIC_COLUMNS:
+        if coluna in df.columns:
+            df[coluna] = _parse_number(df[coluna])
+
+    # Código do material exibido nos gráficos ("5.0207.0544009.0" -> "5207544009")
+    codigo = df["CÓD.MAT."].astype("string").str.replace(".0", "", regex=False)
+    df["CÓDIGO"] = codigo.fillna("Sem Código").astype("category")
+
+    for coluna in CATEGORY_COLUMNS:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype("string").str.strip().astype("category")
+
+    # Mantém a base ordenada por emissão (datas inválidas no fim) para a busca binária por período
+    return df.sort_values(DATE_COLUMN, kind="stable", na_position="last", ignore_index=True)
+
+
+def _cache_schema(schema):
+    """Esquema fixo para todos os lotes: categorias com índices int32 e valores em texto
+
+    Cada lote tem as próprias categorias, e o pandas escolhe o menor tipo inteiro para os
+    códigos; o esquema fixo permite gravar todos os lotes no mesmo arquivo.
+    """
+    campos = []
+    for campo in schema:
+        if pa.types.is_dictionary(campo.type):
+            valores = campo.type.value_type
+            if pa.types.is_null(valores):
+                valores = pa.large_string()
+            campo = pa.field(campo.name, pa.dictionary(pa.int32(), valores))
+        campos.append(campo)
+    return pa.schema(campos, metadata=schema.metadata)
+
+
+def write_chunks(chunks, parquet_file):
+    """Grava lotes normalizados no Parquet, um row group por lote, e indica se a base ficou ordenada
+
+    A base fica ordenada por emissão quando cada lote começa depois do fim do anterior e
+    as emissões inválidas aparecem só no fim, como nas exportações em ordem de nota.
+    """
+    writer = None
+    ordenada = True
+    ultima = None
+    invalidas = False
+    try:
+        for lote in chunks:
+            datas = lote[DATE_COLUMN].dropna()
+            if len(datas):
+                if invalidas or (ultima is not None and datas.iloc[0] < ultima):
+                    ordenada = False
+                ultima = datas.iloc[-1]
+            invalidas = invalidas or len(datas) < len(lote)
+
+            tabela = pa.Table.from_pandas(lote, preserve_index=False)
+            if writer is None:
+                schema = _cache_schema(tabela.schema)
+                writer = pq.ParquetWriter(parquet_file, schema)
+            writer.write_table(tabela.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    return ordenada
+
+
+def read_cache(parquet_file):
+    """Lê o cache Parquet, com as categorias em ordem alfabética como em normalize_sales
+
+    Ao juntar os lotes, o Parquet devolve as categorias na ordem em que apareceram.
+    """
+    df = pd.read_parquet(parquet_file)
+    for coluna in df.columns:
+        if isinstance(df[coluna].dtype, pd.CategoricalDtype) and not df[coluna].cat.categories.is_monotonic_increasing:
+            df[coluna] = df[coluna].cat.reorder_categories(df[coluna].cat.categories.sort_values())
+    return df
+
+
+def build_cache(path, cache_dir=CACHE_DIR, chunk_size=CHUNK_SIZE):
+    """Converte a planilha de origem para o cache Parquet e retorna o DataFrame
+
+    A planilha é lida e normalizada em lotes de chunk_size linhas gravados direto no
+    cache, então o pico de memória não depende do tamanho da planilha.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    parquet_file, meta_file = _cache_paths(path, cache_dir)
+
+    # Grava em arquivo temporário (único por construção) e substitui, para nunca deixar
+    # um cache pela metade, mesmo com duas sessões construindo o cache ao mesmo tempo
+    tmp_file = _temp_path(parquet_file)
+    try:
+        ordenada = write_chunks(iter_sales(path, chunk_size), tmp_file)
+        df = read_cache(tmp_file)
+        if not ordenada:
+            # Lotes fora de ordem: ordena a base já tipada (colunas de texto como categorias)
+            df = df.sort_values(DATE_COLUMN, kind="stable", na_position="last", ignore_index=True)
+            df.to_parquet(tmp_file, index=False)
+        os.replace(tmp_file, parquet_file)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+    stat = os.stat(path)
+    _save_meta(meta_file, {
+        "source": os.path.abspath(path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": _file_hash(path),
+        "version": CACHE_VERSION,
+    })
+    return df
+
+
+def source_version(path=SALES_XLSX):
+    """Retorna uma versão barata (mtime/tamanho) da planilha de origem"""
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def load_sales(path=SALES_XLSX, cache_dir=CACHE_DIR):
+    """Carrega a base de vendas a partir do cache, reconstruindo-o se a planilha mudou"""
+    parquet_file, meta_file = _cache_paths(path, cache_dir)
+    meta = _load_meta(meta_file)
+
+    # O cache é nomeado pelo nome do arquivo: planilhas de mesmo nome em outros diretórios
+    # não podem reaproveitar o cache uma da outra
+    if (meta is None or meta.get("version") != CACHE_VERSION or meta.get("source") != os.path.abspath(path)
+            or not os.path.exists(parquet_file)):
+        return build_cache(path, cache_dir)
+
+    stat = os.stat(path)
+    if meta["mtime_ns"] != stat.st_mtime_ns or meta["size"] != stat.st_size:
+        # A data de modificação mudou: só reconstrói se o conteúdo também mudou
+        if meta["size"] != stat.st_size or meta["sha256"] != _file_hash(path):
+            return build_cache(path, cache_dir)
+        meta["mtime_ns"] = stat.st_mtime_ns
+        _save_meta(meta_file, meta)
+
+    return read_cache(parquet_file)
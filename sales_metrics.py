@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Coluna de valores usada nos cards de estatísticas e coluna usada na contagem de itens
+VALUE_COLUMN = "VALOR TOTAL"
+ITEM_COLUMN = "DESCRIÇÃO MATERIAL"
+
+
+def order_stats(valores):
+    """Retorna (mediana, máximo, mínimo) dos valores sem nulos com uma única chamada a np.partition
+
+    Não ordena o vetor inteiro; um vetor vazio retorna NaN nas três posições.
+    """
+    n = valores.size
+    if n == 0:
+        return np.nan, np.nan, np.nan
+    meio = n // 2
+    posicoes = sorted({0, max(meio - 1, 0), meio, n - 1})
+    particionado = np.partition(valores, posicoes)
+    mediana = particionado[meio] if n % 2 else (particionado[meio - 1] + particionado[meio]) / 2
+    return float(mediana), float(particionado[n - 1]), float(particionado[0])
+
+
+def _kpis(itens, soma, valores):
+    """Monta as estatísticas dos cards a partir da contagem, da soma e dos valores sem nulos"""
+    mediana, maximo, minimo = order_stats(valores)
+    return {
+        "itens": int(itens),
+        "soma": float(soma),
+        "mediana": mediana,
+        "maximo": maximo,
+        "minimo": minimo,
+        "faixa": maximo - minimo,
+    }
+
+
+def compute_kpis(valores, itens=None):
+    """Calcula contagem, soma, mediana, máximo, mínimo e faixa dos valores em uma passada
+
+    Os valores nulos são ignorados, como nos métodos do pandas.
+    """
+    valores = np.asarray(valores, dtype="float64")
+    valores = valores[~np.isnan(valores)]
+    return _kpis(valores.size if itens is None else itens, valores.sum(), valores)
+
+
+class PrefixSums:
+    """Somas acumuladas sobre a base ordenada: soma e contagem de qualquer período em O(1)"""
+
+    def __init__(self, valores, itens_validos):
+        self.soma = np.concatenate(([0.0], np.cumsum(np.nan_to_num(np.asarray(valores, dtype="float64")))))
+        self.itens = np.concatenate(([0], np.cumsum(np.asarray(itens_validos, dtype="int64"))))
+
+    def total(self, inicio, fim):
+        """Retorna (soma, itens) das posições [inicio, fim)"""
+        return float(self.soma[fim] - self.soma[inicio]), int(self.itens[fim] - self.itens[inicio])
+
+
+class KpiEngine:
+    """Estatísticas dos cards por período, memorizadas por (início, fim, filtro)"""
+
+    def __init__(self, snapshot, max_entries=128):
+        self.snapshot = snapshot
+        self.max_entries = max_entries
+        self.valores = snapshot.df[VALUE_COLUMN].to_numpy(dtype="float64", na_value=np.nan)
+        self.prefix = PrefixSums(self.valores, snapshot.df[ITEM_COLUMN].notna().to_numpy())
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _memoize(self, key, calcular):
+        """Retorna o resultado memorizado para key, calculando-o se necessário (LRU)"""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        resultado = calcular()
+        with self._lock:
+            self._cache[key] = resultado
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return resultado
+
+    def period(self, start, end, rows=None):
+        """Retorna as estatísticas do período; rows restringe o cálculo a um subconjunto já filtrado"""
+        filtro = None if rows is None else int(pd.util.hash_pandas_object(rows.index, index=False).sum())
+        key = (pd.Timestamp(start), pd.Timestamp(end), filtro)
+        return self._memoize(key, lambda: self._compute(start, end, rows))
+
+    def _compute(self, start, end, rows):
+        """Calcula as estatísticas usando as somas acumuladas quando não há filtro adicional"""
+        if rows is not None:
+            return compute_kpis(rows[VALUE_COLUMN].to_numpy(dtype="float64", na_value=np.nan),
+                                rows[ITEM_COLUMN].count())
+
+        # Soma e contagem vêm das somas acumuladas; a fatia só é percorrida para a mediana,
+        # o máximo e o mínimo
+        inicio, fim = self.snapshot.bounds(start, end)
+        soma, itens = self.prefix.total(inicio, fim)
+        valores = self.valores[inicio:fim]
+        return _kpis(itens, soma, valores[~np.isnan(valores)])
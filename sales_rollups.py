@@ -0,0 +1,124 @@
+import pandas as pd
+from sales_loader import DATE_COLUMN
+
+# Coluna com o primeiro dia do mês de emissão
+MONTH_COLUMN = "MÊS"
+
+# Coluna com o número de linhas de nota agregadas em cada grupo
+COUNT_COLUMN = "LINHAS"
+
+# Medidas somadas em todos os cubos
+MEASURES = ["QUANTIDADE", "VALOR UNITÁRIO", "VALOR TOTAL"]
+
+# Dimensões de cada cubo (além do mês)
+DIMENSIONS = {
+    "material": ["DESCRIÇÃO MATERIAL"],
+    "cliente": ["RAZÃO SOCIAL CLIENTE"],
+    "uf_material": ["UF", "DESCRIÇÃO MATERIAL"],
+}
+
+
+def month_start(datas):
+    """Trunca as datas para o primeiro dia do mês"""
+    return pd.Series(datas.to_numpy().astype("datetime64[M]"), index=datas.index).astype(datas.dtype)
+
+
+def aggregate(df, keys):
+    """Soma as medidas e conta as linhas de df por mês e pelas chaves informadas"""
+    validas = df[df[DATE_COLUMN].notna()]
+    grupos = validas.groupby([month_start(validas[DATE_COLUMN]).rename(MONTH_COLUMN)] + keys,
+                             observed=True, dropna=False, sort=True)
+    cubo = grupos[MEASURES].sum()
+    cubo[COUNT_COLUMN] = grupos.size()
+    return cubo
+
+
+def _align_categories(cubos):
+    """Dá às chaves categóricas de todos os cubos a união das categorias, em ordem alfabética
+
+    Cubos de lotes diferentes (ou da base e dos lançamentos) têm categorias diferentes, e o
+    concat transformaria as chaves em texto.
+    """
+    niveis = [nome for nome in cubos[0].index.names
+              if isinstance(cubos[0].index.get_level_values(nome).dtype, pd.CategoricalDtype)]
+    if not niveis:
+        return cubos
+    tipos = {}
+    for nome in niveis:
+        categorias = set()
+        for cubo in cubos:
+            categorias.update(cubo.index.get_level_values(nome).categories)
+        tipo_valores = cubos[0].index.get_level_values(nome).categories.dtype
+        tipos[nome] = pd.CategoricalDtype(pd.Index(sorted(categorias), dtype=tipo_valores))
+    chaves = list(cubos[0].index.names)
+    return [cubo.reset_index().astype(tipos).set_index(chaves) for cubo in cubos]
+
+
+def _merge(cubos):
+    """Combina cubos parciais somando os grupos em comum"""
+    cubos = [cubo for cubo in cubos if len(cubo)]
+    if not cubos:
+        return None
+    if len(cubos) == 1:
+        return cubos[0]
+    combinado = pd.concat(_align_categories(cubos))
+    return combinado.groupby(level=list(range(combinado.index.nlevels)), observed=True, dropna=False, sort=True).sum()
+
+
+class SalesRollups:
+    """Cubos de agregados mensais da base de vendas, atualizados de forma incremental"""
+
+    def __init__(self, df=None, dimensions=DIMENSIONS):
+        self.dimensions = dimensions
+        self.cubes = {nome: None for nome in dimensions}
+        if df is not None:
+            self.update(df)
+
+    @classmethod
+    def from_chunks(cls, chunks, dimensions=DIMENSIONS):
+        """Monta os cubos a partir de lotes de linhas (ver sales_loader.iter_sales), um lote por vez"""
+        rollups = cls(dimensions=dimensions)
+        for lote in chunks:
+            rollups.update(lote)
+        return rollups
+
+    def copy(self):
+        """Retorna uma cópia cujas atualizações não alteram estes cubos (os cubos são substituídos, nunca alterados)"""
+        copia = type(self)(dimensions=self.dimensions)
+        copia.cubes = dict(self.cubes)
+        return copia
+
+    def update(self, df):
+        """Incorpora novas linhas de nota aos cubos, somando apenas os grupos afetados"""
+        for nome, keys in self.dimensions.items():
+            parcial = aggregate(df, keys)
+            atual = self.cubes[nome]
+            self.cubes[nome] = parcial if atual is None else _merge([atual, parcial])
+
+    def query(self, name, start, end, period):
+        """Retorna o cubo `name` restrito ao período [start, end], com o mês como coluna
+
+        Os meses inteiramente contidos no período vêm do cubo; os meses parciais das
+        pontas são agregados a partir das linhas retornadas por `period(start, end)`.
+        """
+        keys = self.dimensions[name]
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        primeiro_mes = start if start.is_month_start else start + pd.offsets.MonthBegin(1)
+        ultimo_mes = (end + pd.Timedelta(days=1)).to_period("M").to_timestamp()
+
+        if primeiro_mes >= ultimo_mes or self.cubes[name] is None:
+            # Período menor que um mês inteiro: agrega direto das linhas
+            partes = [aggregate(period(start, end), keys)]
+        else:
+            cubo = self.cubes[name]
+            meses = cubo.index.get_level_values(MONTH_COLUMN)
+            partes = [
+                aggregate(period(start, primeiro_mes - pd.Timedelta(days=1)), keys),
+                cubo[(meses >= primeiro_mes) & (meses < ultimo_mes)],
+                aggregate(period(ultimo_mes, end), keys),
+            ]
+
+        resultado = _merge(partes)
+        if resultado is None:
+            resultado = aggregate(period(start, end).iloc[:0], keys)
+        return resultado.reset_index()
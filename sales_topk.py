@@ -0,0 +1,97 @@
+import numpy as np
+
+# Colunas com índice de frequência para os gráficos de atributos
+MATERIAL_COLUMN = "DESCRIÇÃO MATERIAL"
+CLIENT_COLUMN = "RAZÃO SOCIAL CLIENTE"
+
+
+def month_bounds(date_index):
+    """Retorna as posições de início de cada mês no índice de datas ordenado, mais o fim"""
+    if not len(date_index):
+        return np.zeros(1, dtype="int64")
+    meses = date_index.to_numpy().astype("datetime64[M]")
+    inicios = np.flatnonzero(np.concatenate(([True], meses[1:] != meses[:-1])))
+    return np.append(inicios, len(meses)).astype("int64")
+
+
+def count_codes(codes, categorias):
+    """Conta as ocorrências de cada código de categoria, ignorando os nulos (código -1)"""
+    return np.bincount(codes + 1, minlength=categorias + 1)[1:]
+
+
+def top_codes(contagens, k):
+    """Retorna os códigos das k maiores contagens, em ordem decrescente
+
+    Empates seguem a ordem das categorias, como em value_counts().nlargest(k);
+    categorias sem ocorrências ficam de fora.
+    """
+    ordem = np.argsort(-contagens, kind="stable")[:k]
+    return ordem[contagens[ordem] > 0]
+
+
+class TopKIndex:
+    """Contagens mensais de uma coluna categórica e posições das linhas de cada categoria
+
+    As contagens acumuladas por mês dão a frequência de cada categoria nos meses inteiros
+    de um período com uma subtração; só as pontas parciais são contadas linha a linha. As
+    posições de cada categoria (em ordem) permitem buscar as linhas de um período sem
+    percorrer a base.
+    """
+
+    def __init__(self, codes, limites, categorias):
+        self.codes = codes
+        self.limites = limites
+        self.categorias = categorias
+        validas = codes[:limites[-1]]
+        mes = np.repeat(np.arange(len(limites) - 1), np.diff(limites))
+        por_mes = np.bincount(
+            mes * (categorias + 1) + validas + 1, minlength=(len(limites) - 1) * (categorias + 1)
+        ).reshape(len(limites) - 1, categorias + 1)[:, 1:]
+        self.acumulado = np.vstack([np.zeros((1, categorias), dtype="int64"), np.cumsum(por_mes, axis=0)])
+
+        # Posições das linhas agrupadas por código (cada grupo em ordem crescente)
+        self.posicoes = np.argsort(codes, kind="stable")
+        self.inicio_codigo = np.searchsorted(codes[self.posicoes], np.arange(categorias + 1))
+
+    @classmethod
+    def from_column(cls, serie, date_index):
+        """Cria o índice da coluna categórica sobre a base ordenada por emissão"""
+        return cls(serie.cat.codes.to_numpy(), month_bounds(date_index), len(serie.cat.categories))
+
+    def counts(self, inicio, fim):
+        """Retorna a contagem de cada código nas posições [inicio, fim)"""
+        primeiro = np.searchsorted(self.limites, inicio, side="left")
+        ultimo = np.searchsorted(self.limites, fim, side="right") - 1
+        if primeiro >= ultimo:
+            # Período dentro de um único mês: conta direto das linhas
+            return count_codes(self.codes[inicio:fim], self.categorias)
+        return (
+            self.acumulado[ultimo] - self.acumulado[primeiro]
+            + count_codes(self.codes[inicio:self.limites[primeiro]], self.categorias)
+            + count_codes(self.codes[self.limites[ultimo]:fim], self.categorias)
+        )
+
+    def top(self, inicio, fim, k):
+        """Retorna os códigos das k categorias mais frequentes nas posições [inicio, fim)"""
+        return top_codes(self.counts(inicio, fim), k)
+
+    def rows(self, inicio, fim, codes):
+        """Retorna, em ordem, as posições em [inicio, fim) das linhas com os códigos informados"""
+        partes = []
+        for codigo in codes:
+            grupo = self.posicoes[self.inicio_codigo[codigo]:self.inicio_codigo[codigo + 1]]
+            partes.append(grupo[np.searchsorted(grupo, inicio):np.searchsorted(grupo, fim)])
+        if not partes:
+            return np.zeros(0, dtype="int64")
+        return np.sort(np.concatenate(partes))
+
+
+def top_rows(df, index, inicio, fim, materiais=5, clientes=None):
+    """Linhas de [inicio, fim) com os materiais mais frequentes e, opcionalmente, só dos clientes mais frequentes entre elas"""
+    linhas = index.rows(inicio, fim, index.top(inicio, fim, materiais))
+    if clientes is not None:
+        coluna = df[CLIENT_COLUMN]
+        codes = coluna.cat.codes.to_numpy()[linhas]
+        principais = top_codes(count_codes(codes, len(coluna.cat.categories)), clientes)
+        linhas = linhas[np.isin(codes, principais)]
+    return df.iloc[linhas]
@@ -0,0 +1,544 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+import pandas as pd
+from file_lock import file_lock
+from jsonl import append_jsonl, read_jsonl
+from maintenance_analytics import MaintenanceAnalytics
+from maintenance_query import MaintenanceIndex, time_bounds
+from part_status_log import PartStatusLog, iso_timestamp
+from read_cache import ReadCache, file_signature
+from records import MaintenanceRecord, RecordColumns
+
+# Número de eventos no diário a partir do qual ele é compactado no retrato (JournalStorage)
+COMPACT_THRESHOLD = 1000
+
+
+def _empty_comparisons():
+    """Retorna o DataFrame vazio do histórico de comparações com os tipos corretos"""
+    return pd.DataFrame({
+        'data': pd.Series(dtype='datetime64[ns]'),
+        'item1': pd.Series(dtype='str'),
+        'item2': pd.Series(dtype='str'),
+        'diferenca': pd.Series(dtype='float64')
+    })
+
+
+class SQLiteStorage:
+    """Backend do DataManager em SQLite (modo WAL), com inserções O(1) e consultas indexadas"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS manutencao (
+            id INTEGER PRIMARY KEY,
+            peca TEXT NOT NULL,
+            tipo_manutencao TEXT NOT NULL,
+            custo REAL NOT NULL,
+            timestamp TEXT NOT NULL,
+            dados TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_manutencao_peca ON manutencao (peca);
+        CREATE INDEX IF NOT EXISTS idx_manutencao_tipo ON manutencao (tipo_manutencao);
+        CREATE INDEX IF NOT EXISTS idx_manutencao_timestamp ON manutencao (timestamp);
+
+        CREATE TABLE IF NOT EXISTS comparacoes (
+            id INTEGER PRIMARY KEY,
+            data TEXT NOT NULL,
+            item1 TEXT NOT NULL,
+            item2 TEXT NOT NULL,
+            diferenca REAL NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS estado_pecas (
+            part_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            ultima_atualizacao TEXT NOT NULL
+        );
+
+        -- Todas as mudanças de status; estado_pecas é a visão do status atual
+        CREATE TABLE IF NOT EXISTS historico_estado (
+            id INTEGER PRIMARY KEY,
+            part_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            timestamp TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_historico_estado_peca ON historico_estado (part_id, timestamp);
+
+        -- Agregados de custo mantidos por gatilho a cada novo registro de manutenção
+        CREATE TABLE IF NOT EXISTS resumo_peca (chave TEXT PRIMARY KEY, custo REAL NOT NULL, registros INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS resumo_tipo (chave TEXT PRIMARY KEY, custo REAL NOT NULL, registros INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS resumo_mes (chave TEXT PRIMARY KEY, custo REAL NOT NULL, registros INTEGER NOT NULL);
+
+        CREATE TRIGGER IF NOT EXISTS resumo_manutencao AFTER INSERT ON manutencao
+        BEGIN
+            INSERT INTO resumo_peca (chave, custo, registros) VALUES (NEW.peca, NEW.custo, 1)
+                ON CONFLICT(chave) DO UPDATE SET custo = custo + excluded.custo, registros = registros + 1;
+            INSERT INTO resumo_tipo (chave, custo, registros) VALUES (NEW.tipo_manutencao, NEW.custo, 1)
+                ON CONFLICT(chave) DO UPDATE SET custo = custo + excluded.custo, registros = registros + 1;
+            INSERT INTO resumo_mes (chave, custo, registros) VALUES (substr(NEW.timestamp, 1, 7), NEW.custo, 1)
+                ON CONFLICT(chave) DO UPDATE SET custo = custo + excluded.custo, registros = registros + 1;
+        END;
+    """
+
+    # Agregados e a expressão de agrupamento de cada um, usados para recalculá-los
+    SUMMARY_TABLES = {
+        'resumo_peca': 'peca',
+        'resumo_tipo': 'tipo_manutencao',
+        'resumo_mes': 'substr(timestamp, 1, 7)',
+    }
+
+    def __init__(self, db_file='data/manutencao.db'):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(self.SCHEMA)
+        self._upgrade(conn)
+
+    def _connect(self):
+        """Retorna a conexão da thread atual (o sqlite3 não compartilha conexões entre threads)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _upgrade(self, conn):
+        """Preenche as tabelas derivadas de bancos criados antes delas existirem"""
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # O status atual das peças sem histórico vira o primeiro evento do histórico
+            conn.execute(
+                'INSERT INTO historico_estado (part_id, status, timestamp) '
+                'SELECT part_id, status, ultima_atualizacao FROM estado_pecas '
+                'WHERE part_id NOT IN (SELECT DISTINCT part_id FROM historico_estado) ORDER BY rowid'
+            )
+            # Agregados de custo que não batem com a tabela de manutenção são recalculados
+            registros = conn.execute('SELECT COUNT(*) FROM manutencao').fetchone()[0]
+            for tabela, grupo in self.SUMMARY_TABLES.items():
+                resumidos = conn.execute(f'SELECT COALESCE(SUM(registros), 0) FROM {tabela}').fetchone()[0]
+                if resumidos != registros:
+                    conn.execute(f'DELETE FROM {tabela}')
+                    conn.execute(
+                        f'INSERT INTO {tabela} (chave, custo, registros) '
+                        f'SELECT {grupo}, SUM(custo), COUNT(*) FROM manutencao GROUP BY {grupo}'
+                    )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def close(self):
+        """Fecha a conexão da thread atual"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def is_empty(self):
+        """Indica se nenhuma tabela tem dados (usado antes da migração dos arquivos)"""
+        conn = self._connect()
+        for tabela in ('manutencao', 'comparacoes', 'estado_pecas'):
+            if conn.execute(f'SELECT 1 FROM {tabela} LIMIT 1').fetchone():
+                return False
+        return True
+
+    # Métodos para Manutenção
+    def add_maintenance_records(self, records):
+        """Insere registros de manutenção já validados em uma única transação"""
+        linhas = [
+            (r['peca'], r['tipo_manutencao'], float(r['custo']), r['timestamp'], json.dumps(r, ensure_ascii=False))
+            for r in records
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT INTO manutencao (peca, tipo_manutencao, custo, timestamp, dados) VALUES (?, ?, ?, ?, ?)',
+                linhas
+            )
+
+    def add_maintenance_record(self, record):
+        """Insere um registro de manutenção já validado"""
+        self.add_maintenance_records([record])
+
+    def get_maintenance_history(self):
+        """Retorna todo o histórico de manutenção na ordem de inserção"""
+        cursor = self._connect().execute('SELECT dados FROM manutencao ORDER BY id')
+        return [json.loads(dados) for (dados,) in cursor]
+
+    def query_maintenance(self, peca=None, tipo_manutencao=None, start=None, end=None,
+                          order_by='timestamp', descending=False, limit=None, offset=0):
+        """Consulta filtrada e paginada pelos índices do banco; retorna (registros, total)"""
+        condicoes, parametros = [], []
+        if peca is not None:
+            condicoes.append('peca = ?')
+            parametros.append(peca)
+        if tipo_manutencao is not None:
+            condicoes.append('tipo_manutencao = ?')
+            parametros.append(tipo_manutencao)
+        inicio, fim, fim_inclusivo = time_bounds(start, end)
+        if inicio is not None:
+            condicoes.append('timestamp >= ?')
+            parametros.append(inicio.isoformat())
+        if fim is not None:
+            condicoes.append('timestamp <= ?' if fim_inclusivo else 'timestamp < ?')
+            parametros.append(fim.isoformat())
+        where = ' WHERE ' + ' AND '.join(condicoes) if condicoes else ''
+
+        conn = self._connect()
+        total = conn.execute(f'SELECT COUNT(*) FROM manutencao{where}', parametros).fetchone()[0]
+        # order_by já foi validado pelo DataManager contra SORT_COLUMNS
+        direcao = 'DESC' if descending else 'ASC'
+        cursor = conn.execute(
+            f'SELECT dados FROM manutencao{where} ORDER BY {order_by} {direcao}, id {direcao} LIMIT ? OFFSET ?',
+            parametros + [-1 if limit is None else limit, offset]
+        )
+        return [json.loads(dados) for (dados,) in cursor], total
+
+    def maintenance_analytics(self):
+        """Retorna os agregados de custo lidos das tabelas de resumo (O(número de grupos))"""
+        conn = self._connect()
+        linhas = [conn.execute(f'SELECT chave, custo, registros FROM {tabela}').fetchall() for tabela in self.SUMMARY_TABLES]
+        return MaintenanceAnalytics.from_aggregates(*linhas)
+
+    def maintenance_columns(self):
+        """Retorna o histórico em colunas, em ordem de timestamp, sem decodificar o JSON de cada registro"""
+        cursor = self._connect().execute(
+            "SELECT peca, tipo_manutencao, json_extract(dados, '$.descricao'), custo, timestamp "
+            'FROM manutencao ORDER BY timestamp, id'
+        )
+        return RecordColumns.from_rows(MaintenanceRecord, cursor)
+
+    def maintenance_values(self, coluna):
+        """Retorna os valores distintos de 'peca' ou 'tipo_manutencao' (pelo índice da coluna)"""
+        cursor = self._connect().execute(f'SELECT DISTINCT {coluna} FROM manutencao ORDER BY {coluna}')
+        return [valor for (valor,) in cursor]
+
+    # Métodos para Histórico de Comparações
+    def add_comparisons(self, comparacoes):
+        """Insere comparações (data, item1, item2, diferenca) em uma única transação"""
+        linhas = [(pd.Timestamp(data).isoformat(), str(i1), str(i2), float(d)) for data, i1, i2, d in comparacoes]
+        with self._connect() as conn:
+            conn.executemany('INSERT INTO comparacoes (data, item1, item2, diferenca) VALUES (?, ?, ?, ?)', linhas)
+
+    def add_comparison(self, data, item1, item2, diferenca):
+        """Insere uma comparação"""
+        self.add_comparisons([(data, item1, item2, diferenca)])
+
+    def get_comparison_history(self):
+        """Retorna todo o histórico de comparações com os mesmos tipos do arquivo CSV"""
+        df = pd.read_sql_query('SELECT data, item1, item2, diferenca FROM comparacoes ORDER BY id', self._connect())
+        if df.empty:
+            return _empty_comparisons()
+        df['data'] = pd.to_datetime(df['data'])
+        df['diferenca'] = df['diferenca'].astype('float64')
+        return df
+
+    # Métodos para Estado das Peças
+    def update_part_statuses(self, estados):
+        """Registra mudanças de status (part_id, status, ultima_atualizacao) e atualiza o estado atual"""
+        estados = list(estados)
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT INTO historico_estado (part_id, status, timestamp) VALUES (?, ?, ?)', estados
+            )
+            conn.executemany(
+                'INSERT INTO estado_pecas (part_id, status, ultima_atualizacao) VALUES (?, ?, ?) '
+                'ON CONFLICT(part_id) DO UPDATE SET status = excluded.status, '
+                'ultima_atualizacao = excluded.ultima_atualizacao',
+                estados
+            )
+
+    def update_part_status(self, part_id, status, ultima_atualizacao):
+        """Grava o estado atual de uma peça"""
+        self.update_part_statuses([(part_id, status, ultima_atualizacao)])
+
+    def get_part_status(self, part_id=None):
+        """Retorna o status de uma peça específica (busca pela chave primária) ou de todas as peças"""
+        conn = self._connect()
+        if part_id:
+            linha = conn.execute(
+                'SELECT status, ultima_atualizacao FROM estado_pecas WHERE part_id = ?', (part_id,)
+            ).fetchone()
+            return None if linha is None else {'status': linha[0], 'ultima_atualizacao': linha[1]}
+        cursor = conn.execute('SELECT part_id, status, ultima_atualizacao FROM estado_pecas ORDER BY rowid')
+        return {pid: {'status': status, 'ultima_atualizacao': ts} for pid, status, ts in cursor}
+
+    def part_events(self, part_id):
+        """Retorna as mudanças de status da peça como (status, ultima_atualizacao), pelo índice da peça"""
+        cursor = self._connect().execute(
+            'SELECT status, timestamp FROM historico_estado WHERE part_id = ? ORDER BY timestamp, id', (part_id,)
+        )
+        return cursor.fetchall()
+
+    def part_status_at(self, part_id, when):
+        """Retorna o status da peça na data informada, por busca no índice (peça, data)"""
+        linha = self._connect().execute(
+            'SELECT status FROM historico_estado WHERE part_id = ? AND timestamp <= ? '
+            'ORDER BY timestamp DESC, id DESC LIMIT 1',
+            (part_id, iso_timestamp(when))
+        ).fetchone()
+        return None if linha is None else linha[0]
+
+
+class JournalStorage:
+    """Backend do DataManager em diário JSON Lines somente de acréscimo, com compactação periódica
+
+    Cada gravação acrescenta uma linha (evento) ao fim de data/manutencao.jsonl e faz fsync,
+    sem regravar o histórico. Acima de COMPACT_THRESHOLD eventos o diário é compactado, em
+    segundo plano, no retrato data/manutencao_snapshot.json. O estado é o retrato mais os
+    eventos ainda não compactados.
+    """
+
+    def __init__(self, data_dir='data', compact_threshold=COMPACT_THRESHOLD):
+        self.data_dir = data_dir
+        self.journal_file = os.path.join(data_dir, 'manutencao.jsonl')
+        self.compacting_file = os.path.join(data_dir, 'manutencao.compacting.jsonl')
+        self.snapshot_file = os.path.join(data_dir, 'manutencao_snapshot.json')
+        self.compact_threshold = compact_threshold
+        self._files = (self.snapshot_file, self.compacting_file, self.journal_file)
+        # Estado reconstruído, reaproveitado enquanto os arquivos não mudam e atualizado a cada acréscimo
+        self.cache = ReadCache()
+        # Visões derivadas do estado, também mantidas a cada acréscimo: nome -> (montar, aplicar evento)
+        self._derived = {
+            'analise': (lambda estado: MaintenanceAnalytics.from_records(estado['manutencao']), self._apply_analytics),
+            'historico': (lambda estado: PartStatusLog.from_events(estado['historico_estado']), self._apply_status_log),
+        }
+        # Trava entre threads e processos para acréscimos, leituras e compactação
+        self._lock = file_lock(self.journal_file)
+        # Evita mais de uma compactação em segundo plano ao mesmo tempo no processo
+        self._compact_lock = threading.Lock()
+        os.makedirs(data_dir, exist_ok=True)
+        self._pendentes = self._count_events(self.journal_file)
+
+    @staticmethod
+    def _count_events(arquivo):
+        """Conta as linhas de um arquivo do diário"""
+        if not os.path.exists(arquivo):
+            return 0
+        with open(arquivo, 'rb') as f:
+            return sum(1 for _ in f)
+
+    def _append(self, eventos):
+        """Acrescenta eventos ao diário com uma única escrita seguida de fsync"""
+        eventos = [dict(evento, id=uuid.uuid4().hex) for evento in eventos]
+        if not eventos:
+            return
+        with self._lock:
+            antes = file_signature(*self._files)
+            append_jsonl(self.journal_file, eventos)
+            # Se o estado e as visões em cache estavam em dia, aplica só os novos eventos em vez de reler tudo
+            aplicadores = {'estado': self._apply}
+            aplicadores.update((nome, aplicar) for nome, (_, aplicar) in self._derived.items())
+            for nome, aplicar in aplicadores.items():
+                valor = self.cache.lookup(nome, antes)
+                if valor is not None:
+                    for evento in eventos:
+                        aplicar(valor, evento)
+                    self.cache.put(nome, self._files, valor)
+            self._pendentes += len(eventos)
+            compactar = self._pendentes >= self.compact_threshold
+        if compactar and self._compact_lock.acquire(blocking=False):
+            threading.Thread(target=self._compact_in_background, daemon=True).start()
+
+    def _compact_in_background(self):
+        """Executa a compactação na thread de fundo, liberando a trava ao final"""
+        try:
+            self._compact()
+        finally:
+            self._compact_lock.release()
+
+    def _load_snapshot(self):
+        """Carrega o retrato compactado (ou um estado vazio)"""
+        if not os.path.exists(self.snapshot_file):
+            return {'lote': None, 'manutencao': [], 'comparacoes': [], 'estado_pecas': {}, 'historico_estado': []}
+        with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+            estado = json.load(f)
+        if 'historico_estado' not in estado:
+            # Retrato anterior ao histórico: o status atual vira o primeiro evento de cada peça
+            estado['historico_estado'] = [
+                [part_id, e['status'], e['ultima_atualizacao']] for part_id, e in estado['estado_pecas'].items()
+            ]
+        return estado
+
+    @staticmethod
+    def _apply(estado, evento):
+        """Aplica um evento do diário ao estado"""
+        if evento['evento'] == 'manutencao':
+            estado['manutencao'].append(evento['registro'])
+        elif evento['evento'] == 'comparacao':
+            estado['comparacoes'].append([evento['data'], evento['item1'], evento['item2'], evento['diferenca']])
+        elif evento['evento'] == 'estado':
+            estado['estado_pecas'][evento['part_id']] = {
+                'status': evento['status'],
+                'ultima_atualizacao': evento['ultima_atualizacao']
+            }
+            estado['historico_estado'].append([evento['part_id'], evento['status'], evento['ultima_atualizacao']])
+
+    @staticmethod
+    def _apply_analytics(analise, evento):
+        """Aplica um evento do diário aos agregados de custo"""
+        if evento['evento'] == 'manutencao':
+            analise.add(evento['registro'])
+
+    @staticmethod
+    def _apply_status_log(log, evento):
+        """Aplica um evento do diário ao histórico de status das peças"""
+        if evento['evento'] == 'estado':
+            log.add(evento['part_id'], evento['status'], evento['ultima_atualizacao'])
+
+    def _rebuild(self):
+        """Reconstrói o estado a partir do retrato e dos eventos ainda não compactados"""
+        estado = self._load_snapshot()
+        rotacionados = read_jsonl(self.compacting_file)
+        eventos = read_jsonl(self.journal_file)
+        # Se o retrato já inclui o diário rotacionado (queda antes de apagá-lo), ele é ignorado
+        if rotacionados and rotacionados[0]['id'] == estado['lote']:
+            rotacionados = []
+        for evento in rotacionados + eventos:
+            self._apply(estado, evento)
+        return estado
+
+    def _state(self, parte):
+        """Retorna uma cópia de uma parte do estado ('manutencao', 'comparacoes' ou 'estado_pecas')"""
+        with self._lock:
+            return self.cache.get('estado', self._files, self._rebuild)[parte].copy()
+
+    def _view(self, nome):
+        """Retorna uma visão derivada do estado ('analise' ou 'historico'); chamar com a trava"""
+        montar, _ = self._derived[nome]
+        return self.cache.get(nome, self._files, lambda: montar(self.cache.get('estado', self._files, self._rebuild)))
+
+    def _compact(self):
+        """Grava atomicamente o retrato com os eventos do diário rotacionado e o apaga"""
+        with self._lock:
+            antes = file_signature(*self._files)
+            em_dia = {nome: self.cache.lookup(nome, antes) for nome in ['estado', *self._derived]}
+            if os.path.exists(self.journal_file) and not os.path.exists(self.compacting_file):
+                # Novos eventos passam a ir para um diário novo
+                os.replace(self.journal_file, self.compacting_file)
+            self._pendentes = 0
+            rotacionados = read_jsonl(self.compacting_file)
+            estado = self._load_snapshot()
+            if rotacionados and rotacionados[0]['id'] != estado['lote']:
+                for evento in rotacionados:
+                    self._apply(estado, evento)
+                estado['lote'] = rotacionados[0]['id']
+                tmp_file = self.snapshot_file + '.tmp'
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(estado, f, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.snapshot_file)
+            if os.path.exists(self.compacting_file):
+                os.remove(self.compacting_file)
+            # A compactação não muda o estado, só os arquivos
+            for nome, valor in em_dia.items():
+                if valor is not None:
+                    self.cache.put(nome, self._files, valor)
+
+    def compact(self):
+        """Compacta o diário no retrato, aguardando uma compactação em andamento"""
+        with self._compact_lock:
+            self._compact()
+
+    def is_empty(self):
+        """Indica se ainda não há nenhum dado gravado"""
+        return not (self._state('manutencao') or self._state('comparacoes') or self._state('estado_pecas'))
+
+    # Métodos para Manutenção
+    def add_maintenance_records(self, records):
+        """Acrescenta registros de manutenção já validados ao diário"""
+        self._append({'evento': 'manutencao', 'registro': r} for r in records)
+
+    def add_maintenance_record(self, record):
+        """Acrescenta um registro de manutenção já validado ao diário"""
+        self.add_maintenance_records([record])
+
+    def get_maintenance_history(self):
+        """Retorna todo o histórico de manutenção na ordem de inserção"""
+        return self._state('manutencao')
+
+    def maintenance_analytics(self):
+        """Retorna uma cópia dos agregados de custo, mantidos a cada novo registro"""
+        with self._lock:
+            return self._view('analise').copy()
+
+    def maintenance_index(self):
+        """Retorna o índice de consulta do histórico, reconstruído só quando o diário muda"""
+        with self._lock:
+            return self.cache.get(
+                'indice', self._files,
+                lambda: MaintenanceIndex(self.cache.get('estado', self._files, self._rebuild)['manutencao'])
+            )
+
+    # Métodos para Histórico de Comparações
+    def add_comparisons(self, comparacoes):
+        """Acrescenta comparações (data, item1, item2, diferenca) ao diário"""
+        self._append(
+            {'evento': 'comparacao', 'data': pd.Timestamp(data).isoformat(),
+             'item1': str(i1), 'item2': str(i2), 'diferenca': float(d)}
+            for data, i1, i2, d in comparacoes
+        )
+
+    def add_comparison(self, data, item1, item2, diferenca):
+        """Acrescenta uma comparação ao diário"""
+        self.add_comparisons([(data, item1, item2, diferenca)])
+
+    def get_comparison_history(self):
+        """Retorna todo o histórico de comparações com os mesmos tipos do arquivo CSV"""
+        comparacoes = self._state('comparacoes')
+        if not comparacoes:
+            return _empty_comparisons()
+        df = pd.DataFrame(comparacoes, columns=['data', 'item1', 'item2', 'diferenca'])
+        df['data'] = pd.to_datetime(df['data'])
+        df['diferenca'] = df['diferenca'].astype('float64')
+        return df
+
+    # Métodos para Estado das Peças
+    def update_part_statuses(self, estados):
+        """Acrescenta ao diário o novo estado de várias peças (part_id, status, ultima_atualizacao)"""
+        self._append(
+            {'evento': 'estado', 'part_id': part_id, 'status': status, 'ultima_atualizacao': ts}
+            for part_id, status, ts in estados
+        )
+
+    def update_part_status(self, part_id, status, ultima_atualizacao):
+        """Acrescenta ao diário o novo estado de uma peça"""
+        self.update_part_statuses([(part_id, status, ultima_atualizacao)])
+
+    def get_part_status(self, part_id=None):
+        """Retorna o status de uma peça específica ou de todas as peças"""
+        estados = self._state('estado_pecas')
+        if part_id:
+            estado = estados.get(part_id)
+            return dict(estado) if estado is not None else None
+        return estados
+
+    def part_events(self, part_id):
+        """Retorna as mudanças de status da peça como (status, ultima_atualizacao)"""
+        with self._lock:
+            return self._view('historico').events(part_id)
+
+    def part_status_at(self, part_id, when):
+        """Retorna o status da peça na data informada, por busca binária no histórico da peça"""
+        with self._lock:
+            return self._view('historico').status_at(part_id, when)
+
+
+# Backends disponíveis; "json" mantém os arquivos JSON/CSV originais do DataManager
+STORAGE_BACKENDS = {
+    'json': None,
+    'sqlite': lambda data_dir: SQLiteStorage(os.path.join(data_dir, 'manutencao.db')),
+    'jsonl': JournalStorage,
+}
+
+
+def open_storage(kind='json', data_dir='data'):
+    """Cria o backend de armazenamento pelo nome ('json', 'sqlite' ou 'jsonl')"""
+    if kind not in STORAGE_BACKENDS:
+        raise ValueError(f"Backend de armazenamento desconhecido: '{kind}'")
+    fabrica = STORAGE_BACKENDS[kind]
+    return None if fabrica is None else fabrica(data_dir)
@@ -0,0 +1,103 @@
+import unittest
+import io
+import threading
+import pandas as pd
+from matplotlib.figure import Figure
+from PIL import Image
+from figure_cache import MAX_IMAGE_WIDTH, FigureCache, render_figure
+from sales_charts import frequency_scatter
+
+def small_figure():
+    """Figura simples usada nos testes do cache"""
+    fig = Figure(figsize=(2, 2))
+    fig.subplots().plot([1, 2, 3])
+    return fig
+
+class TestFigureCache(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.cache = FigureCache(max_entries=2)
+        self.desenhos = 0
+
+    def draw(self):
+        """Conta quantas vezes a figura foi desenhada"""
+        self.desenhos += 1
+        return small_figure()
+
+    def test_render_memoized(self):
+        """Testa que a mesma chave é desenhada uma única vez"""
+        primeira = self.cache.render(('v1', 'a'), self.draw)
+        segunda = self.cache.render(('v1', 'a'), self.draw)
+
+        self.assertEqual(self.desenhos, 1)
+        self.assertEqual(primeira, segunda)
+        self.assertTrue(primeira.startswith(b'\x89PNG'))
+
+    def test_lru_eviction(self):
+        """Testa o descarte da imagem usada há mais tempo"""
+        self.cache.put('a', b'1')
+        self.cache.put('b', b'2')
+        self.cache.get('a')
+        self.cache.put('c', b'3')
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.get('a'), b'1')
+        self.assertIsNone(self.cache.get('b'))
+
+    def test_submit_in_background(self):
+        """Testa o desenho em segundo plano, com pedidos repetidos reaproveitando o mesmo desenho"""
+        liberar = threading.Event()
+
+        def desenhar_lento():
+            liberar.wait(5)
+            return self.draw()
+
+        primeiro = self.cache.submit('a', desenhar_lento)
+        segundo = self.cache.submit('a', desenhar_lento)
+        self.assertIs(primeiro, segundo)
+        self.assertFalse(primeiro.done())
+
+        liberar.set()
+        imagem = primeiro.result(timeout=10)
+        self.assertEqual(self.desenhos, 1)
+        self.assertEqual(self.cache.get('a'), imagem)
+        self.assertTrue(self.cache.submit('a', desenhar_lento).done())
+
+    def test_submit_error(self):
+        """Testa que um erro no desenho chega ao script e não fica guardado no cache"""
+        def desenhar_com_erro():
+            raise ValueError('erro')
+
+        with self.assertRaises(ValueError):
+            self.cache.submit('a', desenhar_com_erro).result(timeout=10)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.render('a', self.draw)[:4], b'\x89PNG')
+
+    def test_render_figure(self):
+        """Testa a largura máxima do PNG e a gravação em SVG"""
+        fig = Figure(figsize=(12, 8))
+        fig.subplots().plot([1, 2, 3])
+
+        png = render_figure(fig)
+        svg = render_figure(small_figure(), formato='svg')
+
+        self.assertEqual(Image.open(io.BytesIO(png)).width, MAX_IMAGE_WIDTH)
+        self.assertIn(b'<svg', svg)
+
+    def test_frequency_scatter(self):
+        """Testa a dispersão do bloco "Atributos por Frequência" desenhada sem o pyplot"""
+        df = pd.DataFrame({
+            'RAZÃO SOCIAL CLIENTE': pd.Categorical(['CLIENTE COM NOME MUITO LONGO LTDA', 'BETA']),
+            'DESCRIÇÃO MATERIAL': pd.Categorical(['BOD 14', 'KIT']),
+            'VALOR TOTAL': [10.0, 20.0],
+        })
+
+        fig = frequency_scatter(df, 'RAZÃO SOCIAL CLIENTE', 'VALOR TOTAL')
+
+        ax = fig.axes[0]
+        self.assertEqual(ax.get_title(), 'Visualização das 5 Principais Categorias de Material')
+        self.assertEqual(ax.get_legend().get_title().get_text(), 'Descrição Material')
+        self.assertTrue(all(len(label.get_text()) <= 18 for label in ax.get_xticklabels()))
+
+if __name__ == '__main__':
+    unittest.main()
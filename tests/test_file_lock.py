@@ -0,0 +1,91 @@
+import unittest
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from data_manager import DataManager
+from file_lock import file_lock
+from storage import JournalStorage
+
+class TestFileLock(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_lock_data'
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        self.data_manager = DataManager()
+        self.data_manager.maintenance_file = os.path.join(self.test_data_dir, 'maintenance.json')
+        self.data_manager.comparison_file = os.path.join(self.test_data_dir, 'comparison_history.csv')
+        self.data_manager.parts_status_file = os.path.join(self.test_data_dir, 'parts_status.json')
+        self.data_manager._initialize_files()
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        shutil.rmtree(self.test_data_dir)
+
+    def test_same_lock_per_file(self):
+        """Testa que o mesmo arquivo compartilha uma única trava no processo"""
+        arquivo = os.path.join(self.test_data_dir, 'dados.json')
+        self.assertIs(file_lock(arquivo), file_lock(os.path.abspath(arquivo)))
+
+    def test_reentrant(self):
+        """Testa que a mesma thread pode adquirir a trava de novo sem travar"""
+        trava = file_lock(os.path.join(self.test_data_dir, 'dados.json'))
+        with trava:
+            with trava:
+                pass
+        self.assertTrue(os.path.exists(trava.path))
+
+    def test_mutual_exclusion(self):
+        """Testa que outra thread espera a liberação da trava"""
+        trava = file_lock(os.path.join(self.test_data_dir, 'dados.json'))
+        eventos = []
+
+        def adquirir():
+            with trava:
+                eventos.append('outra')
+
+        with trava:
+            outra = threading.Thread(target=adquirir)
+            outra.start()
+            outra.join(timeout=0.2)
+            eventos.append('primeira')
+        outra.join()
+        self.assertEqual(eventos, ['primeira', 'outra'])
+
+    def test_concurrent_writers(self):
+        """Testa que gravações simultâneas de várias sessões não se perdem"""
+        def gravar(trabalhador):
+            for i in range(10):
+                self.data_manager.add_maintenance_record({
+                    "peca": f"Peca {trabalhador}",
+                    "tipo_manutencao": "Preventiva",
+                    "descricao": f"operacao {i}",
+                    "custo": float(i)
+                })
+                self.data_manager.add_comparison(f"T{trabalhador}", f"op{i}", float(i))
+                self.data_manager.update_part_status(f"P{trabalhador}", f"Status {i}")
+
+        with ThreadPoolExecutor(6) as executor:
+            list(executor.map(gravar, range(6)))
+
+        self.assertEqual(len(self.data_manager.get_maintenance_history()), 60)
+        self.assertEqual(len(self.data_manager.get_comparison_history()), 60)
+        self.assertEqual(len(self.data_manager.get_part_status()), 6)
+
+    def test_concurrent_journal_compaction(self):
+        """Testa que acréscimos simultâneos à compactação do diário não se perdem"""
+        storage = JournalStorage(self.test_data_dir, compact_threshold=7)
+        data_manager = DataManager(storage=storage)
+
+        def gravar(trabalhador):
+            for i in range(10):
+                data_manager.update_part_status(f"P{trabalhador}-{i}", "Novo")
+
+        with ThreadPoolExecutor(6) as executor:
+            list(executor.map(gravar, range(6)))
+        storage.compact()
+
+        self.assertEqual(len(data_manager.get_part_status()), 60)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import os
+import shutil
+import sqlite3
+from data_manager import DataManager
+from maintenance_analytics import MaintenanceAnalytics
+from storage import JournalStorage, SQLiteStorage
+
+class TestMaintenanceAnalytics(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_analytics_data'
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        arquivos = DataManager()
+        arquivos.maintenance_file = os.path.join(self.test_data_dir, 'maintenance.json')
+        arquivos.comparison_file = os.path.join(self.test_data_dir, 'comparison_history.csv')
+        arquivos.parts_status_file = os.path.join(self.test_data_dir, 'parts_status.json')
+        arquivos._initialize_files()
+        self.sqlite = SQLiteStorage(os.path.join(self.test_data_dir, 'manutencao.db'))
+        self.managers = {
+            'json': arquivos,
+            'sqlite': DataManager(storage=self.sqlite),
+            'jsonl': DataManager(storage=JournalStorage(os.path.join(self.test_data_dir, 'diario'))),
+        }
+        self.registros_manutencao = [
+            {"peca": "Motor", "tipo_manutencao": "Preventiva", "descricao": "Troca de óleo", "custo": 150.0},
+            {"peca": "Motor", "tipo_manutencao": "Corretiva", "descricao": "Reparo no pistão", "custo": 500.0},
+            {"peca": "Freios", "tipo_manutencao": "Preventiva", "descricao": "Troca de pastilhas", "custo": 200.0},
+        ]
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        self.sqlite.close()
+        shutil.rmtree(self.test_data_dir)
+
+    def add_records(self, manager):
+        """Grava os registros de teste no gerenciador"""
+        for registro in self.registros_manutencao:
+            manager.add_maintenance_record(dict(registro))
+
+    def test_aggregates(self):
+        """Testa custo por peça, frequência e média por tipo em todos os backends"""
+        for nome, manager in self.managers.items():
+            with self.subTest(backend=nome):
+                self.add_records(manager)
+                analise = manager.get_maintenance_analytics()
+
+                self.assertEqual(analise.by_part()['custo']['Motor'], 650.0)
+                self.assertEqual(analise.by_part()['custo']['Freios'], 200.0)
+                self.assertEqual(analise.by_type()['registros']['Preventiva'], 2)
+                self.assertEqual(analise.by_type()['custo_medio']['Preventiva'], 175.0)
+                self.assertEqual(analise.by_type()['custo_medio']['Corretiva'], 500.0)
+                self.assertEqual(analise.summary()['custo'], 850.0)
+                self.assertEqual(analise.by_month()['registros'].sum(), 3)
+
+    def test_matches_full_recalculation(self):
+        """Testa que os agregados incrementais batem com o recálculo sobre o histórico"""
+        for nome, manager in self.managers.items():
+            with self.subTest(backend=nome):
+                manager.get_maintenance_analytics()
+                self.add_records(manager)
+
+                incremental = manager.get_maintenance_analytics()
+                completo = MaintenanceAnalytics.from_records(manager.get_maintenance_history())
+
+                self.assertEqual(incremental.by_part().to_dict(), completo.by_part().to_dict())
+                self.assertEqual(incremental.by_month().to_dict(), completo.by_month().to_dict())
+
+    def test_incremental_without_rereading(self):
+        """Testa que novos registros atualizam os agregados sem reler o histórico"""
+        manager = self.managers['json']
+        manager.get_maintenance_analytics()
+        faltas = manager.cache_stats()['misses']
+
+        self.add_records(manager)
+        manager.get_maintenance_analytics()
+
+        self.assertEqual(manager.cache_stats()['misses'], faltas)
+
+    def test_returned_copy(self):
+        """Testa que os agregados retornados não mudam com gravações posteriores"""
+        manager = self.managers['json']
+        analise = manager.get_maintenance_analytics()
+        self.add_records(manager)
+
+        self.assertEqual(analise.summary()['registros'], 0)
+
+    def test_sqlite_summaries_backfilled(self):
+        """Testa que um banco sem as tabelas de resumo tem os agregados recalculados ao abrir"""
+        self.add_records(self.managers['sqlite'])
+        conn = sqlite3.connect(self.sqlite.db_file)
+        conn.executescript('DROP TRIGGER resumo_manutencao; DROP TABLE resumo_peca; DROP TABLE resumo_tipo; DROP TABLE resumo_mes;')
+        conn.close()
+
+        reaberto = SQLiteStorage(self.sqlite.db_file)
+        analise = reaberto.maintenance_analytics()
+        reaberto.close()
+
+        self.assertEqual(analise.by_part()['custo']['Motor'], 650.0)
+        self.assertEqual(analise.summary()['registros'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import os
+import shutil
+from datetime import date
+from data_manager import DataManager
+from storage import JournalStorage, SQLiteStorage
+
+class TestMaintenanceQuery(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_query_data'
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        arquivos = DataManager()
+        arquivos.maintenance_file = os.path.join(self.test_data_dir, 'maintenance.json')
+        arquivos.comparison_file = os.path.join(self.test_data_dir, 'comparison_history.csv')
+        arquivos.parts_status_file = os.path.join(self.test_data_dir, 'parts_status.json')
+        arquivos._initialize_files()
+
+        # Histórico com timestamps conhecidos, gravado direto no arquivo
+        registros = [
+            {"peca": "Motor", "tipo_manutencao": "Preventiva", "descricao": "Troca de óleo",
+             "custo": 150.0, "timestamp": "2024-01-10T08:00:00"},
+            {"peca": "Freios", "tipo_manutencao": "Corretiva", "descricao": "Pastilhas",
+             "custo": 200.0, "timestamp": "2024-02-05T09:30:00.250000"},
+            {"peca": "Motor", "tipo_manutencao": "Corretiva", "descricao": "Pistão",
+             "custo": 500.0, "timestamp": "2024-02-20T14:00:00"},
+            {"peca": "Motor", "tipo_manutencao": "Preventiva", "descricao": "Filtro",
+             "custo": 80.0, "timestamp": "2024-03-01T10:00:00"},
+            {"peca": "Suspensão", "tipo_manutencao": "Preditiva", "descricao": "Análise",
+             "custo": 120.0, "timestamp": "2024-01-15T11:00:00"},
+        ]
+        arquivos._save_json(arquivos.maintenance_file, registros)
+
+        sqlite = SQLiteStorage(os.path.join(self.test_data_dir, 'manutencao.db'))
+        journal = JournalStorage(os.path.join(self.test_data_dir, 'diario'))
+        arquivos.migrate_to(sqlite)
+        arquivos.migrate_to(journal)
+        self.sqlite = sqlite
+        self.managers = {
+            'json': arquivos,
+            'sqlite': DataManager(storage=sqlite),
+            'jsonl': DataManager(storage=journal),
+        }
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        self.sqlite.close()
+        shutil.rmtree(self.test_data_dir)
+
+    def assertQuery(self, esperado, total, **filtros):
+        """Confere a mesma consulta em todos os backends"""
+        for nome, manager in self.managers.items():
+            with self.subTest(backend=nome):
+                registros, encontrados = manager.query_maintenance(**filtros)
+                self.assertEqual([r["descricao"] for r in registros], esperado)
+                self.assertEqual(encontrados, total)
+
+    def test_default_order(self):
+        """Testa a ordenação padrão por data"""
+        self.assertQuery(["Troca de óleo", "Análise", "Pastilhas", "Pistão", "Filtro"], 5)
+
+    def test_filters(self):
+        """Testa os filtros por peça e tipo de manutenção combinados"""
+        self.assertQuery(["Troca de óleo", "Pistão", "Filtro"], 3, peca="Motor")
+        self.assertQuery(["Troca de óleo", "Filtro"], 2, peca="Motor", tipo_manutencao="Preventiva")
+        self.assertQuery([], 0, peca="Inexistente")
+
+    def test_date_range(self):
+        """Testa o filtro por período, incluindo o dia final inteiro"""
+        self.assertQuery(["Pastilhas", "Pistão"], 2, start=date(2024, 2, 1), end=date(2024, 2, 20))
+        self.assertQuery(["Análise", "Pastilhas"], 2, start="2024-01-15T11:00:00", end="2024-02-05T09:30:00.250000")
+
+    def test_sort_and_pages(self):
+        """Testa a ordenação por custo e a paginação com limite e deslocamento"""
+        self.assertQuery(["Pistão", "Pastilhas"], 5, order_by="custo", descending=True, limit=2)
+        self.assertQuery(["Troca de óleo", "Análise"], 5, order_by="custo", descending=True, limit=2, offset=2)
+        self.assertQuery(["Filtro"], 3, peca="Motor", descending=True, limit=1)
+
+    def test_distinct_values(self):
+        """Testa a lista de peças e tipos usada nos filtros da página"""
+        for nome, manager in self.managers.items():
+            with self.subTest(backend=nome):
+                self.assertEqual(manager.get_maintenance_values("peca"), ["Freios", "Motor", "Suspensão"])
+
+    def test_index_follows_writes(self):
+        """Testa que o índice acompanha os registros adicionados depois da primeira consulta"""
+        for nome, manager in self.managers.items():
+            with self.subTest(backend=nome):
+                manager.query_maintenance(peca="Freios")
+                manager.add_maintenance_record({
+                    "peca": "Freios", "tipo_manutencao": "Preventiva", "descricao": "Fluido", "custo": 60.0
+                })
+                registros, total = manager.query_maintenance(peca="Freios", descending=True)
+                self.assertEqual(total, 2)
+                self.assertEqual(registros[0]["descricao"], "Fluido")
+
+    def test_invalid_arguments(self):
+        """Testa a validação da ordenação e da paginação"""
+        manager = self.managers['json']
+        with self.assertRaises(ValueError):
+            manager.query_maintenance(order_by="descricao; DROP TABLE manutencao")
+        with self.assertRaises(ValueError):
+            manager.query_maintenance(offset=-1)
+
+if __name__ == '__main__':
+    unittest.main()
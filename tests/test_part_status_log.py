@@ -0,0 +1,105 @@
+import unittest
+import json
+import os
+import shutil
+from datetime import datetime
+import pandas as pd
+from data_manager import DataManager
+from part_status_log import PartStatusLog, build_timeline, status_durations
+from storage import JournalStorage, SQLiteStorage
+
+class TestPartStatusLog(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_status_data'
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        arquivos = DataManager()
+        arquivos.maintenance_file = os.path.join(self.test_data_dir, 'maintenance.json')
+        arquivos.comparison_file = os.path.join(self.test_data_dir, 'comparison_history.csv')
+        arquivos.parts_status_file = os.path.join(self.test_data_dir, 'parts_status.json')
+        arquivos._initialize_files()
+        self.arquivos = arquivos
+        self.sqlite = SQLiteStorage(os.path.join(self.test_data_dir, 'manutencao.db'))
+        self.managers = {
+            'json': arquivos,
+            'sqlite': DataManager(storage=self.sqlite),
+            'jsonl': DataManager(storage=JournalStorage(os.path.join(self.test_data_dir, 'diario'))),
+        }
+        self.eventos = [
+            ("MOTOR001", "Novo", "2024-01-01T08:00:00"),
+            ("MOTOR001", "Em Uso", "2024-01-02T08:00:00"),
+            ("MOTOR001", "Em Manutenção", "2024-01-10T08:00:00"),
+            ("MOTOR001", "Em Uso", "2024-01-12T20:00:00"),
+            ("MOTOR002", "Novo", "2024-01-05T09:00:00"),
+        ]
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        self.sqlite.close()
+        shutil.rmtree(self.test_data_dir)
+
+    def test_status_at(self):
+        """Testa a busca do status vigente em uma data"""
+        log = PartStatusLog.from_events(self.eventos)
+
+        self.assertIsNone(log.status_at("MOTOR001", "2023-12-31"))
+        self.assertEqual(log.status_at("MOTOR001", "2024-01-01T08:00:00"), "Novo")
+        self.assertEqual(log.status_at("MOTOR001", datetime(2024, 1, 11)), "Em Manutenção")
+        self.assertEqual(log.status_at("MOTOR001", "2025-01-01"), "Em Uso")
+        self.assertIsNone(log.status_at("MOTOR999", "2025-01-01"))
+
+    def test_out_of_order_events(self):
+        """Testa que eventos fora de ordem cronológica são inseridos na posição certa"""
+        log = PartStatusLog.from_events(reversed(self.eventos))
+
+        self.assertEqual([s for s, _ in log.events("MOTOR001")], ["Novo", "Em Uso", "Em Manutenção", "Em Uso"])
+
+    def test_dwell_time(self):
+        """Testa a linha do tempo e o tempo total em cada status"""
+        log = PartStatusLog.from_events(self.eventos)
+        linha_do_tempo = build_timeline(log.events("MOTOR001"), until="2024-01-13T20:00:00")
+
+        duracoes = status_durations(linha_do_tempo)
+
+        self.assertEqual(len(linha_do_tempo), 4)
+        self.assertEqual(duracoes["Em Manutenção"], pd.Timedelta(days=2, hours=12))
+        self.assertEqual(duracoes["Em Uso"], pd.Timedelta(days=9))
+        self.assertTrue(build_timeline([]).empty)
+
+    def test_history_in_all_backends(self):
+        """Testa que todos os backends guardam o histórico e mantêm o status atual"""
+        for nome, manager in self.managers.items():
+            with self.subTest(backend=nome):
+                for status in ["Novo", "Em Uso", "Em Manutenção"]:
+                    manager.update_part_status("MOTOR001", status)
+
+                historico = manager.get_part_history("MOTOR001")
+                self.assertEqual(historico["status"].tolist(), ["Novo", "Em Uso", "Em Manutenção"])
+                self.assertEqual(manager.get_part_status("MOTOR001")["status"], "Em Manutenção")
+                self.assertEqual(manager.get_part_status_at("MOTOR001", datetime.now()), "Em Manutenção")
+                self.assertIsNone(manager.get_part_status_at("MOTOR001", "2000-01-01"))
+                self.assertEqual(set(manager.get_status_durations("MOTOR001").index),
+                                 {"Novo", "Em Uso", "Em Manutenção"})
+
+    def test_existing_status_without_history(self):
+        """Testa que peças gravadas antes do histórico aparecem com o status atual"""
+        with open(self.arquivos.parts_status_file, 'w', encoding='utf-8') as f:
+            json.dump({"MOTOR001": {"status": "Em Uso", "ultima_atualizacao": "2024-01-02T08:00:00"}}, f)
+
+        self.arquivos.update_part_status("MOTOR001", "Em Manutenção")
+
+        self.assertEqual(self.arquivos.get_part_history("MOTOR001")["status"].tolist(), ["Em Uso", "Em Manutenção"])
+        self.assertEqual(self.arquivos.get_part_status_at("MOTOR001", "2024-01-03"), "Em Uso")
+
+    def test_migration_keeps_history(self):
+        """Testa que a migração leva o histórico de status para o banco"""
+        self.arquivos.update_part_status("MOTOR001", "Novo")
+        self.arquivos.update_part_status("MOTOR001", "Em Uso")
+
+        self.arquivos.migrate_to(self.sqlite)
+
+        self.assertEqual(self.sqlite.part_events("MOTOR001"), self.arquivos._part_events("MOTOR001"))
+        self.assertEqual(self.managers['sqlite'].get_part_status(), self.arquivos.get_part_status())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import unittest
+import json
+import os
+import shutil
+import threading
+import time
+from unittest.mock import patch
+import altair as alt
+import pandas as pd
+import profiling
+from profiling import RunProfile, payload_size
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_profile_data'
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        self.log_file = os.path.join(self.test_data_dir, 'logs', 'profile.jsonl')
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        if os.path.exists(self.test_data_dir):
+            shutil.rmtree(self.test_data_dir)
+
+    def test_spans_aninhados(self):
+        """Testa a ordem, o nível de aninhamento e a duração das etapas"""
+        perfil = RunProfile("Main", enabled=True)
+        with perfil.span("carregar_base"):
+            with perfil.span("leitura") as etapa:
+                time.sleep(0.01)
+                etapa.record(linhas=10, bytes=100)
+        with perfil.span("kpis"):
+            pass
+
+        self.assertEqual([s.etapa for s in perfil.spans], ["carregar_base", "leitura", "kpis"])
+        self.assertEqual([s.nivel for s in perfil.spans], [0, 1, 0])
+        self.assertGreaterEqual(perfil.spans[1].ms, 10)
+        self.assertGreaterEqual(perfil.spans[0].ms, perfil.spans[1].ms)
+        self.assertLessEqual(perfil.spans[0].inicio, perfil.spans[1].inicio)
+
+        df = perfil.frame()
+        self.assertEqual(list(df.columns), profiling.SPAN_COLUMNS)
+        self.assertEqual(df["etapa"].tolist(), ["carregar_base", "  leitura", "kpis"])
+        self.assertEqual(df.loc[1, "linhas"], 10)
+
+    def test_span_com_erro(self):
+        """Testa que a etapa é fechada mesmo quando o bloco levanta exceção"""
+        perfil = RunProfile("Main", enabled=True)
+        with self.assertRaises(ValueError):
+            with perfil.span("falha"):
+                raise ValueError("erro")
+        with perfil.span("seguinte"):
+            pass
+        self.assertIsNotNone(perfil.spans[0].ms)
+        self.assertEqual(perfil.spans[1].nivel, 0)
+
+    def test_spans_em_threads(self):
+        """Testa que etapas medidas em outra thread (fragmento paralelo) têm o próprio aninhamento"""
+        perfil = RunProfile("Main", enabled=True)
+        dentro = threading.Event()
+        liberar = threading.Event()
+
+        def fragmento():
+            with perfil.span("atributos"):
+                with perfil.span("dispersao"):
+                    dentro.set()
+                    liberar.wait(5)
+
+        thread = threading.Thread(target=fragmento)
+        thread.start()
+        dentro.wait(5)
+        with perfil.span("kpis"):
+            pass
+        liberar.set()
+        thread.join(5)
+
+        niveis = {s.etapa: s.nivel for s in perfil.spans}
+        self.assertEqual(niveis, {"atributos": 0, "dispersao": 1, "kpis": 0})
+        self.assertTrue(all(s.ms is not None for s in perfil.spans))
+
+    def test_perfil_desligado(self):
+        """Testa que o perfil desligado só executa o bloco"""
+        perfil = RunProfile("Main")
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        with perfil.span("etapa") as etapa:
+            self.assertIs(etapa.measure(df), df)
+            etapa.record(linhas=3)
+        self.assertEqual(perfil.spans, [])
+        self.assertTrue(perfil.frame().empty)
+
+    def test_measure_e_tamanho(self):
+        """Testa a anotação de linhas e bytes de DataFrames, textos e gráficos"""
+        df = pd.DataFrame({"a": range(100)})
+        self.assertEqual(payload_size(df), int(df.memory_usage(index=True).sum()))
+        self.assertEqual(payload_size(b"abc"), 3)
+        self.assertIsNone(payload_size(object()))
+
+        class Grafico:
+            def to_json(self):
+                return '{"dados": [1, 2]}'
+
+        perfil = RunProfile("Main", enabled=True)
+        with perfil.span("grafico") as etapa:
+            self.assertIs(etapa.measure(df, payload=Grafico()), df)
+        self.assertEqual(perfil.spans[0].linhas, 100)
+        self.assertEqual(perfil.spans[0].bytes, len('{"dados": [1, 2]}'))
+
+    def test_tamanho_grafico_grande(self):
+        """Testa o tamanho de um gráfico do Altair acima do limite de linhas"""
+        df = pd.DataFrame({"a": range(6000)})
+        self.assertEqual(payload_size(alt.Chart(df).mark_point()), payload_size(df))
+
+    def test_gravacao_log(self):
+        """Testa a gravação das etapas em JSON Lines, uma linha por etapa e execução"""
+        for _ in range(2):
+            perfil = RunProfile("Manutenção", enabled=True, log_file=self.log_file)
+            with perfil.span("consulta_pagina") as etapa:
+                etapa.record(linhas=50)
+            perfil.write_log()
+
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            linhas = [json.loads(linha) for linha in f]
+        self.assertEqual(len(linhas), 2)
+        self.assertEqual(linhas[0]["pagina"], "Manutenção")
+        self.assertEqual(linhas[0]["etapa"], "consulta_pagina")
+        self.assertEqual(linhas[0]["linhas"], 50)
+        self.assertNotEqual(linhas[0]["execucao"], linhas[1]["execucao"])
+
+    def test_execucao_atual(self):
+        """Testa start_run, span e finish_run fora do servidor, ligados pelas variáveis de ambiente"""
+        with patch.dict(os.environ, {profiling.DEBUG_ENV: "", profiling.LOG_ENV: ""}):
+            perfil = profiling.start_run("Main")
+            self.assertFalse(perfil.enabled)
+
+        with patch.dict(os.environ, {profiling.DEBUG_ENV: "1", profiling.LOG_ENV: self.log_file}):
+            perfil = profiling.start_run("Main")
+            self.assertTrue(perfil.enabled)
+            self.assertIs(profiling.current(), perfil)
+            with profiling.span("salvar_lancamento") as etapa:
+                etapa.record(linhas=1)
+            profiling.finish_run(perfil)
+
+        self.assertEqual(perfil.spans[0].etapa, "salvar_lancamento")
+        self.assertTrue(os.path.exists(self.log_file))
+
+    def test_perfil_da_secao(self):
+        """Testa que a seção (fragmento) mede as etapas em um perfil próprio, gravado ao sair"""
+        with patch.dict(os.environ, {profiling.DEBUG_ENV: "1", profiling.LOG_ENV: self.log_file}):
+            pagina = profiling.start_run("Main")
+            profiling.finish_run(pagina)
+
+            @profiling.profiled_section("Main/atributos")
+            def fragmento():
+                with profiling.span("top5_materiais") as etapa:
+                    etapa.record(linhas=5)
+                return profiling.current()
+
+            resultados = []
+            thread = threading.Thread(target=lambda: resultados.append(fragmento()))
+            thread.start()
+            thread.join(5)
+            secao = fragmento()
+
+        self.assertIs(profiling.current(), pagina)
+        self.assertEqual(pagina.spans, [])
+        self.assertIsNot(resultados[0], secao)
+        self.assertEqual([s.etapa for s in secao.spans], ["top5_materiais"])
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            linhas = [json.loads(linha) for linha in f]
+        self.assertEqual([(l["pagina"], l["etapa"]) for l in linhas], [("Main/atributos", "top5_materiais")] * 2)
+        self.assertTrue(all(l["ms"] is not None for l in linhas))
+
+if __name__ == '__main__':
+    unittest.main()
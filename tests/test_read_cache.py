@@ -0,0 +1,104 @@
+import unittest
+import json
+import os
+import shutil
+from data_manager import DataManager
+from read_cache import ReadCache
+from storage import JournalStorage
+
+class TestReadCache(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_cache_data'
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        self.data_manager = DataManager()
+        self.data_manager.maintenance_file = os.path.join(self.test_data_dir, 'maintenance.json')
+        self.data_manager.comparison_file = os.path.join(self.test_data_dir, 'comparison_history.csv')
+        self.data_manager.parts_status_file = os.path.join(self.test_data_dir, 'parts_status.json')
+        self.data_manager._initialize_files()
+        self.registro = {
+            "peca": "Motor",
+            "tipo_manutencao": "Preventiva",
+            "descricao": "Troca de óleo",
+            "custo": 150.0
+        }
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        shutil.rmtree(self.test_data_dir)
+
+    def test_get_and_invalidate(self):
+        """Testa que o arquivo só é relido quando muda"""
+        arquivo = os.path.join(self.test_data_dir, 'dados.txt')
+        with open(arquivo, 'w') as f:
+            f.write('a')
+        cache = ReadCache()
+        leituras = []
+
+        def ler():
+            leituras.append(1)
+            with open(arquivo) as f:
+                return f.read()
+
+        self.assertEqual(cache.get('dados', [arquivo], ler), 'a')
+        self.assertEqual(cache.get('dados', [arquivo], ler), 'a')
+        with open(arquivo, 'w') as f:
+            f.write('bb')
+        self.assertEqual(cache.get('dados', [arquivo], ler), 'bb')
+
+        self.assertEqual(len(leituras), 2)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 2, 'entradas': 1})
+
+    def test_repeated_reads_hit(self):
+        """Testa que leituras repetidas são servidas da memória"""
+        self.data_manager.get_maintenance_history()
+        antes = self.data_manager.cache_stats()
+        for _ in range(3):
+            self.data_manager.get_maintenance_history()
+            self.data_manager.get_part_status()
+            self.data_manager.get_comparison_history()
+
+        depois = self.data_manager.cache_stats()
+        self.assertEqual(depois['hits'] - antes['hits'], 8)
+
+    def test_write_through(self):
+        """Testa que as próprias gravações atualizam o cache sem reler o arquivo"""
+        self.data_manager.get_maintenance_history()
+        self.data_manager.add_maintenance_record(dict(self.registro))
+        faltas = self.data_manager.cache_stats()['misses']
+
+        historico = self.data_manager.get_maintenance_history()
+
+        self.assertEqual(len(historico), 1)
+        self.assertEqual(self.data_manager.cache_stats()['misses'], faltas)
+
+    def test_external_change(self):
+        """Testa que alterações feitas por outro processo no arquivo são percebidas"""
+        self.data_manager.get_maintenance_history()
+        with open(self.data_manager.maintenance_file, 'w', encoding='utf-8') as f:
+            json.dump([dict(self.registro, timestamp='2024-03-15T10:00:00')], f)
+
+        self.assertEqual(len(self.data_manager.get_maintenance_history()), 1)
+
+    def test_returned_values_are_copies(self):
+        """Testa que alterar o valor retornado não altera o cache"""
+        self.data_manager.get_maintenance_history().append('lixo')
+        self.data_manager.get_part_status()['lixo'] = {}
+
+        self.assertEqual(self.data_manager.get_maintenance_history(), [])
+        self.assertEqual(self.data_manager.get_part_status(), {})
+
+    def test_journal_cache(self):
+        """Testa que o diário aplica os novos eventos ao estado em cache sem reconstruí-lo"""
+        storage = JournalStorage(self.test_data_dir)
+        data_manager = DataManager(storage=storage)
+        data_manager.get_part_status()
+        for i in range(5):
+            data_manager.update_part_status(f"P{i}", "Novo")
+        storage.compact()
+
+        self.assertEqual(len(data_manager.get_part_status()), 5)
+        self.assertEqual(data_manager.cache_stats()['misses'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
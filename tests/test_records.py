@@ -0,0 +1,85 @@
+import unittest
+import os
+import shutil
+import numpy as np
+from data_manager import DataManager
+from records import MaintenanceRecord, PartStatus, RecordColumns
+from storage import JournalStorage, SQLiteStorage
+
+class TestRecords(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_records_data'
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        self.registros = [
+            {"peca": "Motor", "tipo_manutencao": "Preventiva", "descricao": "Troca de óleo",
+             "custo": 150.0, "timestamp": "2024-01-02T10:00:00"},
+            {"peca": "Bomba", "tipo_manutencao": "Corretiva", "descricao": "Vedação",
+             "custo": 80.5, "timestamp": "2024-01-01T09:30:00"},
+        ]
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        shutil.rmtree(self.test_data_dir)
+
+    def test_round_trip(self):
+        """Testa a conversão de dicionários para colunas e de volta para registros tipados"""
+        colunas = RecordColumns.from_dicts(MaintenanceRecord, self.registros)
+
+        self.assertEqual(len(colunas), 2)
+        self.assertEqual(colunas["custo"].dtype, np.float64)
+        self.assertEqual(list(colunas), [MaintenanceRecord(**r) for r in self.registros])
+        self.assertEqual(RecordColumns.from_records(MaintenanceRecord, list(colunas)).row(1), colunas.row(1))
+
+    def test_slotted_records(self):
+        """Testa que os registros não têm dicionário de atributos por instância"""
+        registro = MaintenanceRecord(**self.registros[0])
+
+        self.assertFalse(hasattr(registro, '__dict__'))
+        self.assertFalse(hasattr(PartStatus("P1", "Novo", "2024-01-01T00:00:00"), '__dict__'))
+
+    def test_to_frame_without_copy(self):
+        """Testa que o DataFrame reaproveita os arrays das colunas, que são somente leitura"""
+        colunas = RecordColumns.from_dicts(MaintenanceRecord, self.registros)
+        df = colunas.to_frame()
+
+        self.assertEqual(list(df.columns), ["peca", "tipo_manutencao", "descricao", "custo", "timestamp"])
+        self.assertTrue(np.shares_memory(df["custo"].to_numpy(), colunas["custo"]))
+        self.assertEqual(df["peca"].dtype, "category")
+        with self.assertRaises(ValueError):
+            df.loc[0, "custo"] = 0.0
+
+    def test_empty(self):
+        """Testa colunas sem registros"""
+        colunas = RecordColumns.from_dicts(MaintenanceRecord, [])
+
+        self.assertEqual(len(colunas), 0)
+        self.assertTrue(colunas.to_frame().empty)
+
+    def test_columns_in_all_backends(self):
+        """Testa que todos os backends entregam as mesmas colunas, em ordem de timestamp"""
+        legado = DataManager()
+        legado.maintenance_file = os.path.join(self.test_data_dir, 'maintenance.json')
+        legado.comparison_file = os.path.join(self.test_data_dir, 'comparison_history.csv')
+        legado.parts_status_file = os.path.join(self.test_data_dir, 'parts_status.json')
+        legado._initialize_files()
+        sqlite = SQLiteStorage(os.path.join(self.test_data_dir, 'manutencao.db'))
+        managers = {
+            'json': legado,
+            'sqlite': DataManager(storage=sqlite),
+            'jsonl': DataManager(storage=JournalStorage(os.path.join(self.test_data_dir, 'diario'))),
+        }
+        try:
+            for nome, manager in managers.items():
+                with self.subTest(backend=nome):
+                    for registro in self.registros:
+                        manager.add_maintenance_record(dict(registro))
+
+                    colunas = manager.get_maintenance_columns()
+                    self.assertEqual([r.descricao for r in colunas], ["Troca de óleo", "Vedação"])
+                    self.assertEqual(colunas["custo"].tolist(), [150.0, 80.5])
+        finally:
+            sqlite.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sales_charts import downsample_points
+
+class TestDownsamplePoints(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        rng = np.random.default_rng(3)
+        materiais = ['BOD 11'] * 6000 + ['BOD 14'] * 3000 + ['KIT'] * 990 + ['RARO'] * 10
+        self.df = pd.DataFrame({
+            'DESCRIÇÃO MATERIAL': materiais,
+            'VALOR TOTAL': rng.uniform(0, 1000, len(materiais)),
+        })
+        self.df.loc[9995, 'VALOR TOTAL'] = 99999.0
+
+    def test_small_frame_untouched(self):
+        """Testa que bases dentro do limite são retornadas sem amostragem"""
+        pequeno = self.df.iloc[:100]
+
+        self.assertIs(downsample_points(pequeno, max_points=500), pequeno)
+
+    def test_budget_respected(self):
+        """Testa que o número de pontos não ultrapassa o limite configurado"""
+        amostra = downsample_points(self.df, max_points=1000)
+
+        self.assertLessEqual(len(amostra), 1000)
+        self.assertGreater(len(amostra), 900)
+
+    def test_groups_and_extremes_kept(self):
+        """Testa que todos os materiais e o maior valor de cada um continuam no gráfico"""
+        amostra = downsample_points(self.df, max_points=1000)
+
+        self.assertEqual(set(amostra['DESCRIÇÃO MATERIAL']), set(self.df['DESCRIÇÃO MATERIAL']))
+        self.assertIn(99999.0, amostra['VALOR TOTAL'].tolist())
+        maximos = self.df.groupby('DESCRIÇÃO MATERIAL')['VALOR TOTAL'].max()
+        for material, valor in maximos.items():
+            self.assertIn(valor, amostra.loc[amostra['DESCRIÇÃO MATERIAL'] == material, 'VALOR TOTAL'].tolist())
+
+    def test_proportional_sampling(self):
+        """Testa que cada material é amostrado proporcionalmente ao seu tamanho"""
+        amostra = downsample_points(self.df, max_points=1000)
+        contagem = amostra['DESCRIÇÃO MATERIAL'].value_counts()
+
+        self.assertAlmostEqual(contagem['BOD 11'] / contagem['BOD 14'], 2.0, delta=0.1)
+
+    def test_deterministic(self):
+        """Testa que a amostragem é estável entre execuções"""
+        primeira = downsample_points(self.df, max_points=1000)
+        segunda = downsample_points(self.df, max_points=1000)
+
+        pd.testing.assert_frame_equal(primeira, segunda)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import os
+import shutil
+import time
+from unittest.mock import patch
+import pandas as pd
+from sales_dataset import SalesSnapshot, build_choices, get_dataset, _base_rollups, _load_snapshot
+from sales_journal import SalesJournal
+from sales_rollups import SalesRollups
+
+class TestSalesDataset(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_dataset_data'
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        self.csv_file = os.path.join(self.test_data_dir, 'vendas.csv')
+        self.cache_dir = os.path.join(self.test_data_dir, 'cache')
+        self.df = pd.DataFrame({
+            'CFOP': [6101, 5101, 5101, None],
+            'RAZÃO SOCIAL CLIENTE': ['ZETA LTDA', 'ALFA LTDA', 'ZETA LTDA', 'BETA SA'],
+            'UF': ['SP', 'RJ', 'SP', 'MG'],
+            'CÓD.MAT.': ['5.02', '5.01', '5.02', None],
+            'DESCRIÇÃO MATERIAL': ['BOD 14', 'BOD 11', 'BOD 14', 'KIT'],
+            'EMISSÃO': ['1/8/2019'] * 4,
+            'QUANTIDADE': [1, 2, 3, 4],
+            'VALOR UNITÁRIO': [10.0, 20.0, 30.0, 40.0],
+            'VALOR TOTAL': [10.0, 40.0, 90.0, 160.0],
+        })
+        self.df.to_csv(self.csv_file, index=False)
+        _load_snapshot.clear()
+        _base_rollups.clear()
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        _load_snapshot.clear()
+        _base_rollups.clear()
+        shutil.rmtree(self.test_data_dir)
+
+    def test_build_choices_sorted_unique(self):
+        """Testa que as listas de seleção são únicas, ordenadas e sem nulos"""
+        choices = build_choices(self.df)
+
+        self.assertEqual(choices['RAZÃO SOCIAL CLIENTE'], ['ALFA LTDA', 'BETA SA', 'ZETA LTDA'])
+        self.assertEqual(choices['UF'], ['MG', 'RJ', 'SP'])
+        self.assertEqual(choices['CFOP'], [5101, 6101])
+        self.assertEqual(choices['CÓD.MAT.'], ['5.01', '5.02'])
+
+    def test_snapshot_version(self):
+        """Testa que o retrato guarda a versão e as listas pré-calculadas"""
+        snapshot = SalesSnapshot(self.df, 'v1')
+
+        self.assertEqual(snapshot.version, 'v1')
+        self.assertEqual(snapshot.choices['DESCRIÇÃO MATERIAL'], ['BOD 11', 'BOD 14', 'KIT'])
+
+    def test_shared_handle(self):
+        """Testa que chamadas repetidas reutilizam o mesmo retrato sem reler o cache"""
+        primeiro = get_dataset(self.csv_file, cache_dir=self.cache_dir, data_dir=self.test_data_dir)
+
+        with patch('sales_dataset.load_sales') as mock_load:
+            segundo = get_dataset(self.csv_file, cache_dir=self.cache_dir, data_dir=self.test_data_dir)
+
+        self.assertFalse(mock_load.called)
+        self.assertIs(primeiro, segundo)
+
+    def test_reload_on_source_change(self):
+        """Testa que uma nova versão da planilha gera um novo retrato"""
+        primeiro = get_dataset(self.csv_file, cache_dir=self.cache_dir, data_dir=self.test_data_dir)
+        self.df.iloc[:2].to_csv(self.csv_file, index=False)
+        novo_mtime = time.time() + 10
+        os.utime(self.csv_file, (novo_mtime, novo_mtime))
+
+        segundo = get_dataset(self.csv_file, cache_dir=self.cache_dir, data_dir=self.test_data_dir)
+
+        self.assertIsNot(primeiro, segundo)
+        self.assertNotEqual(primeiro.version, segundo.version)
+        self.assertEqual(len(segundo.df), 2)
+
+    def test_journal_updates_base_rollups(self):
+        """Testa que um lançamento soma só as linhas novas aos cubos da planilha, sem recalculá-los"""
+        primeiro = get_dataset(self.csv_file, cache_dir=self.cache_dir, data_dir=self.test_data_dir)
+        SalesJournal(self.test_data_dir).append([{
+            'NF': 9001, 'CFOP': 5101, 'EMISSÃO': '2019-02-10', 'RAZÃO SOCIAL CLIENTE': 'NOVO SA',
+            'UF': 'RJ', 'DESCRIÇÃO MATERIAL': 'BOD 99', 'QUANTIDADE': 5, 'VALOR UNITÁRIO': 2.0, 'VALOR TOTAL': 10.0,
+        }])
+
+        with patch('sales_dataset.SalesRollups', wraps=SalesRollups) as mock_rollups:
+            segundo = get_dataset(self.csv_file, cache_dir=self.cache_dir, data_dir=self.test_data_dir)
+
+        self.assertFalse(mock_rollups.called)
+        self.assertEqual(len(segundo.df), 5)
+        cubo = segundo.rollups.cubes['material']
+        self.assertEqual(cubo['LINHAS'].sum(), 5)
+        self.assertIn('BOD 99', cubo.index.get_level_values('DESCRIÇÃO MATERIAL').categories)
+        self.assertEqual(primeiro.rollups.cubes['material']['LINHAS'].sum(), 4)
+
+        completo = SalesRollups(segundo.df)
+        for nome, keys in completo.dimensions.items():
+            with self.subTest(cubo=nome):
+                pd.testing.assert_frame_equal(
+                    segundo.rollups.cubes[nome].reset_index().astype({coluna: str for coluna in keys}),
+                    completo.cubes[nome].reset_index().astype({coluna: str for coluna in keys}), check_dtype=False
+                )
+
+class TestPeriodFilter(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        datas = pd.to_datetime(['2019-01-08', '2019-01-08', '2019-02-01', '2019-03-15', '2020-01-02', None])
+        self.df = pd.DataFrame({
+            'EMISSÃO': datas,
+            'CFOP': [5101] * 6,
+            'RAZÃO SOCIAL CLIENTE': ['A', 'B', 'C', 'D', 'E', 'F'],
+            'UF': ['SP'] * 6,
+            'CÓD.MAT.': ['1'] * 6,
+            'DESCRIÇÃO MATERIAL': ['X'] * 6,
+        })
+        self.snapshot = SalesSnapshot(self.df, 'v1')
+
+    def test_period_matches_mask(self):
+        """Testa que a busca binária retorna as mesmas linhas que a máscara booleana"""
+        inicio, fim = pd.Timestamp('2019-01-08'), pd.Timestamp('2019-03-15')
+        esperado = self.df[(self.df['EMISSÃO'] >= inicio) & (self.df['EMISSÃO'] <= fim)]
+
+        resultado = self.snapshot.period(inicio.date(), fim.date())
+
+        pd.testing.assert_frame_equal(resultado, esperado)
+
+    def test_period_ignores_invalid_dates(self):
+        """Testa que emissões inválidas (NaT) nunca entram no período"""
+        resultado = self.snapshot.period(pd.Timestamp('2000-01-01'), pd.Timestamp('2100-01-01'))
+
+        self.assertEqual(len(resultado), 5)
+        self.assertFalse(resultado['EMISSÃO'].isna().any())
+
+    def test_inverted_period(self):
+        """Testa que um período com início depois do fim retorna uma base vazia"""
+        resultado = self.snapshot.period(pd.Timestamp('2020-01-01'), pd.Timestamp('2019-01-01'))
+
+        self.assertEqual(len(resultado), 0)
+
+if __name__ == '__main__':
+    unittest.main()
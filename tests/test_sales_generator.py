@@ -0,0 +1,91 @@
+import unittest
+import os
+import shutil
+import pandas as pd
+from sales_generator import SalesModel, XLSX_MAX_ROWS, main, write_sales
+from sales_loader import SALES_COLUMNS, normalize_sales, read_source
+
+CSV_BASE = """NF ,ST,CFOP,EMISSÃO,VEND.,RAZÃO SOCIAL CLIENTE,UF,CÓD.MAT.,DESCRIÇÃO MATERIAL,UNID. MEDIDA,QUANTIDADE,VALOR UNITÁRIO, VALOR TOTAL
+8087,A,"5,101",1/8/2019,0,WERNEK HIDRAULICA EIRELI,SP,5.0207.0544009.0,BOD 14 C11.C.C3.L,UN,1, 298.00 , 298.00
+8087,A,"5,101",1/8/2019,0,WERNEK HIDRAULICA EIRELI,SP,5.0220.L018780.0,BOD 11 E18.C.G3/8 G3.L,UN,2, 600.00 ," 1,200.00 "
+8089,A,"6,101",2/12/2019,11,MOBIL MARKET COMERCIO LTDA,GO,5.0220.L018780.0,BOD 11 E18.C.G3/8 G3.L,UN,3, 610.00 ," 1,830.00 "
+8090,A,"6,101",3/15/2019,11,MOBIL MARKET COMERCIO LTDA,GO,5.0207.0544009.0,BOD 14 C11.C.C3.L,UN,5, 290.00 ," 1,450.00 "
+"""
+
+class TestSalesGenerator(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_generator_data'
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        self.fonte = os.path.join(self.test_data_dir, 'base.csv')
+        with open(self.fonte, 'w', encoding='utf-8') as f:
+            f.write(CSV_BASE)
+        self.model = SalesModel.from_file(self.fonte)
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        shutil.rmtree(self.test_data_dir)
+
+    def test_chunks(self):
+        """Testa a geração em lotes limitados, em ordem de emissão e com notas sequenciais"""
+        lotes = list(self.model.chunks(2500, inicio="2020-01-01", fim="2020-12-31", chunk_size=1000))
+        df = pd.concat(lotes, ignore_index=True)
+
+        self.assertEqual([len(lote) for lote in lotes], [1000, 1000, 500])
+        self.assertEqual(list(df.columns), SALES_COLUMNS)
+        self.assertTrue(df['EMISSÃO'].is_monotonic_increasing)
+        self.assertTrue(df['EMISSÃO'].between("2020-01-01", "2020-12-31").all())
+        self.assertTrue(df['NF'].is_monotonic_increasing)
+        self.assertEqual(df['NF'].iloc[0], 1)
+
+    def test_learned_distributions(self):
+        """Testa que clientes, UF, CFOP, materiais e preços seguem a base de origem"""
+        df = pd.concat(self.model.chunks(2000, inicio="2020-01-01", fim="2020-12-31"))
+
+        uf = df.groupby('RAZÃO SOCIAL CLIENTE', observed=True)['UF'].unique()
+        self.assertEqual(list(uf['WERNEK HIDRAULICA EIRELI']), ['SP'])
+        self.assertEqual(set(df.loc[df['UF'] == 'GO', 'CFOP']), {6101.0})
+        self.assertEqual(set(df['CÓD.MAT.']), {'5.0207.0544009.0', '5.0220.L018780.0'})
+        self.assertTrue(df['VALOR UNITÁRIO'].between(290.0, 610.0).all())
+        self.assertTrue((df['VALOR TOTAL'] == (df['QUANTIDADE'] * df['VALOR UNITÁRIO']).round(2)).all())
+        # Nenhuma nota tem mais de um cliente
+        self.assertEqual(df.groupby('NF')['RAZÃO SOCIAL CLIENTE'].nunique().max(), 1)
+
+    def test_same_seed(self):
+        """Testa que a mesma semente gera a mesma base"""
+        a = pd.concat(self.model.chunks(500, seed=7))
+        b = pd.concat(self.model.chunks(500, seed=7))
+
+        pd.testing.assert_frame_equal(a, b)
+
+    def test_write_formats(self):
+        """Testa a gravação em CSV, Parquet e XLSX lida de volta pelo carregador da base"""
+        for extensao in ('.csv', '.parquet', '.xlsx'):
+            with self.subTest(formato=extensao):
+                arquivo = os.path.join(self.test_data_dir, 'vendas' + extensao)
+                linhas = write_sales(arquivo, 300, self.model, chunk_size=120)
+
+                bruto = pd.read_parquet(arquivo) if extensao == '.parquet' else read_source(arquivo)
+                df = normalize_sales(bruto)
+                self.assertEqual(linhas, 300)
+                self.assertEqual(len(df), 300)
+                self.assertFalse(df[SALES_COLUMNS].isna().any().any())
+
+    def test_invalid_output(self):
+        """Testa os formatos não suportados e o limite de linhas do Excel"""
+        with self.assertRaises(ValueError):
+            write_sales(os.path.join(self.test_data_dir, 'vendas.txt'), 10, self.model)
+        with self.assertRaises(ValueError):
+            write_sales(os.path.join(self.test_data_dir, 'vendas.xlsx'), XLSX_MAX_ROWS + 1, self.model)
+
+    def test_command_line(self):
+        """Testa a geração pela linha de comando"""
+        saida = os.path.join(self.test_data_dir, 'saida.csv')
+
+        codigo = main([saida, '--linhas', '50', '--fonte', self.fonte])
+
+        self.assertEqual(codigo, 0)
+        self.assertEqual(len(read_source(saida)), 50)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import io
+import os
+import shutil
+import pandas as pd
+from sales_import import import_sales_file, main, validate_sales_batch
+from sales_journal import SalesJournal
+
+CSV_LOTE = """NF ,ST,CFOP,EMISSÃO,VEND.,RAZÃO SOCIAL CLIENTE,UF,CÓD.MAT.,DESCRIÇÃO MATERIAL,UNID. MEDIDA,QUANTIDADE,VALOR UNITÁRIO, VALOR TOTAL
+8087,A,"5,101",1/8/2019,0,WERNEK HIDRAULICA EIRELI,SP,5.0207.0544009.0,BOD 14 C11.C.C3.L,UN,1, 298.00 , 298.00
+8089,A,"5,101",1/9/2019,0,MOBIL MARKET COMERCIO LTDA,SP,5.0220.L018780.0,BOD 11 E18.C.G3/8 G3.L,UN,3, 600.00 ,
+8090,A,"5,101",31/31/2019,0,CLIENTE,SP,5.0220.L018780.0,BOD 11,UN,3, 600.00 , 1800
+8091,A,"5,101",1/10/2019,0,,SP,5.0220.L018780.0,BOD 11,UN,0, #DIV/0! , 0
+abc,A,"5,101",1/10/2019,0,CLIENTE,SP,5.0220.L018780.0,BOD 11,UN,1, 600.00 , 600
+8093,A,xx,1/10/2019,0,CLIENTE,SP,5.0220.L018780.0,BOD 11,UN,1, 600.00 , 600
+8094,A,"5,101",1/10/2019,Maria,CLIENTE,SP,5.0220.L018780.0,BOD 11,UN,1, 600.00 , 600
+0,A,"5,101",1/10/2019,0,CLIENTE,SP,5.0220.L018780.0,BOD 11,UN,1, 600.00 , 600
+"""
+
+class TestSalesImport(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_import_data'
+        self.journal = SalesJournal(self.test_data_dir)
+        self.csv_file = os.path.join(self.test_data_dir, 'lote.csv')
+        with open(self.csv_file, 'w', encoding='utf-8') as f:
+            f.write(CSV_LOTE)
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        shutil.rmtree(self.test_data_dir)
+
+    def test_validate_batch(self):
+        """Testa a separação entre linhas válidas e rejeitadas com os motivos"""
+        df = pd.read_csv(io.StringIO(CSV_LOTE), dtype=str)
+        df.columns = df.columns.str.strip()
+
+        validas, rejeitadas = validate_sales_batch(df)
+
+        self.assertEqual(sorted(validas['NF'].tolist()), [8087, 8089])
+        self.assertEqual(rejeitadas['LINHA'].tolist(), [4, 5, 6, 7, 8, 9])
+        self.assertIn('data de emissão inválida', rejeitadas['MOTIVO'].iloc[0])
+        self.assertIn("'RAZÃO SOCIAL CLIENTE' vazio", rejeitadas['MOTIVO'].iloc[1])
+        self.assertIn("'QUANTIDADE' deve ser maior que zero", rejeitadas['MOTIVO'].iloc[1])
+        self.assertEqual(rejeitadas['MOTIVO'].iloc[2], "'NF' inválido")
+        self.assertEqual(rejeitadas['MOTIVO'].iloc[3], "'CFOP' inválido")
+        self.assertEqual(rejeitadas['MOTIVO'].iloc[4], "'VEND.' inválido")
+        self.assertEqual(rejeitadas['MOTIVO'].iloc[5], "'NF' deve ser maior que zero")
+
+    def test_missing_total_is_calculated(self):
+        """Testa que o valor total ausente é calculado como quantidade x valor unitário"""
+        df = pd.read_csv(io.StringIO(CSV_LOTE), dtype=str)
+        df.columns = df.columns.str.strip()
+
+        validas, _ = validate_sales_batch(df)
+
+        self.assertEqual(validas.loc[validas['NF'] == 8089, 'VALOR TOTAL'].iloc[0], 1800.0)
+
+    def test_missing_columns(self):
+        """Testa que um arquivo sem as colunas da planilha é recusado"""
+        with self.assertRaises(ValueError):
+            validate_sales_batch(pd.DataFrame({'NF': [1], 'UF': ['SP']}))
+
+    def test_import_single_write(self):
+        """Testa que o lote válido é gravado no diário de uma vez"""
+        importadas, rejeitadas = import_sales_file(self.csv_file, self.journal)
+
+        self.assertEqual(importadas, 2)
+        self.assertEqual(len(rejeitadas), 6)
+        self.assertEqual(self.journal.pending_rows(), 2)
+        self.assertEqual(sorted(self.journal.read()['NF'].tolist()), [8087, 8089])
+
+    def test_import_uploaded_file(self):
+        """Testa a importação de um arquivo enviado pelo formulário (objeto em memória)"""
+        arquivo = io.BytesIO(CSV_LOTE.encode('utf-8'))
+
+        importadas, _ = import_sales_file(arquivo, self.journal, name='lote.csv')
+
+        self.assertEqual(importadas, 2)
+
+    def test_command_line(self):
+        """Testa a importação pela linha de comando gravando os rejeitos"""
+        rejeitos = os.path.join(self.test_data_dir, 'rejeitos.csv')
+
+        codigo = main([self.csv_file, '--rejeitos', rejeitos, '--data-dir', self.test_data_dir])
+
+        self.assertEqual(codigo, 0)
+        self.assertEqual(len(pd.read_csv(rejeitos)), 6)
+
+if __name__ == '__main__':
+    unittest.main()
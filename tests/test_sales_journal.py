@@ -0,0 +1,122 @@
+import unittest
+import os
+import shutil
+from datetime import date
+import pandas as pd
+from sales_journal import SalesJournal, merge_sales
+from sales_loader import normalize_sales
+
+class TestSalesJournal(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_journal_data'
+        self.journal = SalesJournal(self.test_data_dir)
+        self.venda = {
+            'NF': 9001,
+            'ST': 'A',
+            'CFOP': 5101.0,
+            'EMISSÃO': date(2020, 5, 5),
+            'VEND.': 0,
+            'RAZÃO SOCIAL CLIENTE': 'CLIENTE NOVO',
+            'UF': 'SP',
+            'CÓD.MAT.': '5.0207.0544009.0',
+            'DESCRIÇÃO MATERIAL': 'BOD 14 C11.C.C3.L',
+            'UNID. MEDIDA': 'UN',
+            'QUANTIDADE': 2,
+            'VALOR UNITÁRIO': 100.0,
+            'VALOR TOTAL': 200.0,
+        }
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        shutil.rmtree(self.test_data_dir)
+
+    def test_append_is_incremental(self):
+        """Testa que cada lançamento apenas acrescenta uma linha ao diário"""
+        self.journal.append([self.venda])
+        tamanho = os.path.getsize(self.journal.journal_file)
+        self.journal.append([self.venda])
+
+        with open(self.journal.journal_file, encoding='utf-8') as f:
+            linhas = f.read().splitlines()
+        self.assertEqual(len(linhas), 3)  # cabeçalho + 2 lançamentos
+        self.assertGreater(os.path.getsize(self.journal.journal_file), tamanho)
+        self.assertEqual(self.journal.pending_rows(), 2)
+
+    def test_append_rejects_text_in_numeric_columns(self):
+        """Testa que um vendedor digitado como texto é recusado em vez de virar nulo na leitura"""
+        with self.assertRaises(ValueError):
+            self.journal.append([dict(self.venda, **{'VEND.': 'Maria'})])
+
+        self.assertFalse(os.path.exists(self.journal.journal_file))
+        self.journal.append([dict(self.venda, **{'VEND.': None, 'CFOP': '5,101'})])
+        self.assertEqual(self.journal.read()['CFOP'].iloc[0], 5101.0)
+
+    def test_read_normalized(self):
+        """Testa que as linhas lidas do diário chegam normalizadas"""
+        self.journal.append([self.venda])
+
+        df = self.journal.read()
+
+        self.assertEqual(len(df), 1)
+        self.assertEqual(df['EMISSÃO'].iloc[0], pd.Timestamp('2020-05-05'))
+        self.assertEqual(df['VALOR TOTAL'].iloc[0], 200.0)
+        self.assertEqual(df['CÓDIGO'].iloc[0], '5207544009')
+
+    def test_compact(self):
+        """Testa que a compactação move o diário para o Parquet sem perder linhas"""
+        self.journal.append([self.venda, dict(self.venda, NF=9002)])
+        self.journal.compact()
+        self.journal.append([dict(self.venda, NF=9003)])
+
+        df = self.journal.read()
+
+        self.assertTrue(os.path.exists(self.journal.ingested_file))
+        self.assertFalse(os.path.exists(self.journal.compacting_file))
+        self.assertEqual(self.journal.pending_rows(), 1)
+        self.assertEqual(sorted(df['NF'].tolist()), [9001, 9002, 9003])
+
+    def test_interrupted_compaction(self):
+        """Testa que uma compactação interrompida não duplica lançamentos"""
+        self.journal.append([self.venda, dict(self.venda, NF=9002)])
+        shutil.copy(self.journal.journal_file, self.journal.compacting_file + '.copia')
+        self.journal.compact()
+        # Simula uma queda depois de gravar o Parquet e antes de apagar o diário rotacionado
+        os.replace(self.journal.compacting_file + '.copia', self.journal.compacting_file)
+
+        self.assertEqual(sorted(self.journal.read()['NF'].tolist()), [9001, 9002])
+        self.journal.compact()
+        self.assertEqual(sorted(self.journal.read()['NF'].tolist()), [9001, 9002])
+
+    def test_maybe_compact(self):
+        """Testa que a compactação automática só ocorre acima do limite"""
+        self.journal.append([self.venda])
+
+        self.assertFalse(self.journal.maybe_compact(threshold=2))
+        self.journal.append([self.venda])
+        self.assertTrue(self.journal.maybe_compact(threshold=2))
+        self.assertEqual(self.journal.pending_rows(), 0)
+
+    def test_version_changes_on_append(self):
+        """Testa que a versão do diário muda a cada lançamento"""
+        antes = self.journal.version()
+        self.journal.append([self.venda])
+
+        self.assertNotEqual(antes, self.journal.version())
+
+    def test_merge_sales(self):
+        """Testa a mescla dos lançamentos com a base, mantendo categorias e ordem por emissão"""
+        base = normalize_sales(pd.DataFrame([
+            dict(self.venda, NF=1, EMISSÃO='1/8/2019'),
+            dict(self.venda, NF=2, EMISSÃO='12/31/2021'),
+        ]))
+        self.journal.append([self.venda])
+
+        df = merge_sales(base, self.journal.read())
+
+        self.assertEqual(df['NF'].tolist(), [1, 9001, 2])
+        self.assertNotIn('ID', df.columns)
+        self.assertIsInstance(df['RAZÃO SOCIAL CLIENTE'].dtype, pd.CategoricalDtype)
+
+if __name__ == '__main__':
+    unittest.main()
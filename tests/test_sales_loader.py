@@ -0,0 +1,245 @@
+import unittest
+import os
+import shutil
+import time
+from unittest.mock import patch
+import openpyxl
+import pandas as pd
+import sales_loader
+from sales_loader import build_cache, iter_sales, load_sales, normalize_sales, read_source, read_source_chunks
+
+CSV_VENDAS = """NF ,ST,CFOP,EMISSÃO,VEND.,RAZÃO SOCIAL CLIENTE,UF,CÓD.MAT.,DESCRIÇÃO MATERIAL,UNID. MEDIDA,QUANTIDADE,VALOR UNITÁRIO, VALOR TOTAL
+8087,A,"5,101",1/8/2019,0,WERNEK HIDRAULICA EIRELI,SP,5.0207.0544009.0,BOD 14 C11.C.C3.L,UN,1, 298.00 , 298.00
+8089,A,"5,101",1/8/2019,0,MOBIL MARKET COMERCIO LTDA,SP,5.0220.L018780.0,BOD 11 E18.C.G3/8 G3.L,UN,3, 600.00 ," 1,800.00 "
+"""
+
+class TestSalesLoader(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_sales_data'
+        self.cache_dir = os.path.join(self.test_data_dir, 'cache')
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        self.csv_file = os.path.join(self.test_data_dir, 'vendas.csv')
+        with open(self.csv_file, 'w', encoding='utf-8') as f:
+            f.write(CSV_VENDAS)
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        shutil.rmtree(self.test_data_dir)
+
+    def test_build_cache(self):
+        """Testa a criação do cache Parquet tipado na primeira carga"""
+        df = load_sales(self.csv_file, cache_dir=self.cache_dir)
+
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, 'vendas.parquet')))
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, 'vendas.meta.json')))
+        self.assertEqual(len(df), 2)
+        self.assertIn('NF', df.columns)
+        self.assertIn('VALOR TOTAL', df.columns)
+        self.assertEqual(df['VALOR TOTAL'].iloc[1], 1800.0)
+        self.assertEqual(df['CFOP'].iloc[0], 5101)
+        self.assertEqual(df['EMISSÃO'].iloc[0], pd.Timestamp('2019-01-08'))
+
+    def test_cache_hit(self):
+        """Testa que a segunda carga não relê a planilha de origem"""
+        load_sales(self.csv_file, cache_dir=self.cache_dir)
+
+        with patch('pandas.read_csv') as mock_read_csv:
+            df = load_sales(self.csv_file, cache_dir=self.cache_dir)
+
+        self.assertFalse(mock_read_csv.called)
+        self.assertEqual(len(df), 2)
+
+    def test_touch_without_changes(self):
+        """Testa que alterar apenas a data de modificação não reconstrói o cache"""
+        load_sales(self.csv_file, cache_dir=self.cache_dir)
+        novo_mtime = time.time() + 10
+        os.utime(self.csv_file, (novo_mtime, novo_mtime))
+
+        with patch('sales_loader.build_cache') as mock_build:
+            load_sales(self.csv_file, cache_dir=self.cache_dir)
+
+        self.assertFalse(mock_build.called)
+
+    def test_invalidation_on_change(self):
+        """Testa que o cache é reconstruído quando a planilha muda"""
+        load_sales(self.csv_file, cache_dir=self.cache_dir)
+        with open(self.csv_file, 'a', encoding='utf-8') as f:
+            f.write('8090,A,"5,101",1/9/2019,0,CLIENTE NOVO,RJ,5.0207.0544009.0,BOD 14 C11.C.C3.L,UN,2, 100.00 , 200.00 \n')
+
+        df = load_sales(self.csv_file, cache_dir=self.cache_dir)
+
+        self.assertEqual(len(df), 3)
+        self.assertEqual(df['RAZÃO SOCIAL CLIENTE'].iloc[2], 'CLIENTE NOVO')
+
+    def test_cache_version_change(self):
+        """Testa que uma nova versão do formato do cache força a reconstrução"""
+        load_sales(self.csv_file, cache_dir=self.cache_dir)
+
+        with patch.object(sales_loader, 'CACHE_VERSION', sales_loader.CACHE_VERSION + 1):
+            with patch('sales_loader.build_cache') as mock_build:
+                load_sales(self.csv_file, cache_dir=self.cache_dir)
+
+        self.assertTrue(mock_build.called)
+
+    def test_cache_from_other_source(self):
+        """Testa que uma planilha de mesmo nome em outro diretório não reaproveita o cache"""
+        load_sales(self.csv_file, cache_dir=self.cache_dir)
+        outro_dir = os.path.join(self.test_data_dir, 'outra')
+        os.makedirs(outro_dir)
+        outro_csv = os.path.join(outro_dir, 'vendas.csv')
+        with open(outro_csv, 'w', encoding='utf-8') as f:
+            f.write(CSV_VENDAS.splitlines()[0] + '\n' + CSV_VENDAS.splitlines()[1] + '\n')
+
+        df = load_sales(outro_csv, cache_dir=self.cache_dir)
+
+        self.assertEqual(len(df), 1)
+        self.assertEqual(len(load_sales(self.csv_file, cache_dir=self.cache_dir)), 2)
+
+    def test_unique_temp_files(self):
+        """Testa que cada construção do cache grava em um arquivo temporário próprio"""
+        substituidos = []
+        replace = os.replace
+
+        def registrar(origem, destino):
+            substituidos.append(origem)
+            replace(origem, destino)
+
+        with patch('sales_loader.os.replace', side_effect=registrar):
+            build_cache(self.csv_file, self.cache_dir)
+            build_cache(self.csv_file, self.cache_dir)
+
+        parquets = [nome for nome in substituidos if '.parquet.' in nome]
+        self.assertEqual(len(parquets), 2)
+        self.assertNotEqual(parquets[0], parquets[1])
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ['vendas.meta.json', 'vendas.parquet'])
+
+    def test_read_in_chunks(self):
+        """Testa a leitura do CSV em lotes, com os nomes das colunas limpos"""
+        lotes = list(read_source_chunks(self.csv_file, chunk_size=1))
+
+        self.assertEqual([len(lote) for lote in lotes], [1, 1])
+        self.assertIn('VALOR TOTAL', lotes[0].columns)
+        pd.testing.assert_frame_equal(pd.concat(lotes, ignore_index=True), read_source(self.csv_file))
+
+    def test_read_xlsx_in_chunks(self):
+        """Testa a leitura da planilha em modo somente leitura, com as conversões do read_excel"""
+        xlsx_file = os.path.join(self.test_data_dir, 'vendas.xlsx')
+        workbook = openpyxl.Workbook()
+        aba = workbook.active
+        aba.append(['NF ', 'EMISSÃO', 'CÓD.MAT.', 'VALOR UNITÁRIO', ' VALOR TOTAL '])
+        aba.append([8087, pd.Timestamp('2019-01-08').to_pydatetime(), 52075440090.0, 298.5, 298.5])
+        aba.append([None, None, None, None, None])
+        aba.append([8089, pd.Timestamp('2019-01-09').to_pydatetime(), 'A.1', '#DIV/0!', 1800])
+        workbook.save(xlsx_file)
+
+        lotes = list(read_source_chunks(xlsx_file, chunk_size=1))
+
+        self.assertEqual(len(lotes), 2)
+        df = pd.concat(lotes, ignore_index=True)
+        esperado = read_source(xlsx_file).dropna(how='all').reset_index(drop=True)
+        self.assertEqual(list(df.columns), list(esperado.columns))
+        self.assertEqual(df['CÓD.MAT.'].tolist(), esperado['CÓD.MAT.'].tolist())
+        self.assertTrue(pd.isna(df['VALOR UNITÁRIO'].iloc[1]))
+        self.assertEqual(normalize_sales(df)['VALOR TOTAL'].tolist(), [298.5, 1800.0])
+
+    def test_build_cache_in_chunks(self):
+        """Testa que o cache montado em lotes fora de ordem equivale à leitura inteira da planilha"""
+        with open(self.csv_file, 'a', encoding='utf-8') as f:
+            f.write('8070,A,"5,101",12/20/2018,0,ALFA LTDA,MG,5.0207.0544009.0,BOD 14 C11.C.C3.L,UN,2, 100.00 , 200.00 \n')
+            f.write('8071,A,"5,101",data,0,BETA LTDA,RJ,5.0207.0544009.0,BOD 14 C11.C.C3.L,UN,2, 100.00 , 200.00 \n')
+            f.write('8091,A,"5,101",1/10/2019,0,ALFA LTDA,AC,5.0207.0544009.0,BOD 14 C11.C.C3.L,UN,2, 100.00 , 200.00 \n')
+        esperado = normalize_sales(read_source(self.csv_file))
+
+        for chunk_size in (1, 2, 10):
+            with self.subTest(chunk_size=chunk_size):
+                shutil.rmtree(self.cache_dir, ignore_errors=True)
+                df = build_cache(self.csv_file, cache_dir=self.cache_dir, chunk_size=chunk_size)
+
+                self.assertEqual(df['NF'].tolist(), esperado['NF'].tolist())
+                self.assertTrue(pd.isna(df['EMISSÃO'].iloc[-1]))
+                for coluna in sales_loader.CATEGORY_COLUMNS:
+                    self.assertIsInstance(df[coluna].dtype, pd.CategoricalDtype)
+                    self.assertEqual(list(df[coluna].cat.categories), list(esperado[coluna].cat.categories))
+                pd.testing.assert_frame_equal(load_sales(self.csv_file, cache_dir=self.cache_dir), df)
+
+    def test_build_cache_fractional_after_integers(self):
+        """Testa que lotes só com números inteiros antes de lotes com decimais não quebram o cache"""
+        with open(self.csv_file, 'a', encoding='utf-8') as f:
+            f.write('8090,A,"5,101",1/9/2019,0,ALFA LTDA,MG,5.0207.0544009.0,BOD 14 C11.C.C3.L,KG,18.9, 10.50 , 198.45 \n')
+
+        df = build_cache(self.csv_file, cache_dir=self.cache_dir, chunk_size=2)
+
+        for coluna in ('QUANTIDADE', 'VALOR UNITÁRIO', 'VALOR TOTAL'):
+            self.assertEqual(df[coluna].dtype, 'float64')
+        self.assertEqual(df['QUANTIDADE'].tolist(), [1.0, 3.0, 18.9])
+        self.assertEqual(df['VALOR TOTAL'].iloc[-1], 198.45)
+
+    def test_iter_sales(self):
+        """Testa que cada lote sai normalizado e ordenado por emissão"""
+        lotes = list(iter_sales(self.csv_file, chunk_size=1))
+
+        self.assertEqual(len(lotes), 2)
+        self.assertEqual(lotes[1]['VALOR TOTAL'].iloc[0], 1800.0)
+        self.assertIsInstance(lotes[0]['UF'].dtype, pd.CategoricalDtype)
+
+class TestNormalizeSales(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.df = pd.DataFrame({
+            'CFOP': ['5,101', '6,101', None],
+            'EMISSÃO': ['1/8/2019', '12/31/2020', 'data inválida'],
+            'RAZÃO SOCIAL CLIENTE': ['ALFA LTDA ', 'ALFA LTDA', None],
+            'UF': ['SP', 'SP', 'RJ'],
+            'CÓD.MAT.': ['5.0207.0544009.0', '5.0237.L005590.', None],
+            'DESCRIÇÃO MATERIAL': ['BOD 14', 'KIT', 'BOD 14'],
+            'QUANTIDADE': ['1', '3', '2'],
+            'VALOR UNITÁRIO': [' 600.00 ', '#DIV/0!', ' 10.00 '],
+            'VALOR TOTAL': [' 1,800.00 ', ' -   ', ' 20.00 '],
+        })
+
+    def test_numeric_columns(self):
+        """Testa a conversão de números com separador de milhar e valores inválidos"""
+        df = normalize_sales(self.df)
+
+        self.assertEqual(df['VALOR TOTAL'].iloc[0], 1800.0)
+        self.assertTrue(pd.isna(df['VALOR TOTAL'].iloc[1]))
+        self.assertTrue(pd.isna(df['VALOR UNITÁRIO'].iloc[1]))
+        self.assertEqual(df['CFOP'].iloc[0], 5101)
+        self.assertEqual(df['QUANTIDADE'].sum(), 6)
+
+    def test_date_column(self):
+        """Testa a conversão de datas no formato mês/dia/ano"""
+        df = normalize_sales(self.df)
+
+        self.assertEqual(df['EMISSÃO'].iloc[0], pd.Timestamp('2019-01-08'))
+        self.assertEqual(df['EMISSÃO'].iloc[1], pd.Timestamp('2020-12-31'))
+        self.assertTrue(pd.isna(df['EMISSÃO'].iloc[2]))
+
+    def test_category_columns(self):
+        """Testa que as colunas de texto são armazenadas como categorias sem espaços"""
+        df = normalize_sales(self.df)
+
+        self.assertIsInstance(df['RAZÃO SOCIAL CLIENTE'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(df['UF'].dtype, pd.CategoricalDtype)
+        self.assertEqual(list(df['RAZÃO SOCIAL CLIENTE'].cat.categories), ['ALFA LTDA'])
+
+    def test_codigo_column(self):
+        """Testa o cálculo da coluna "CÓDIGO" exibida nos gráficos"""
+        df = normalize_sales(self.df)
+
+        self.assertEqual(df['CÓDIGO'].tolist(), ['5207544009', '5237.L005590.', 'Sem Código'])
+
+    def test_sorted_by_emissao(self):
+        """Testa que a base fica ordenada por emissão, com datas inválidas no fim"""
+        self.df['EMISSÃO'] = ['12/31/2020', 'data inválida', '1/8/2019']
+
+        df = normalize_sales(self.df)
+
+        self.assertEqual(df['EMISSÃO'].iloc[0], pd.Timestamp('2019-01-08'))
+        self.assertEqual(df['EMISSÃO'].iloc[1], pd.Timestamp('2020-12-31'))
+        self.assertTrue(pd.isna(df['EMISSÃO'].iloc[2]))
+        self.assertEqual(list(df.index), [0, 1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
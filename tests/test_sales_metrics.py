@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from sales_dataset import SalesSnapshot
+from sales_metrics import PrefixSums, compute_kpis
+
+class TestSalesMetrics(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        rng = np.random.default_rng(11)
+        linhas = 300
+        datas = pd.Timestamp('2019-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 365, linhas)), unit='D')
+        valores = rng.uniform(0, 5000, linhas)
+        valores[::17] = np.nan
+        materiais = rng.choice(['BOD 11', 'KIT'], linhas).astype(object)
+        materiais[::23] = None
+        self.df = pd.DataFrame({
+            'EMISSÃO': datas,
+            'CFOP': [5101] * linhas,
+            'RAZÃO SOCIAL CLIENTE': ['ALFA'] * linhas,
+            'UF': ['SP'] * linhas,
+            'CÓD.MAT.': ['1'] * linhas,
+            'DESCRIÇÃO MATERIAL': materiais,
+            'VALOR TOTAL': valores,
+        })
+        self.snapshot = SalesSnapshot(self.df, 'v1')
+
+    def test_compute_kpis_matches_pandas(self):
+        """Testa que as estatísticas batem com os métodos do pandas usados antes nos cards"""
+        serie = self.df['VALOR TOTAL']
+        kpis = compute_kpis(serie.to_numpy(), self.df['DESCRIÇÃO MATERIAL'].count())
+
+        self.assertEqual(kpis['itens'], self.df['DESCRIÇÃO MATERIAL'].count())
+        self.assertAlmostEqual(kpis['soma'], serie.sum())
+        self.assertAlmostEqual(kpis['mediana'], serie.median())
+        self.assertAlmostEqual(kpis['maximo'], serie.max())
+        self.assertAlmostEqual(kpis['minimo'], serie.min())
+        self.assertAlmostEqual(kpis['faixa'], serie.max() - serie.min())
+
+    def test_median_even_and_odd(self):
+        """Testa a mediana com quantidade par e ímpar de valores"""
+        self.assertEqual(compute_kpis([3.0, 1.0, 2.0])['mediana'], 2.0)
+        self.assertEqual(compute_kpis([4.0, 1.0, 3.0, 2.0])['mediana'], 2.5)
+        self.assertEqual(compute_kpis([7.0])['mediana'], 7.0)
+
+    def test_empty_period(self):
+        """Testa as estatísticas de um período sem notas"""
+        kpis = compute_kpis([])
+
+        self.assertEqual(kpis['itens'], 0)
+        self.assertEqual(kpis['soma'], 0.0)
+        self.assertTrue(np.isnan(kpis['mediana']))
+
+    def test_prefix_sums(self):
+        """Testa a soma e a contagem em O(1) pelas somas acumuladas"""
+        prefix = PrefixSums([1.0, np.nan, 2.0, 4.0], [True, True, False, True])
+
+        self.assertEqual(prefix.total(0, 4), (7.0, 3))
+        self.assertEqual(prefix.total(1, 3), (2.0, 1))
+        self.assertEqual(prefix.total(2, 2), (0.0, 0))
+
+    def test_period_uses_prefix_sums(self):
+        """Testa que a soma do período vem das somas acumuladas, sem somar a fatia"""
+        inicio, fim = pd.Timestamp('2019-03-01'), pd.Timestamp('2019-08-31')
+
+        with patch('sales_metrics.compute_kpis') as mock_compute:
+            kpis = self.snapshot.kpis(inicio, fim)
+
+        self.assertFalse(mock_compute.called)
+        self.assertEqual(kpis['soma'], self.snapshot.metrics.prefix.total(*self.snapshot.bounds(inicio, fim))[0])
+
+    def test_period_kpis(self):
+        """Testa que as estatísticas do período batem com o cálculo sobre a fatia filtrada"""
+        inicio, fim = pd.Timestamp('2019-03-01'), pd.Timestamp('2019-08-31')
+        fatia = self.df[(self.df['EMISSÃO'] >= inicio) & (self.df['EMISSÃO'] <= fim)]
+
+        kpis = self.snapshot.kpis(inicio, fim)
+
+        self.assertEqual(kpis['itens'], fatia['DESCRIÇÃO MATERIAL'].count())
+        self.assertAlmostEqual(kpis['soma'], fatia['VALOR TOTAL'].sum())
+        self.assertAlmostEqual(kpis['mediana'], fatia['VALOR TOTAL'].median())
+
+    def test_memoized_by_period(self):
+        """Testa que o mesmo período não é recalculado"""
+        inicio, fim = pd.Timestamp('2019-03-01'), pd.Timestamp('2019-08-31')
+        primeiro = self.snapshot.kpis(inicio, fim)
+
+        with patch('sales_metrics.order_stats') as mock_compute:
+            segundo = self.snapshot.kpis(inicio.date(), fim.date())
+
+        self.assertFalse(mock_compute.called)
+        self.assertIs(primeiro, segundo)
+
+    def test_filtered_rows(self):
+        """Testa o cálculo sobre um subconjunto filtrado, memorizado separadamente do período"""
+        inicio, fim = pd.Timestamp('2019-01-01'), pd.Timestamp('2019-12-31')
+        filtrado = self.df[self.df['DESCRIÇÃO MATERIAL'] == 'KIT']
+
+        kpis = self.snapshot.metrics.period(inicio, fim, rows=filtrado)
+
+        self.assertEqual(kpis['itens'], len(filtrado))
+        self.assertNotEqual(kpis['itens'], self.snapshot.kpis(inicio, fim)['itens'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sales_dataset import SalesSnapshot
+from sales_rollups import SalesRollups, aggregate
+
+class TestSalesRollups(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        rng = np.random.default_rng(7)
+        linhas = 400
+        datas = pd.Timestamp('2019-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 540, linhas)), unit='D')
+        self.df = pd.DataFrame({
+            'EMISSÃO': datas,
+            'CFOP': [5101] * linhas,
+            'RAZÃO SOCIAL CLIENTE': pd.Categorical(rng.choice(['ALFA', 'BETA', 'GAMA'], linhas)),
+            'UF': pd.Categorical(rng.choice(['SP', 'RJ'], linhas)),
+            'CÓD.MAT.': ['1'] * linhas,
+            'DESCRIÇÃO MATERIAL': pd.Categorical(rng.choice(['BOD 11', 'BOD 14', 'KIT'], linhas)),
+            'QUANTIDADE': rng.integers(1, 10, linhas).astype(float),
+            'VALOR UNITÁRIO': rng.uniform(10, 100, linhas),
+            'VALOR TOTAL': rng.uniform(10, 1000, linhas),
+        })
+        self.snapshot = SalesSnapshot(self.df, 'v1')
+
+    def assert_cube_equal(self, resultado, esperado):
+        """Compara dois cubos ignorando a ordem das linhas"""
+        pd.testing.assert_frame_equal(
+            resultado.reset_index(drop=True), esperado.reset_index(drop=True), check_dtype=False
+        )
+
+    def test_monthly_totals(self):
+        """Testa que os cubos por material, cliente e UF × material somam as medidas de cada mês"""
+        rollups = SalesRollups(self.df)
+
+        self.assertEqual(list(rollups.cubes), ['material', 'cliente', 'uf_material'])
+        for nome, cubo in rollups.cubes.items():
+            with self.subTest(cubo=nome):
+                self.assertAlmostEqual(cubo['VALOR TOTAL'].sum(), self.df['VALOR TOTAL'].sum())
+                self.assertEqual(cubo['LINHAS'].sum(), len(self.df))
+                self.assertEqual(cubo.index.get_level_values('MÊS').min(), pd.Timestamp('2019-01-01'))
+
+        por_cliente = rollups.cubes['cliente'].groupby(level='RAZÃO SOCIAL CLIENTE', observed=True)['LINHAS'].sum()
+        self.assertEqual(por_cliente.to_dict(), self.df['RAZÃO SOCIAL CLIENTE'].value_counts().to_dict())
+
+    def test_query_matches_raw_aggregation(self):
+        """Testa que a consulta por período combina meses inteiros e pontas parciais corretamente"""
+        periodos = [
+            ('2019-01-01', '2019-12-31'),
+            ('2019-02-15', '2020-03-10'),
+            ('2019-05-03', '2019-05-20'),
+            ('2019-05-03', '2019-06-20'),
+        ]
+        for inicio, fim in periodos:
+            for nome, keys in self.snapshot.rollups.dimensions.items():
+                with self.subTest(inicio=inicio, fim=fim, cubo=nome):
+                    resultado = self.snapshot.rollup(nome, inicio, fim)
+                    esperado = aggregate(self.snapshot.period(inicio, fim), keys).reset_index()
+                    self.assert_cube_equal(resultado, esperado)
+
+    def test_incremental_update(self):
+        """Testa que incorporar linhas novas equivale a reconstruir os cubos"""
+        rollups = SalesRollups(self.df.iloc[:250])
+        rollups.update(self.df.iloc[250:])
+        completo = SalesRollups(self.df)
+
+        for nome in completo.cubes:
+            with self.subTest(cubo=nome):
+                self.assert_cube_equal(rollups.cubes[nome].reset_index(), completo.cubes[nome].reset_index())
+
+    def test_from_chunks(self):
+        """Testa que os cubos montados lote a lote, cada um com as próprias categorias, equivalem aos da base inteira"""
+        categorias = ['RAZÃO SOCIAL CLIENTE', 'UF', 'DESCRIÇÃO MATERIAL']
+        lotes = (
+            self.df.iloc[inicio:inicio + 90].assign(**{
+                coluna: self.df[coluna].iloc[inicio:inicio + 90].cat.remove_unused_categories() for coluna in categorias
+            })
+            for inicio in range(0, len(self.df), 90)
+        )
+        rollups = SalesRollups.from_chunks(lotes)
+        completo = SalesRollups(self.df)
+
+        for nome, keys in completo.dimensions.items():
+            with self.subTest(cubo=nome):
+                resultado = rollups.cubes[nome].reset_index().astype({coluna: str for coluna in keys})
+                esperado = completo.cubes[nome].reset_index().astype({coluna: str for coluna in keys})
+                self.assert_cube_equal(resultado, esperado)
+
+    def test_empty_period(self):
+        """Testa que um período sem notas retorna um cubo vazio com as colunas esperadas"""
+        resultado = self.snapshot.rollup('uf_material', '2030-01-01', '2030-12-31')
+
+        self.assertEqual(len(resultado), 0)
+        self.assertIn('UF', resultado.columns)
+        self.assertIn('VALOR UNITÁRIO', resultado.columns)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sales_dataset import SalesSnapshot
+from sales_topk import TopKIndex, month_bounds, top_codes
+
+class TestSalesTopK(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        rng = np.random.default_rng(11)
+        linhas = 600
+        datas = pd.Timestamp('2019-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 500, linhas)), unit='D')
+        materiais = [f'MAT {i}' for i in range(12)] + [None]
+        pesos = np.r_[np.linspace(3, 1, 12), 0.5]
+        self.df = pd.DataFrame({
+            'EMISSÃO': list(datas[:-5]) + [pd.NaT] * 5,
+            'CFOP': [5101] * linhas,
+            'UF': pd.Categorical(rng.choice(['SP', 'RJ'], linhas)),
+            'CÓD.MAT.': ['1'] * linhas,
+            'RAZÃO SOCIAL CLIENTE': pd.Categorical(rng.choice([f'CLIENTE {i}' for i in range(25)], linhas)),
+            'DESCRIÇÃO MATERIAL': pd.Categorical(rng.choice(materiais, linhas, p=pesos / pesos.sum())),
+            'VALOR TOTAL': rng.uniform(10, 1000, linhas),
+        })
+        self.snapshot = SalesSnapshot(self.df, 'v1')
+
+    def scan(self, inicio, fim, clientes=None):
+        """Filtro por contagem de toda a base do período, como no Main.py original"""
+        df2 = self.snapshot.period(inicio, fim)
+        top_5 = df2['DESCRIÇÃO MATERIAL'].value_counts().nlargest(5).index
+        filtrado = df2[df2['DESCRIÇÃO MATERIAL'].isin(top_5)]
+        if clientes:
+            top_clientes = filtrado['RAZÃO SOCIAL CLIENTE'].value_counts().nlargest(clientes).index
+            filtrado = filtrado[filtrado['RAZÃO SOCIAL CLIENTE'].isin(top_clientes)]
+        return filtrado
+
+    def test_month_bounds(self):
+        """Testa as posições de início de cada mês no índice de datas"""
+        datas = pd.DatetimeIndex(['2019-01-05', '2019-01-20', '2019-03-01', '2019-03-02', '2019-04-30'])
+
+        self.assertEqual(month_bounds(datas).tolist(), [0, 2, 4, 5])
+        self.assertEqual(month_bounds(pd.DatetimeIndex([])).tolist(), [0])
+
+    def test_top_codes(self):
+        """Testa a ordem das maiores contagens, com empates pela ordem das categorias"""
+        self.assertEqual(top_codes(np.array([1, 2, 2, 0, 5]), 3).tolist(), [4, 1, 2])
+        self.assertEqual(top_codes(np.array([1, 0, 0]), 3).tolist(), [0])
+
+    def test_counts_match_value_counts(self):
+        """Testa que as contagens por período combinam meses inteiros e pontas parciais corretamente"""
+        index = self.snapshot.material_index
+        periodos = [
+            ('2019-01-01', '2020-06-30'),
+            ('2019-02-15', '2019-11-10'),
+            ('2019-05-03', '2019-05-20'),
+            ('2018-01-01', '2018-12-31'),
+        ]
+        for inicio, fim in periodos:
+            with self.subTest(inicio=inicio, fim=fim):
+                esperado = self.snapshot.period(inicio, fim)['DESCRIÇÃO MATERIAL'].value_counts(sort=False)
+                self.assertEqual(index.counts(*self.snapshot.bounds(inicio, fim)).tolist(), esperado.tolist())
+
+    def test_top_rows_match_scan(self):
+        """Testa que as linhas dos 5 materiais (e 10 clientes) mais frequentes são as mesmas da contagem completa"""
+        rng = np.random.default_rng(3)
+        for _ in range(30):
+            inicio = pd.Timestamp('2018-12-01') + pd.Timedelta(days=int(rng.integers(0, 520)))
+            fim = inicio + pd.Timedelta(days=int(rng.integers(0, 400)))
+            for clientes in (None, 10):
+                with self.subTest(inicio=inicio, fim=fim, clientes=clientes):
+                    resultado = self.snapshot.top_rows(inicio, fim, materials=5, clients=clientes)
+                    pd.testing.assert_frame_equal(resultado, self.scan(inicio, fim, clientes))
+
+    def test_rows(self):
+        """Testa a busca das linhas de um código sem percorrer a base"""
+        index = TopKIndex.from_column(self.df['DESCRIÇÃO MATERIAL'], self.snapshot.date_index)
+        inicio, fim = self.snapshot.bounds('2019-03-01', '2019-08-31')
+        codigo = index.top(inicio, fim, 1)[0]
+
+        linhas = index.rows(inicio, fim, [codigo])
+
+        esperado = np.flatnonzero(self.df['DESCRIÇÃO MATERIAL'].cat.codes.to_numpy()[inicio:fim] == codigo) + inicio
+        self.assertEqual(linhas.tolist(), esperado.tolist())
+        self.assertEqual(index.rows(inicio, fim, []).tolist(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import unittest
+import json
+import os
+import shutil
+import pandas as pd
+from data_manager import DataManager
+from storage import JournalStorage, SQLiteStorage, open_storage
+
+class StorageTests:
+    """Testes comuns a todos os backends de armazenamento"""
+
+    def create_storage(self):
+        """Cria o backend testado"""
+        raise NotImplementedError
+
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_storage_data'
+        self.storage = self.create_storage()
+        self.data_manager = DataManager(storage=self.storage)
+        self.registro = {
+            "peca": "Motor",
+            "tipo_manutencao": "Preventiva",
+            "descricao": "Troca de óleo",
+            "custo": 150.0
+        }
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        if hasattr(self.storage, 'close'):
+            self.storage.close()
+        shutil.rmtree(self.test_data_dir)
+
+    def test_maintenance_records(self):
+        """Testa que os registros voltam na ordem de inserção com todos os campos"""
+        self.data_manager.add_maintenance_record(dict(self.registro))
+        self.data_manager.add_maintenance_record(dict(self.registro, peca="Freios", extra="campo livre"))
+
+        historico = self.data_manager.get_maintenance_history()
+
+        self.assertEqual([r["peca"] for r in historico], ["Motor", "Freios"])
+        self.assertIn("timestamp", historico[0])
+        self.assertEqual(historico[1]["extra"], "campo livre")
+
+    def test_validation_is_kept(self):
+        """Testa que a validação do DataManager vale também para o banco"""
+        with self.assertRaises(ValueError):
+            self.data_manager.add_maintenance_record({"peca": "Motor"})
+        with self.assertRaises(ValueError):
+            self.data_manager.add_comparison("Item A", "Item B", "valor_invalido")
+        self.assertTrue(self.storage.is_empty())
+
+    def test_comparison_data_types(self):
+        """Testa que o histórico de comparações mantém os tipos do arquivo CSV"""
+        self.assertTrue(self.data_manager.get_comparison_history().empty)
+        self.data_manager.add_comparison("Item A", "Item B", 10.5)
+
+        historico = self.data_manager.get_comparison_history()
+
+        self.assertEqual(historico.iloc[0]["item1"], "Item A")
+        self.assertIsInstance(historico.iloc[0]["diferenca"], float)
+        self.assertIsInstance(historico.iloc[0]["data"], pd.Timestamp)
+
+    def test_part_status(self):
+        """Testa que a atualização de status substitui o estado anterior da peça"""
+        self.data_manager.update_part_status("MOTOR001", "Em Uso")
+        self.data_manager.update_part_status("MOTOR001", "Em Manutenção")
+        self.data_manager.update_part_status("MOTOR002", "Novo")
+
+        self.assertEqual(self.data_manager.get_part_status("MOTOR001")["status"], "Em Manutenção")
+        self.assertIsNone(self.data_manager.get_part_status("MOTOR999"))
+        self.assertEqual(list(self.data_manager.get_part_status()), ["MOTOR001", "MOTOR002"])
+
+    def test_persistence(self):
+        """Testa se os dados persistem ao reabrir o backend"""
+        self.data_manager.update_part_status("TESTE001", "Novo")
+
+        outro = self.create_storage()
+        status = DataManager(storage=outro).get_part_status("TESTE001")
+        if hasattr(outro, 'close'):
+            outro.close()
+
+        self.assertEqual(status["status"], "Novo")
+
+    def test_migration_from_files(self):
+        """Testa a migração dos arquivos JSON/CSV existentes para o banco"""
+        arquivos = DataManager()
+        arquivos.maintenance_file = os.path.join(self.test_data_dir, 'maintenance.json')
+        arquivos.comparison_file = os.path.join(self.test_data_dir, 'comparison_history.csv')
+        arquivos.parts_status_file = os.path.join(self.test_data_dir, 'parts_status.json')
+        arquivos._initialize_files()
+        arquivos.add_maintenance_record(dict(self.registro))
+        arquivos.add_comparison("Item A", "Item B", 10.5)
+        arquivos.update_part_status("MOTOR001", "Em Uso")
+
+        arquivos.migrate_to(self.storage)
+
+        self.assertEqual(self.data_manager.get_maintenance_history(), arquivos.get_maintenance_history())
+        self.assertEqual(self.data_manager.get_part_status(), arquivos.get_part_status())
+        pd.testing.assert_frame_equal(self.data_manager.get_comparison_history(), arquivos.get_comparison_history())
+
+    def test_open_storage(self):
+        """Testa a escolha do backend pelo nome"""
+        self.assertIsNone(open_storage('json'))
+        with self.assertRaises(ValueError):
+            open_storage('desconhecido')
+
+class TestSQLiteStorage(StorageTests, unittest.TestCase):
+    def create_storage(self):
+        """Cria o banco SQLite no diretório de teste"""
+        return SQLiteStorage(os.path.join(self.test_data_dir, 'manutencao.db'))
+
+    def test_wal_mode(self):
+        """Testa que o banco é aberto em modo WAL"""
+        modo = self.storage._connect().execute('PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual(modo, 'wal')
+
+class TestJournalStorage(StorageTests, unittest.TestCase):
+    def create_storage(self):
+        """Cria o diário JSON Lines no diretório de teste"""
+        return JournalStorage(self.test_data_dir)
+
+    def test_append_only(self):
+        """Testa que cada gravação apenas acrescenta uma linha ao diário"""
+        self.data_manager.add_maintenance_record(dict(self.registro))
+        tamanho = os.path.getsize(self.storage.journal_file)
+        self.data_manager.update_part_status("MOTOR001", "Em Uso")
+
+        with open(self.storage.journal_file, encoding='utf-8') as f:
+            eventos = [json.loads(linha) for linha in f]
+        self.assertEqual([e['evento'] for e in eventos], ['manutencao', 'estado'])
+        self.assertGreater(os.path.getsize(self.storage.journal_file), tamanho)
+
+    def test_compact(self):
+        """Testa que a compactação move os eventos para o retrato sem perder dados"""
+        self.data_manager.add_maintenance_record(dict(self.registro))
+        self.data_manager.update_part_status("MOTOR001", "Em Uso")
+        self.storage.compact()
+        self.data_manager.update_part_status("MOTOR001", "Em Manutenção")
+
+        self.assertTrue(os.path.exists(self.storage.snapshot_file))
+        self.assertFalse(os.path.exists(self.storage.compacting_file))
+        self.assertEqual(len(self.data_manager.get_maintenance_history()), 1)
+        self.assertEqual(self.data_manager.get_part_status("MOTOR001")["status"], "Em Manutenção")
+
+    def test_background_compaction(self):
+        """Testa a compactação automática em segundo plano acima do limite de eventos"""
+        self.storage.compact_threshold = 3
+        for i in range(5):
+            self.data_manager.add_maintenance_record(dict(self.registro, peca=f"Peca {i}"))
+        self.storage.compact()
+
+        self.assertEqual([r["peca"] for r in self.data_manager.get_maintenance_history()],
+                         [f"Peca {i}" for i in range(5)])
+        self.assertFalse(os.path.exists(self.storage.journal_file))
+
+    def test_interrupted_compaction(self):
+        """Testa que uma compactação interrompida não duplica eventos"""
+        self.data_manager.add_maintenance_record(dict(self.registro))
+        shutil.copy(self.storage.journal_file, self.storage.compacting_file + '.copia')
+        self.storage.compact()
+        # Simula uma queda depois de gravar o retrato e antes de apagar o diário rotacionado
+        os.replace(self.storage.compacting_file + '.copia', self.storage.compacting_file)
+
+        self.assertEqual(len(self.data_manager.get_maintenance_history()), 1)
+        self.storage.compact()
+        self.assertEqual(len(self.data_manager.get_maintenance_history()), 1)
+
+    def test_truncated_line(self):
+        """Testa que uma última linha incompleta (queda durante a escrita) é ignorada"""
+        self.data_manager.add_maintenance_record(dict(self.registro))
+        with open(self.storage.journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"evento": "manutencao", "regis')
+
+        self.assertEqual(len(self.data_manager.get_maintenance_history()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import os
+import shutil
+import subprocess
+import sys
+import pandas as pd
+from profiling import RunProfile
+from sales_dataset import get_dataset, _base_rollups, _load_snapshot
+from warmup import format_report, warm_up
+
+class TestWarmup(unittest.TestCase):
+    def setUp(self):
+        """Configuração executada antes de cada teste"""
+        self.test_data_dir = 'test_warmup_data'
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        self.csv_file = os.path.join(self.test_data_dir, 'vendas.csv')
+        self.cache_dir = os.path.join(self.test_data_dir, 'cache')
+        pd.DataFrame({
+            'CFOP': [5101, 6101],
+            'RAZÃO SOCIAL CLIENTE': ['ALFA LTDA', 'BETA SA'],
+            'UF': ['SP', 'RJ'],
+            'CÓD.MAT.': ['5.01', '5.02'],
+            'DESCRIÇÃO MATERIAL': ['BOD 11', 'BOD 14'],
+            'EMISSÃO': ['1/8/2019', '2/9/2019'],
+            'QUANTIDADE': [1, 2],
+            'VALOR UNITÁRIO': [10.0, 10.0],
+            'VALOR TOTAL': [10.0, 20.0],
+        }).to_csv(self.csv_file, index=False)
+        _load_snapshot.clear()
+        _base_rollups.clear()
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        _load_snapshot.clear()
+        _base_rollups.clear()
+        shutil.rmtree(self.test_data_dir)
+
+    def test_warm_up_fills_shared_dataset(self):
+        """Testa que o aquecimento deixa a base e seus índices prontos no cache do processo"""
+        perfil = warm_up(self.csv_file, self.cache_dir, self.test_data_dir, imports=['json'])
+
+        etapas = [s.etapa for s in perfil.spans]
+        self.assertEqual(etapas, ['importar_bibliotecas', 'json', 'carregar_base', 'agregados_mensais',
+                                  'indice_frequencia', 'estatisticas'])
+        self.assertEqual(perfil.spans[2].linhas, 2)
+
+        dataset = get_dataset(self.csv_file, cache_dir=self.cache_dir, data_dir=self.test_data_dir)
+        self.assertIn('rollups', vars(dataset))
+        self.assertIn('material_index', vars(dataset))
+
+    def test_format_report(self):
+        """Testa o relatório com o tempo de cada etapa e o total"""
+        perfil = RunProfile('Aquecimento', enabled=True)
+        with perfil.span('carregar_base'):
+            with perfil.span('leitura'):
+                pass
+
+        linhas = format_report(perfil).splitlines()
+        self.assertEqual(len(linhas), 3)
+        self.assertTrue(linhas[0].startswith('carregar_base'))
+        self.assertTrue(linhas[1].startswith('  leitura'))
+        self.assertTrue(linhas[2].startswith('total') and linhas[2].endswith('ms'))
+
+    def test_page_imports_skip_heavy_modules(self):
+        """Testa que os imports dos módulos do Main.py não carregam o openpyxl, o sqlite3, o matplotlib nem o altair"""
+        codigo = ('import sys, add_data, sales_dataset, sales_charts, figure_cache, profiling; '
+                  'print(*[m for m in ("openpyxl", "sqlite3", "storage", "matplotlib", "altair") if m in sys.modules])')
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        resultado = subprocess.run([sys.executable, '-c', codigo], cwd=raiz, capture_output=True, text=True, check=True)
+        self.assertEqual(resultado.stdout.strip(), '')
+
+if __name__ == '__main__':
+    unittest.main()
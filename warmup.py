@@ -0,0 +1,93 @@
+"""Aquece o dashboard na subida do servidor, antes da primeira visita.
+
+Inicia o Streamlit e, ao mesmo tempo, importa as bibliotecas de gráficos e carrega a base de
+vendas, os agregados mensais, o índice de frequência e o motor das estatísticas. Tudo fica no
+mesmo processo do servidor (st.cache_resource), então a primeira sessão encontra a base pronta
+em vez de esperar a carga. Ao terminar, mostra o tempo de cada etapa; com
+DASHBOARD_PROFILE_LOG=<arquivo> as etapas também são gravadas no log de profiling.py.
+
+Uso:
+    python warmup.py [--pagina Main.py] [--base base_2.xlsx] [--sem-servidor] [opções do streamlit run]
+
+    Por exemplo: python warmup.py --server.port 8502 --server.headless true
+"""
+import argparse
+import importlib
+import os
+import sys
+import threading
+from profiling import LOG_ENV, RunProfile
+from sales_dataset import get_dataset
+from sales_loader import CACHE_DIR, SALES_XLSX
+
+# Bibliotecas importadas só quando alguma seção as usa (ver Main.py), pré-importadas no aquecimento
+WARM_IMPORTS = [
+    "altair",
+    "streamlit_extras.metric_cards",
+    "streamlit_extras.dataframe_explorer",
+    "seaborn",
+    "matplotlib.backends.backend_agg",
+]
+
+
+def warm_up(path=SALES_XLSX, cache_dir=CACHE_DIR, data_dir="data", imports=WARM_IMPORTS, profile=None):
+    """Importa as bibliotecas e carrega a base e seus índices, retornando o perfil com o tempo de cada etapa"""
+    if profile is None:
+        profile = RunProfile("Aquecimento", enabled=True, log_file=os.environ.get(LOG_ENV) or None)
+
+    with profile.span("importar_bibliotecas"):
+        for modulo in imports:
+            with profile.span(modulo):
+                importlib.import_module(modulo)
+
+    # Mesma chamada do Main.py, para que a página encontre o retrato no cache do processo
+    with profile.span("carregar_base") as etapa:
+        dataset = get_dataset(path, cache_dir, data_dir)
+        etapa.measure(dataset.df)
+    with profile.span("agregados_mensais"):
+        dataset.rollups
+    with profile.span("indice_frequencia"):
+        dataset.material_index
+    with profile.span("estatisticas"):
+        dataset.metrics
+
+    if profile.log_file:
+        profile.write_log()
+    return profile
+
+
+def format_report(profile):
+    """Texto com o tempo de cada etapa do aquecimento e o total"""
+    df = profile.frame()
+    linhas = [f"{etapa:<42} {ms:>9.1f} ms" for etapa, ms in zip(df["etapa"], df["ms"])]
+    linhas.append(f"{'total':<42} {profile.total_ms():>9.1f} ms")
+    return "\n".join(linhas)
+
+
+def _warm_up_and_report(path):
+    """Aquece o servidor e imprime o relatório (executado em uma thread ao lado do servidor)"""
+    try:
+        profile = warm_up(path)
+    except Exception as e:
+        print(f"Aquecimento interrompido: {e}", file=sys.stderr)
+        return
+    print(f"Aquecimento concluído:\n{format_report(profile)}", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pagina", default="Main.py", help="Página principal do dashboard")
+    parser.add_argument("--base", default=SALES_XLSX, help="Planilha de vendas carregada pelo dashboard")
+    parser.add_argument("--sem-servidor", action="store_true", help="Só aquece e mostra o tempo de cada etapa")
+    args, opcoes_streamlit = parser.parse_known_args()
+
+    if args.sem_servidor:
+        print(format_report(warm_up(args.base)))
+        sys.exit(0)
+
+    threading.Thread(target=_warm_up_and_report, args=(args.base,), name="aquecimento", daemon=True).start()
+
+    from streamlit.web import cli
+
+    sys.argv = ["streamlit", "run", args.pagina, *opcoes_streamlit]
+    sys.exit(cli.main())